@@ -0,0 +1,367 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from contextlib import suppress
+
+import fsspec
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.utils import get_protocol
+
+
+def local_path(file: str, /) -> str | None:
+    """Return the path on the local disk of a local path or `file://` url, or `None` for a remote url."""
+    if get_protocol(file) not in LocalFileSystem.protocol:
+        return None
+    return LocalFileSystem._strip_protocol(file)
+
+
+class ParseCache:
+    """Two level cache of parsed results: a size bounded in-memory LRU in front of an on-disk SQLite store.
+
+    Entries are keyed on a namespace (e.g. the country), the normalised raw string and the parser version, so bumping
+    the version leaves old entries unused. The SQLite store runs in WAL mode, so several processes can share one file.
+    If `cache_file` is `None`, not on the local disk or cannot be opened, only the in-memory layer is used.
+
+    Hits and misses for the current process are counted in `ParseCache.stats`.
+    """
+
+    SQLITE_BATCH_SIZE = 500
+
+    def __init__(self, cache_file: str | None, /, *, parser_version: str, max_size: int = 100_000):
+        """Create a cache, the on-disk store is opened on first use."""
+        self.cache_file = cache_file
+        self.parser_version = parser_version
+        self.max_size = max_size
+
+        self.memory: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self.stats: Counter[str] = Counter(memory_hits=0, disk_hits=0, misses=0)
+
+        self._connection: sqlite3.Connection | None = None
+        self._connection_failed = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalise(raw: str, /) -> str:
+        """Normalise a raw string into a cache key."""
+        return " ".join(raw.upper().split())
+
+    def get(self, namespace: str, raw: str, /) -> dict | None:
+        """Return the cached result for a raw string, or `None` on a miss."""
+        return self.get_many(namespace, [raw]).get(raw)
+
+    def put(self, namespace: str, raw: str, parsed: dict, /) -> None:
+        """Store the parsed result for a raw string in both layers."""
+        self.put_many(namespace, {raw: parsed})
+
+    def get_many(self, namespace: str, raws: Iterable[str], /) -> dict[str, dict]:
+        """Return the cached results for several raw strings, keyed by raw string and leaving out misses."""
+        found: dict[str, dict] = {}
+        disk_keys: dict[str, list[str]] = {}
+
+        with self._lock:
+            for raw in raws:
+                if not isinstance(raw, str) or raw in found:
+                    continue
+                key = (namespace, self.normalise(raw))
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[raw] = self.memory[key]
+                    self.stats["memory_hits"] += 1
+                else:
+                    disk_keys.setdefault(key[1], []).append(raw)
+
+            for normalised, parsed in self._read_disk(namespace, list(disk_keys)).items():
+                self._remember((namespace, normalised), parsed)
+                for raw in disk_keys.pop(normalised):
+                    found[raw] = parsed
+                    self.stats["disk_hits"] += 1
+
+            self.stats["misses"] += sum(len(raws_missed) for raws_missed in disk_keys.values())
+
+        return found
+
+    def put_many(self, namespace: str, parsed_by_raw: dict[str, dict], /) -> None:
+        """Store several parsed results, keyed by raw string, in both layers."""
+        entries = {self.normalise(raw): parsed for raw, parsed in parsed_by_raw.items()}
+
+        with self._lock:
+            for normalised, parsed in entries.items():
+                self._remember((namespace, normalised), parsed)
+            self._write_disk(namespace, entries)
+
+    def clear(self, *, disk: bool = False) -> None:
+        """Empty the in-memory layer and reset the counters, and optionally the on-disk store for this version."""
+        with self._lock:
+            self.memory.clear()
+            self.stats = Counter(memory_hits=0, disk_hits=0, misses=0)
+
+            if disk and (connection := self._connect()) is not None:
+                with connection:
+                    connection.execute("DELETE FROM parsed WHERE parser_version = ?", (self.parser_version,))
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from either layer."""
+        lookups = self.stats.total()
+        return 0.0 if lookups == 0 else (self.stats["memory_hits"] + self.stats["disk_hits"]) / lookups
+
+    def _remember(self, key: tuple[str, str], parsed: dict) -> None:
+        self.memory[key] = parsed
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    def _read_disk(self, namespace: str, normalised: list[str]) -> dict[str, dict]:
+        if not normalised or (connection := self._connect()) is None:
+            return {}
+
+        found = {}
+        for start in range(0, len(normalised), self.SQLITE_BATCH_SIZE):
+            batch = normalised[start : start + self.SQLITE_BATCH_SIZE]
+            rows = connection.execute(
+                "SELECT raw, parsed FROM parsed WHERE parser_version = ? AND namespace = ? "  # noqa: S608
+                f"AND raw IN ({', '.join('?' * len(batch))})",
+                (self.parser_version, namespace, *batch),
+            )
+            found.update((raw, json.loads(parsed)) for raw, parsed in rows)
+
+        return found
+
+    def _write_disk(self, namespace: str, entries: dict[str, dict]) -> None:
+        if not entries or (connection := self._connect()) is None:
+            return
+
+        with suppress(sqlite3.OperationalError), connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO parsed (parser_version, namespace, raw, parsed) VALUES (?, ?, ?, ?)",
+                [(self.parser_version, namespace, raw, json.dumps(parsed)) for raw, parsed in entries.items()],
+            )
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._connection is not None or self._connection_failed or self.cache_file is None:
+            return self._connection
+
+        if (cache_path := local_path(self.cache_file)) is None:
+            self._connection_failed = True
+            return None
+
+        try:
+            os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS parsed ("
+                "parser_version TEXT, namespace TEXT, raw TEXT, parsed TEXT, "
+                "PRIMARY KEY (parser_version, namespace, raw)) WITHOUT ROWID"
+            )
+        except (OSError, sqlite3.Error):
+            self._connection_failed = True
+            return None
+
+        self._connection = connection
+        return self._connection
+
+
+class ValidationLedger:
+    """On-disk record of the file versions that passed validation, so unchanged files need not be validated again.
+
+    A file version is identified by a fingerprint, such as a hash of its contents, and entries are kept per validator
+    version, so bumping the version re-validates every file. The ledger is a SQLite store in WAL mode, so several
+    processes can share one file. If `ledger_file` is `None`, not on the local disk or cannot be opened nothing is
+    remembered.
+
+    Hits and misses for the current process are counted in `ValidationLedger.stats`.
+    """
+
+    def __init__(self, ledger_file: str | None, /, *, validator_version: str):
+        """Create a ledger, the on-disk store is opened on first use."""
+        self.ledger_file = ledger_file
+        self.validator_version = validator_version
+        self.stats: Counter[str] = Counter(hits=0, misses=0)
+
+        self._connection: sqlite3.Connection | None = None
+        self._connection_failed = False
+        self._lock = threading.Lock()
+
+    def is_validated(self, fingerprint: str, /) -> bool:
+        """Return whether the file version with `fingerprint` has passed validation."""
+        with self._lock:
+            found = (connection := self._connect()) is not None and (
+                connection.execute(
+                    "SELECT 1 FROM validated WHERE validator_version = ? AND fingerprint = ?",
+                    (self.validator_version, fingerprint),
+                ).fetchone()
+                is not None
+            )
+            self.stats["hits" if found else "misses"] += 1
+
+        return found
+
+    def record(self, fingerprint: str, /) -> None:
+        """Remember that the file version with `fingerprint` passed validation."""
+        with self._lock:
+            if (connection := self._connect()) is None:
+                return
+            with suppress(sqlite3.OperationalError), connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO validated (validator_version, fingerprint) VALUES (?, ?)",
+                    (self.validator_version, fingerprint),
+                )
+
+    def clear(self) -> None:
+        """Forget every file validated by this validator version and reset the counters."""
+        with self._lock:
+            self.stats = Counter(hits=0, misses=0)
+            if (connection := self._connect()) is not None:
+                with connection:
+                    connection.execute("DELETE FROM validated WHERE validator_version = ?", (self.validator_version,))
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._connection is not None or self._connection_failed or self.ledger_file is None:
+            return self._connection
+
+        if (ledger_path := local_path(self.ledger_file)) is None:
+            self._connection_failed = True
+            return None
+
+        try:
+            os.makedirs(os.path.dirname(ledger_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(ledger_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS validated ("
+                "validator_version TEXT, fingerprint TEXT, PRIMARY KEY (validator_version, fingerprint)) WITHOUT ROWID"
+            )
+        except (OSError, sqlite3.Error):
+            self._connection_failed = True
+            return None
+
+        self._connection = connection
+        return self._connection
+
+
+class RemoteFileCache:
+    """Size bounded local copies of remote files, revalidated against the remote's ETag or modification time.
+
+    `RemoteFileCache.get` downloads a remote file on first use and returns the local copy while the remote version is
+    unchanged. Copies live in `cache_dir` with a SQLite index of their url, version, size and last use, in WAL mode so
+    several processes can share one directory, and the least recently used are removed once they exceed `max_bytes`.
+    Local files are returned as they are, and remote files without an ETag or modification time are always downloaded.
+
+    Hits, misses, stale copies downloaded again, evictions and bytes downloaded are counted in `RemoteFileCache.stats`.
+    """
+
+    VERSION_KEYS = ("ETag", "mtime", "LastModified", "created")
+
+    def __init__(self, cache_dir: str, /, *, max_bytes: int = 2 * 2**30):
+        """Create a cache in `cache_dir`, which is created on first use."""
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats: Counter[str] = Counter(hits=0, misses=0, stale=0, evictions=0, downloaded_bytes=0)
+
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get(self, url: str, /) -> str:
+        """Return the path of a local copy of the file at `url`, downloading it if the cached copy is missing or stale.
+
+        Raises `FileNotFoundError` if the remote file does not exist.
+        """
+        file_system, path = fsspec.core.url_to_fs(url)
+        if isinstance(file_system, LocalFileSystem):
+            return url
+
+        file_info = file_system.info(path)
+        version = self.version(file_info)
+        local_file = os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + os.path.splitext(path)[1])
+
+        with self._lock:
+            connection = self._connect()
+            cached = connection.execute("SELECT version FROM files WHERE url = ?", (url,)).fetchone()
+            if version is not None and cached is not None and cached[0] == version and os.path.exists(local_file):
+                with connection:
+                    connection.execute("UPDATE files SET last_used = ? WHERE url = ?", (time.time(), url))
+                self.stats["hits"] += 1
+                return local_file
+            self.stats["misses" if cached is None else "stale"] += 1
+
+        # Download beside the copy and move it into place, so readers never see a partial file.
+        partial_file = f"{local_file}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            file_system.get_file(path, partial_file)
+            os.replace(partial_file, local_file)
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(partial_file)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO files (url, version, local_file, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (url, version, local_file, file_info["size"], time.time()),
+                )
+            self.stats["downloaded_bytes"] += file_info["size"]
+            self._evict(keep=url)
+
+        return local_file
+
+    def clear(self) -> None:
+        """Remove every cached copy and reset the counters."""
+        with self._lock:
+            self.stats = Counter(hits=0, misses=0, stale=0, evictions=0, downloaded_bytes=0)
+            connection = self._connect()
+            for (local_file,) in connection.execute("SELECT local_file FROM files").fetchall():
+                with suppress(FileNotFoundError):
+                    os.remove(local_file)
+            with connection:
+                connection.execute("DELETE FROM files")
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups served from a cached copy."""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["stale"]
+        return 0.0 if lookups == 0 else self.stats["hits"] / lookups
+
+    @classmethod
+    def version(cls, file_info: dict, /) -> str | None:
+        """Identify a version of a remote file by its ETag or modification time and its size, if it has either."""
+        modified = next((file_info[key] for key in cls.VERSION_KEYS if file_info.get(key) is not None), None)
+        return None if modified is None else f"{modified}:{file_info['size']}"
+
+    def _evict(self, *, keep: str) -> None:
+        """Remove the least recently used copies, other than the one at `keep`, until the rest fit in `max_bytes`."""
+        connection = self._connect()
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        for url, local_file, size in connection.execute(
+            "SELECT url, local_file, size FROM files WHERE url != ? ORDER BY last_used", (keep,)
+        ).fetchall():
+            with suppress(FileNotFoundError):
+                os.remove(local_file)
+            with connection:
+                connection.execute("DELETE FROM files WHERE url = ?", (url,))
+            self.stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(self.cache_dir, "index.sqlite"), timeout=30, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "url TEXT PRIMARY KEY, version TEXT, local_file TEXT, size INTEGER, last_used REAL)"
+            )
+            self._connection = connection
+
+        return self._connection
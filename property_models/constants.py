@@ -3,9 +3,11 @@ from abc import abstractmethod
 from contextlib import suppress
 from enum import Enum
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, get_args
 
 import polars as pl
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.utils import get_protocol
 
 DATA_DIR: str = None
 
@@ -15,10 +17,32 @@ if (DATA_DIR := os.environ.get("DATA_DIR")) is None:
     DATA_DIR = f"{root_dir}/property_models/data"
 
 POSTCODE_CSV_FILE: str = DATA_DIR + "/processed/{country}/suburb_to_postcode.csv"
+POSTCODE_SIDECAR_SUFFIX: str = ".arrow"
+POSTCODE_SIDECAR_VERSION: bytes = b"1"
 PRICE_RECORDS_CSV_FILE: str = DATA_DIR + "/processed/{country}/{state}/{suburb}/records.csv"
+PRICE_RECORDS_KEY_INDEX_SUFFIX: str = ".keys"
+PRICE_AGGREGATES_SUFFIX: str = ".monthly.parquet"
 PROPERTIES_INFO_JSON_FILE: str = DATA_DIR + "/processed/{country}/{state}/{suburb}/properties.json"
+PROPERTIES_INFO_NDJSON_FILE: str = DATA_DIR + "/processed/{country}/{state}/{suburb}/properties.ndjson"
+PRICE_RECORDS_PARQUET_DIR: str = DATA_DIR + "/processed/price_records"
+PRICE_RECORDS_PARQUET_PARTITION: str = "country={country}/state={state}/suburb={suburb}/records.parquet"
+
+# SQLite files must be on the local disk, so when `DATA_DIR` is remote they default to a local directory instead.
+LOCAL_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "property_models")
+LOCAL_DATA_DIR: str = DATA_DIR if get_protocol(DATA_DIR) in LocalFileSystem.protocol else LOCAL_CACHE_DIR
+
+ADDRESS_CACHE_FILE: str | None = os.environ.get("ADDRESS_CACHE_FILE", LOCAL_DATA_DIR + "/cache/address_parsing.sqlite")
+ADDRESS_CACHE_SIZE: int = 100_000
+VALIDATION_LEDGER_FILE: str | None = os.environ.get(
+    "VALIDATION_LEDGER_FILE", LOCAL_DATA_DIR + "/cache/validation.sqlite"
+)
+SQLITE_STORE_FILE: str = os.environ.get("SQLITE_STORE_FILE", LOCAL_DATA_DIR + "/processed/store.sqlite")
+# Local copies of files read from a remote `DATA_DIR`, disabled by setting `REMOTE_CACHE_DIR` to an empty string.
+REMOTE_CACHE_DIR: str | None = os.environ.get("REMOTE_CACHE_DIR", LOCAL_CACHE_DIR + "/remote") or None
+REMOTE_CACHE_SIZE: int = int(os.environ.get("REMOTE_CACHE_SIZE", 2 * 2**30))
 
 ALLOWED_COUNTRIES = Literal["AUS"]
+COUNTRY_STATES: dict[str, list[str]] = {"AUS": ["ACT", "NSW", "NT", "QLD", "SA", "TAS", "VIC", "WA"]}
 
 ####### SCHEMAS #######
 
@@ -59,6 +83,35 @@ PROPERTIES_INFO_SCHEMA = pl.Schema(
         "floors": pl.UInt8,
     }
 )
+PROPERTIES_INFO_RAW_SCHEMA = PROPERTIES_INFO_SCHEMA | {"construction_date": pl.String}
+
+PRICE_AGGREGATES_SCHEMA = pl.Schema(
+    {
+        "month": pl.Date,
+        "record_type": pl.String,
+        "volume": pl.UInt32,
+        "price_count": pl.UInt32,
+        "price_sum": pl.UInt64,
+        "mean_price": pl.Float64,
+        "median_price": pl.Float64,
+        "prices": pl.List(pl.UInt32),
+    }
+)
+
+# Flat layouts of price records and property information in the SQLite store, with `PropertyType` codes and the
+# normalised `'street_key'` that street addresses are looked up on.
+PRICE_RECORDS_STORE_SCHEMA = pl.Schema(
+    {"address_id": pl.UInt64, "street_key": pl.String, **ADDRESS_SCHEMA}
+    | {"date": pl.Date, "record_type": pl.String, "price": pl.UInt32}
+)
+PROPERTIES_INFO_STORE_SCHEMA = pl.Schema(
+    {"address_id": pl.UInt64, "street_key": pl.String, **ADDRESS_SCHEMA}
+    | {
+        name: pl.UInt8 if name == "property_type" else dtype
+        for name, dtype in PROPERTIES_INFO_SCHEMA.items()
+        if name != "address"
+    }
+)
 
 POSTCODE_SCHEMA = pl.Schema(
     {
@@ -104,25 +157,87 @@ class RecordType(str, Enum):
             record_enum = cls(record_clean)
             return record_enum
 
-        match record_clean:
-            case "auction":
-                record_enum = cls.AUCTION
-            case "by_negotiation":
-                record_enum = cls.PRIVATE_SALE
-            case "price_guide" | "contact" | "in_excess_of":
-                record_enum = cls.ENQUIRY
-            case "week":
-                record_enum = cls.RENT
-            case _:  # " " | "_" | "":
-                if errors == "raise":
-                    raise ValueError(f"Cannot find type for {record_clean!r} ({record_type!r})")
-                if errors == "null":
-                    return None
-                if errors == "coerce":
-                    raise NotImplementedError("'coerce' is not implemented yet")
+        if (record_enum := RECORD_TYPE_ALIASES.get(record_clean)) is None:  # " " | "_" | "":
+            if errors == "raise":
+                raise ValueError(f"Cannot find type for {record_clean!r} ({record_type!r})")
+            if errors == "null":
+                return None
+            if errors == "coerce":
+                raise NotImplementedError("'coerce' is not implemented yet")
 
         return record_enum
 
+    @classmethod
+    def parse_expr(
+        cls, record_type: str | pl.Expr = "record_type", *, errors: Literal["raise", "coerce", "null"] = "raise"
+    ) -> pl.Expr:
+        """Return polars expression converting a string column into `RecordType` values, the same as `parse`.
+
+        Parameters
+        ----------
+        record_type : str | pl.Expr, optional, column or expression to be cleaned, by default "record_type".
+        errors : Literal["raise", "coerce", "null"], optional, How to handle errors when bad values are passed, by
+            default "raise".
+
+        Returns
+        -------
+        pl.Expr, `pl.String` expression holding the `RecordType` values.
+
+        Raises
+        ------
+        pl.exceptions.InvalidOperationError, When evaluated if bad values are passed.
+        NotImplementedError, If called with un implemented parameters.
+        """
+        if errors == "coerce":
+            raise NotImplementedError("'coerce' is not implemented yet")
+
+        record_type = pl.col(record_type) if isinstance(record_type, str) else record_type
+        record_clean = (
+            record_type.str.strip_chars()
+            .str.replace_all("  ", " ", literal=True)
+            .str.replace_all(" ", "_", literal=True)
+            .str.to_lowercase()
+        )
+        lookup = {record_enum.value: record_enum.value for record_enum in cls} | {
+            alias: record_enum.value for alias, record_enum in RECORD_TYPE_ALIASES.items()
+        }
+
+        if errors == "raise":
+            return record_clean.replace_strict(lookup, return_dtype=pl.String)
+        return record_clean.replace_strict(lookup, default=None, return_dtype=pl.String)
+
+
+RECORD_TYPE_ALIASES: dict[str, RecordType] = {
+    "by_negotiation": RecordType.PRIVATE_SALE,
+    "price_guide": RecordType.ENQUIRY,
+    "contact": RecordType.ENQUIRY,
+    "in_excess_of": RecordType.ENQUIRY,
+    "week": RecordType.RENT,
+}
+
+
+####### COMPACT SCHEMAS #######
+# Same as the schemas above, but with the repeated strings stored as `pl.Enum` where the values are known up front and
+# `pl.Categorical` otherwise. Enable `pl.StringCache` when combining compact frames read separately.
+
+COUNTRY_ENUM = pl.Enum(get_args(ALLOWED_COUNTRIES))
+STATE_ENUM = pl.Enum(sorted({state for states in COUNTRY_STATES.values() for state in states}))
+RECORD_TYPE_ENUM = pl.Enum([record_type.value for record_type in RecordType])
+
+COMPACT_ADDRESS_SCHEMA = ADDRESS_SCHEMA | {
+    "street_name": pl.Categorical(),
+    "suburb": pl.Categorical(),
+    "state": STATE_ENUM,
+    "country": COUNTRY_ENUM,
+}
+
+COMPACT_PRICE_RECORDS_SCHEMA = PRICE_RECORDS_SCHEMA | {
+    "street_name": pl.Categorical(),
+    "record_type": RECORD_TYPE_ENUM,
+}
+
+COMPACT_PROPERTIES_INFO_SCHEMA = PROPERTIES_INFO_SCHEMA | {"address": pl.Struct(COMPACT_ADDRESS_SCHEMA)}
+
 
 ####### PROPERTY TYPE ################
 
@@ -262,6 +377,104 @@ class PropertyType(tuple[str, str]):
         except Exception:  # noqa: B904
             raise NotImplementedError  # noqa: B904
 
+    @classmethod
+    @lru_cache
+    def code_table(cls) -> pl.DataFrame:
+        """Return the `pl.UInt8` `'code'` of every `(parent, child)` pair, with its `'parent'`, `'child'` and `'label'`.
+
+        Codes are numbered in the order the parents and their children are declared, so the children of each parent
+        are one contiguous range of codes, and match the physical values of `PROPERTY_TYPE_ENUM` whose categories are
+        the `"parent/child"` labels.
+        """
+        pairs = [
+            (parent, sub_enum_member._value_)
+            for parent, sub_enum in cls._sub_enum_lookup().items()
+            for sub_enum_member in sub_enum.__members__.values()
+        ]
+        return pl.DataFrame(
+            {
+                "code": range(len(pairs)),
+                "parent": [parent for parent, _ in pairs],
+                "child": [child for _, child in pairs],
+                "label": [f"{parent}/{child}" for parent, child in pairs],
+            },
+            schema={"code": pl.UInt8, "parent": pl.String, "child": pl.String, "label": pl.String},
+        )
+
+    @classmethod
+    def encode_expr(
+        cls, property_type: str | pl.Expr = "property_type", *, errors: Literal["raise", "coerce", "null"] = "raise"
+    ) -> pl.Expr:
+        """Return polars expression converting `[parent, child]` lists into their `pl.UInt8` codes, see `code_table`.
+
+        Parameters
+        ----------
+        property_type : str | pl.Expr, optional, `pl.List(pl.String)` column or expression, by default "property_type".
+            A missing child is the parent's general type.
+        errors : Literal["raise", "coerce", "null"], optional, How to handle errors when bad values are passed, by
+            default "raise".
+
+        Returns
+        -------
+        pl.Expr, `pl.UInt8` expression holding the codes.
+
+        Raises
+        ------
+        pl.exceptions.InvalidOperationError, When evaluated if bad values are passed.
+        NotImplementedError, If called with un implemented parameters.
+        """
+        if errors == "coerce":
+            raise NotImplementedError("'coerce' is not implemented yet")
+
+        property_type = pl.col(property_type) if isinstance(property_type, str) else property_type
+        label = pl.concat_str(
+            property_type.list.get(0, null_on_oob=True),
+            pl.lit("/"),
+            property_type.list.get(1, null_on_oob=True).fill_null("None"),
+        )
+        code_table = cls.code_table()
+
+        if errors == "raise":
+            return label.replace_strict(code_table["label"], code_table["code"], return_dtype=pl.UInt8)
+        return label.replace_strict(code_table["label"], code_table["code"], default=None, return_dtype=pl.UInt8)
+
+    @classmethod
+    def decode_expr(cls, code: str | pl.Expr = "property_type") -> pl.Expr:
+        """Return polars expression converting `pl.UInt8` codes back into `[parent, child]` lists.
+
+        The child of a parent's general type is `"None"`, as in `SubPropertyType.value` and the property information
+        files, so lists read by `PropertyInfo.read` round trip exactly. For a `PROPERTY_TYPE_ENUM` label instead cast
+        the codes with `.cast(pl.UInt32).cast(PROPERTY_TYPE_ENUM)`.
+        """
+        code = pl.col(code) if isinstance(code, str) else code
+        code_table = cls.code_table()
+
+        return pl.when(code.is_not_null()).then(
+            pl.concat_list(
+                code.replace_strict(code_table["code"], code_table["parent"], return_dtype=pl.String),
+                code.replace_strict(code_table["code"], code_table["child"], return_dtype=pl.String),
+            )
+        )
+
+    @classmethod
+    def parent_expr(cls, parent: str | type[SubPropertyType], code: str | pl.Expr = "property_type") -> pl.Expr:
+        """Return polars expression checking `pl.UInt8` codes are of a parent type, as one range check.
+
+        e.g. `properties_info.filter(PropertyType.parent_expr(PropertyType.APARTMENT))` keeps every apartment. Raises a
+        `KeyError` for an unknown parent.
+        """
+        code = pl.col(code) if isinstance(code, str) else code
+        parent = parent if isinstance(parent, str) else parent._name()
+        parent_codes = cls.code_table().filter(pl.col("parent") == parent)["code"]
+
+        if parent_codes.is_empty():
+            raise KeyError(f"Unknown parent property type {parent!r}.")
+
+        return code.is_between(parent_codes.min(), parent_codes.max())
+
+
+PROPERTY_TYPE_ENUM = pl.Enum(PropertyType.code_table()["label"])
+
 
 #### Property condition #########
 
@@ -0,0 +1,651 @@
+"""Benchmarks for the data models, run with `python -m property_models.dev_utils.benchmarks <name> [--rows N]`.
+
+Each benchmark writes synthetic data into a temporary directory and times or measures each variant in a fresh
+spawned process, so peak memory of one variant does not leak into the next.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from datetime import date
+
+import numpy as np
+import polars as pl
+
+from property_models import constants
+from property_models.constants import ADDRESS_SCHEMA, PRICE_RECORDS_SCHEMA, PropertyType, RecordType
+from property_models.models import (
+    Address,
+    PriceAggregates,
+    PriceRecord,
+    PriceRecordBatchBuilder,
+    PropertyInfo,
+    to_compact,
+)
+from property_models.price_index import repeat_sales_index, sale_pairs
+from property_models.valuation import ComparablesIndex, HedonicModel
+
+BENCHMARKS: dict[str, Callable[[int], None]] = {}
+
+SUBURBS = ["ASCOT", "STANMORE", "BRUNSWICK", "RICHMOND", "CARLTON"]
+RAW_RECORD_TYPES = [
+    "auction",
+    " Auction",
+    "PRIVATE SALE",
+    "by negotiation",
+    "price guide",
+    "Contact",
+    "week",
+    "no_sale",
+]
+STREET_NAMES = ["FIFTH STREET", "EXAMPLE STREET", "LONG ROAD", "MY ST", "YOUR RD", "THEIR BLVD"]
+HOUSE_FRACTION = 0.7
+MIN_BEDS = 4
+COMPARABLES_K = 10
+PARQUET_LOOKUPS = 50
+
+
+def benchmark(name: str) -> Callable[[Callable[[int], None]], Callable[[int], None]]:
+    """Register a benchmark under `name`."""
+
+    def register(function: Callable[[int], None]) -> Callable[[int], None]:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def synthetic_addresses(n_addresses: int, /, *, seed: int = 0) -> pl.Series:
+    """Return `n_addresses` distinct random addresses as a `pl.Struct` `'address'` series."""
+    rng = np.random.default_rng(seed)
+    street_numbers = np.arange(n_addresses) % 60_000 + 1
+    return pl.DataFrame(
+        {
+            "unit_number": pl.Series(rng.integers(1, 50, n_addresses)).zip_with(
+                pl.Series(rng.random(n_addresses) >= HOUSE_FRACTION), pl.Series([None] * n_addresses)
+            ),
+            "street_number": street_numbers,
+            "street_name": np.asarray(STREET_NAMES)[np.arange(n_addresses) // 60_000 % len(STREET_NAMES)],
+            "suburb": np.asarray(SUBURBS)[np.arange(n_addresses) // (60_000 * len(STREET_NAMES)) % len(SUBURBS)],
+            "postcode": rng.integers(3000, 3999, n_addresses),
+            "state": "VIC",
+            "country": "AUS",
+        },
+        schema_overrides=ADDRESS_SCHEMA,
+    ).select(pl.struct(*ADDRESS_SCHEMA).alias("address"))["address"]
+
+
+def synthetic_price_records(addresses: pl.Series, n_rows: int, /, *, seed: int = 0) -> pl.DataFrame:
+    """Return `n_rows` random price records for the given addresses."""
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame(
+        {
+            "address": addresses.gather(rng.integers(0, len(addresses), n_rows)),
+            "date": pl.date_range(date(2000, 1, 1), date(2024, 12, 31), eager=True).sample(
+                n_rows, with_replacement=True, seed=seed
+            ),
+            "record_type": np.asarray([record_type.value for record_type in RecordType])[
+                rng.integers(0, len(RecordType), n_rows)
+            ],
+            "price": rng.integers(100_000, 3_000_000, n_rows),
+        },
+        schema_overrides={"price": pl.UInt32},
+    )
+
+
+def synthetic_join_inputs(directory: str, n_rows: int, /, *, seed: int = 0) -> tuple[str, str]:
+    """Write synthetic property info and price records Parquet files, returning their paths.
+
+    There is one property per four price records, and most but not all records have a matching property.
+    """
+    rng = np.random.default_rng(seed)
+    addresses = synthetic_addresses(n_rows // 3, seed=seed)
+
+    properties_info = pl.DataFrame(
+        {
+            "address": addresses.head(n_rows // 4),
+            "beds": rng.integers(1, 6, n_rows // 4),
+            "land_size_m2": rng.uniform(100, 1_000, n_rows // 4),
+        },
+        schema_overrides={"beds": pl.UInt8, "land_size_m2": pl.Float32},
+    )
+    price_records = synthetic_price_records(addresses, n_rows, seed=seed)
+
+    properties_path = os.path.join(directory, "properties.parquet")
+    records_path = os.path.join(directory, "records.parquet")
+    properties_info.write_parquet(properties_path)
+    price_records.write_parquet(records_path)
+    return properties_path, records_path
+
+
+def measure(function: Callable, /, *args) -> dict[str, float]:
+    """Run `function(*args)` in a fresh spawned process, returning the wall time and peak memory it used."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_measure, function, *args).result()
+
+
+def _measure(function: Callable, *args) -> dict[str, float]:
+    baseline = _memory_mib("VmRSS")
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "peak_mib": _memory_mib("VmHWM"),
+        "held_mib": _memory_mib("VmRSS") - baseline,
+        "rows": result.height if isinstance(result, pl.DataFrame) else result,
+    }
+
+
+def _memory_mib(field: str, /) -> float:
+    """Read a memory field of this process from `/proc/self/status`, falling back to the peak from `resource`.
+
+    `ru_maxrss` carries over the parent's peak into a spawned process on Linux, so `/proc` is preferred.
+    """
+    with suppress(OSError), open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def report(name: str, results: dict[str, dict[str, float]], /) -> None:
+    """Print a small table of measurements."""
+    print(f"{name}:")
+    for variant, result in results.items():
+        print(
+            f"  {variant:<24} {result['seconds']:8.3f} s  peak {result['peak_mib']:8.1f} MiB  "
+            f"held {result['held_mib']:8.1f} MiB  rows {result['rows']}"
+        )
+
+
+def _join_eager(properties_path: str, records_path: str) -> int:
+    joined = Address.join_on(pl.read_parquet(properties_path), pl.read_parquet(records_path))
+    return joined.filter(pl.col("beds") >= MIN_BEDS).select("address_id", "date", "price").height
+
+
+def _join_lazy(properties_path: str, records_path: str) -> int:
+    joined = Address.join_on(pl.scan_parquet(properties_path), pl.scan_parquet(records_path))
+    return joined.filter(pl.col("beds") >= MIN_BEDS).select("address_id", "date", "price").collect().height
+
+
+@benchmark("join")
+def join_benchmark(n_rows: int) -> None:
+    """Compare peak memory of `Address.join_on` on eager frames against scanned lazy frames."""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = synthetic_join_inputs(directory, n_rows)
+        report("join", {"eager": measure(_join_eager, *paths), "lazy": measure(_join_lazy, *paths)})
+
+
+@benchmark("compact")
+def compact_benchmark(n_rows: int) -> None:
+    """Compare the memory held by price records with plain strings against the compact schema."""
+    with tempfile.TemporaryDirectory() as directory:
+        plain_path = os.path.join(directory, "records.parquet")
+        compact_path = os.path.join(directory, "records_compact.parquet")
+        price_records = synthetic_price_records(synthetic_addresses(n_rows // 3), n_rows)
+        price_records.write_parquet(plain_path)
+        price_records.pipe(to_compact).write_parquet(compact_path)
+        del price_records
+
+        report(
+            "compact",
+            {"plain": measure(pl.read_parquet, plain_path), "compact": measure(pl.read_parquet, compact_path)},
+        )
+
+
+def _parse_record_types_per_row(records_path: str) -> pl.DataFrame:
+    price_records = pl.read_csv(records_path, schema_overrides=PRICE_RECORDS_SCHEMA)
+    return price_records.with_columns(
+        pl.col("record_type").map_elements(
+            lambda record_type: RecordType.parse(record_type, errors="null"), return_dtype=pl.String
+        )
+    )
+
+
+@benchmark("record_type")
+def record_type_benchmark(n_rows: int) -> None:
+    """Compare reading a records csv with `RecordType.parse` per row against `RecordType.parse_expr`."""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        records_path = os.path.join(directory, "records.csv")
+        (
+            synthetic_price_records(synthetic_addresses(n_rows // 3), n_rows)
+            .with_columns(
+                pl.Series("record_type", np.asarray(RAW_RECORD_TYPES)[rng.integers(0, len(RAW_RECORD_TYPES), n_rows)])
+            )
+            .select(*Address.expand_address_column())
+            .select(PRICE_RECORDS_SCHEMA.names())
+            .write_csv(records_path)
+        )
+
+        report(
+            "record_type",
+            {
+                "map_elements": measure(_parse_record_types_per_row, records_path),
+                "parse_expr": measure(PriceRecord._read_csv, records_path),
+            },
+        )
+
+
+def _records_as_rows(n_rows: int) -> list[tuple]:
+    price_records = synthetic_price_records(synthetic_addresses(n_rows // 3), n_rows)
+    return price_records.select(*Address.expand_address_column()).rows()
+
+
+def _build_with_pydantic(n_rows: int) -> int:
+    rows = _records_as_rows(n_rows)
+    start = time.perf_counter()
+    price_records = PriceRecord.to_records(
+        [
+            PriceRecord(
+                address=Address(
+                    unit_number=unit_number,
+                    street_number=street_number,
+                    street_name=street_name,
+                    suburb=suburb,
+                    postcode=postcode,
+                    state=state,
+                    country=country,
+                ),
+                date=record_date,
+                record_type=record_type,
+                price=price,
+            )
+            for record_date, record_type, price, unit_number, street_number, street_name, suburb, postcode, state, country in rows  # noqa: E501
+        ]
+    )
+    return round((time.perf_counter() - start) / price_records.height * 1e6, 2)
+
+
+def _build_with_builder(n_rows: int) -> int:
+    rows = _records_as_rows(n_rows)
+    start = time.perf_counter()
+    builder = PriceRecordBatchBuilder()
+    for record_date, record_type, price, unit_number, street_number, street_name, *_ in rows:
+        builder.append(unit_number, street_number, street_name, record_date, record_type, price)
+    price_records = builder.finish()
+    return round((time.perf_counter() - start) / price_records.height * 1e6, 2)
+
+
+@benchmark("batch_builder")
+def batch_builder_benchmark(n_rows: int) -> None:
+    """Compare building records through `PriceRecord` objects against `PriceRecordBatchBuilder`."""
+    report(
+        "batch_builder (rows column is microseconds per row)",
+        {"to_records": measure(_build_with_pydantic, n_rows), "builder": measure(_build_with_builder, n_rows)},
+    )
+
+
+def _rolling_from_records(records_path: str) -> pl.DataFrame:
+    return PriceAggregates.rolling(PriceAggregates.aggregate(PriceRecord._read_csv(records_path)), months=12)
+
+
+def _rolling_from_aggregates(records_path: str) -> pl.DataFrame:
+    return PriceAggregates.rolling(PriceAggregates(records_path).read(), months=12)
+
+
+@benchmark("aggregates")
+def aggregates_benchmark(n_rows: int) -> None:
+    """Compare 12 month rolling price statistics from the raw records against the stored monthly aggregates."""
+    with tempfile.TemporaryDirectory() as directory:
+        records_path = os.path.join(directory, "records.csv")
+        (
+            synthetic_price_records(synthetic_addresses(n_rows // 3), n_rows)
+            .select(*Address.expand_address_column())
+            .select(PRICE_RECORDS_SCHEMA.names())
+            .write_csv(records_path)
+        )
+        PriceAggregates(records_path).build()
+
+        report(
+            "aggregates",
+            {
+                "from_records": measure(_rolling_from_records, records_path),
+                "from_aggregates": measure(_rolling_from_aggregates, records_path),
+            },
+        )
+
+
+def _index_eager(records_path: str) -> pl.DataFrame:
+    return repeat_sales_index(sale_pairs(pl.read_parquet(records_path)), chunk_size=250_000)
+
+
+def _index_lazy(records_path: str) -> pl.DataFrame:
+    return repeat_sales_index(sale_pairs(pl.scan_parquet(records_path)))
+
+
+@benchmark("repeat_sales")
+def repeat_sales_benchmark(n_rows: int) -> None:
+    """Time a quarterly repeat-sales index per suburb from eagerly read and from scanned records."""
+    with tempfile.TemporaryDirectory() as directory:
+        records_path = os.path.join(directory, "records.parquet")
+        (
+            synthetic_price_records(synthetic_addresses(n_rows // 3), n_rows)
+            .pipe(Address.with_address_id)
+            .write_parquet(records_path)
+        )
+
+        report(
+            "repeat_sales",
+            {"eager": measure(_index_eager, records_path), "lazy": measure(_index_lazy, records_path)},
+        )
+
+
+def synthetic_sales(n_rows: int, /, *, seed: int = 0) -> pl.DataFrame:
+    """Return `n_rows` random sales with the property features used by `HedonicModel`."""
+    rng = np.random.default_rng(seed)
+    property_types = [["apartment", "None"], ["apartment", "modern"], ["free_standing_house", "victorian"]]
+    return pl.DataFrame(
+        {
+            "beds": rng.integers(1, 6, n_rows),
+            "baths": rng.integers(1, 4, n_rows),
+            "cars": rng.integers(0, 3, n_rows),
+            "property_size_m2": rng.uniform(50, 300, n_rows),
+            "land_size_m2": rng.uniform(100, 1_000, n_rows),
+            "property_type": pl.Series(property_types).gather(rng.integers(0, len(property_types), n_rows)),
+            "date": pl.date_range(date(2015, 1, 1), date(2024, 12, 31), eager=True).sample(
+                n_rows, with_replacement=True, seed=seed
+            ),
+            "record_type": RecordType.AUCTION.value,
+            "price": rng.integers(100_000, 3_000_000, n_rows),
+        },
+        schema_overrides={"beds": pl.UInt8, "baths": pl.UInt8, "cars": pl.UInt8, "price": pl.UInt32},
+    )
+
+
+def _hedonic_fit(sales_path: str) -> int:
+    return HedonicModel().partial_fit(pl.read_parquet(sales_path)).n_sales
+
+
+def _hedonic_refit(sales_path: str) -> int:
+    sales = pl.read_parquet(sales_path)
+    model = HedonicModel().partial_fit(sales)
+    start = time.perf_counter()
+    model.partial_fit(sales.tail(sales.height // 100))
+    return round(time.perf_counter() - start, 3)
+
+
+def _hedonic_predict(sales_path: str) -> pl.DataFrame:
+    sales = pl.read_parquet(sales_path)
+    return HedonicModel().partial_fit(sales.head(10_000)).predict(sales)
+
+
+@benchmark("hedonic")
+def hedonic_benchmark(n_rows: int) -> None:
+    """Time fitting `HedonicModel` on all sales, refitting with 1% more (rows column is seconds) and predicting."""
+    with tempfile.TemporaryDirectory() as directory:
+        sales_path = os.path.join(directory, "sales.parquet")
+        synthetic_sales(n_rows).write_parquet(sales_path)
+
+        report(
+            "hedonic",
+            {
+                "fit": measure(_hedonic_fit, sales_path),
+                "refit": measure(_hedonic_refit, sales_path),
+                "predict": measure(_hedonic_predict, sales_path),
+            },
+        )
+
+
+def _comparables_scan(sales_path: str, n_subjects: int) -> int:
+    """Score every sale against each subject in turn, the way comparables were found before `ComparablesIndex`."""
+    sales = pl.read_parquet(sales_path)
+    index = ComparablesIndex(sales)
+    points = pl.DataFrame(index.points(index.sales)).with_row_index("sale")
+    for subject_point in index.points(index.sales.head(n_subjects)):
+        distance = pl.sum_horizontal(
+            (pl.col(column) - value) ** 2 for column, value in zip(points.columns[1:], subject_point)
+        )
+        points.select(pl.col("sale").top_k_by(distance, COMPARABLES_K, reverse=True))
+    return n_subjects
+
+
+def _comparables_blocked(sales_path: str, n_subjects: int) -> int:
+    index = ComparablesIndex(pl.read_parquet(sales_path))
+    return index.query(index.sales.head(n_subjects), k=COMPARABLES_K).height
+
+
+@benchmark("comparables")
+def comparables_benchmark(n_rows: int) -> None:
+    """Compare finding comparables one subject at a time against `ComparablesIndex.query` in batches."""
+    with tempfile.TemporaryDirectory() as directory:
+        sales_path = os.path.join(directory, "sales.parquet")
+        synthetic_sales(n_rows).write_parquet(sales_path)
+
+        report(
+            "comparables",
+            {
+                "scan_100": measure(_comparables_scan, sales_path, 100),
+                "blocked_100": measure(_comparables_blocked, sales_path, 100),
+                "blocked_5000": measure(_comparables_blocked, sales_path, 5000),
+            },
+        )
+
+
+def synthetic_properties_info(n_rows: int, /, *, seed: int = 0) -> pl.DataFrame:
+    """Return valid property information for `n_rows` properties in the layout of `PROPERTIES_INFO_SCHEMA`."""
+    return synthetic_sales(n_rows, seed=seed).select(
+        pl.Series(synthetic_addresses(n_rows, seed=seed)).alias("address"),
+        "beds",
+        "baths",
+        "cars",
+        "property_size_m2",
+        "land_size_m2",
+        pl.lit(None, dtype=pl.String).alias("condition"),
+        "property_type",
+        pl.col("date").alias("construction_date"),
+        pl.lit(1, dtype=pl.UInt8).alias("floors"),
+    )
+
+
+def _without_ledger() -> None:
+    """Stop the validation ledger skipping files validated by an earlier run."""
+    constants.VALIDATION_LEDGER_FILE = None
+
+
+def _validate_per_row(properties_path: str) -> int:
+    """Validate every row as a `PropertyInfo` model, the way `PropertyInfo.read_json` did before `validation_errors`."""
+    properties_info = PropertyInfo.read_json(properties_path, full_validation=False)
+    for item in properties_info.with_columns(pl.col("construction_date").cast(pl.String)).to_dicts():
+        PropertyInfo.from_stringified_dict(item)
+    return properties_info.height
+
+
+def _validate_vectorised(properties_path: str) -> pl.DataFrame:
+    _without_ledger()
+    return PropertyInfo.read_json(properties_path)
+
+
+@benchmark("validation")
+def validation_benchmark(n_rows: int) -> None:
+    """Compare validating property information with pydantic per row against `PropertyInfo.validation_errors`."""
+    with tempfile.TemporaryDirectory() as directory:
+        properties_path = os.path.join(directory, "properties.json")
+        synthetic_properties_info(n_rows).write_json(properties_path)
+
+        report(
+            "validation",
+            {
+                "per_row": measure(_validate_per_row, properties_path),
+                "vectorised": measure(_validate_vectorised, properties_path),
+            },
+        )
+
+
+def _in_directory(directory: str) -> dict[str, str]:
+    """Point the properties info files at `directory`, returning the location of the one suburb written there."""
+    _without_ledger()
+    constants.PROPERTIES_INFO_JSON_FILE = directory + "/{country}_{state}_{suburb}.json"
+    constants.PROPERTIES_INFO_NDJSON_FILE = directory + "/{country}_{state}_{suburb}.ndjson"
+    return {"country": "AUS", "state": "VIC", "suburb": "ASCOT"}
+
+
+def _write_properties_info(directory: str, ndjson: bool) -> int:
+    properties_info = pl.read_parquet(os.path.join(directory, "properties.parquet"))
+    PropertyInfo.write(properties_info, **_in_directory(directory), ndjson=ndjson)
+    return properties_info.height
+
+
+def _read_properties_info(directory: str, ndjson: bool) -> pl.DataFrame:
+    return PropertyInfo.read(**_in_directory(directory), ndjson=ndjson)
+
+
+def _filter_read_json(directory: str) -> pl.DataFrame:
+    location = _in_directory(directory)
+    return PropertyInfo.read_json(PropertyInfo.file(**location)).filter(pl.col("beds") >= MIN_BEDS)
+
+
+def _filter_scan_ndjson(directory: str) -> pl.DataFrame:
+    location = _in_directory(directory)
+    return (
+        PropertyInfo.scan_ndjson(PropertyInfo.file(**location, ndjson=True))
+        .filter(pl.col("beds") >= MIN_BEDS)
+        .collect(streaming=True)
+    )
+
+
+@benchmark("ndjson")
+def ndjson_benchmark(n_rows: int) -> None:
+    """Compare writing and reading property information as pretty printed json against ndjson."""
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic_properties_info(n_rows).write_parquet(os.path.join(directory, "properties.parquet"))
+
+        report(
+            "ndjson",
+            {
+                "write_json": measure(_write_properties_info, directory, False),
+                "write_ndjson": measure(_write_properties_info, directory, True),
+                "read_json": measure(_read_properties_info, directory, False),
+                "read_ndjson": measure(_read_properties_info, directory, True),
+                "filter_read_json": measure(_filter_read_json, directory),
+                "filter_scan_ndjson": measure(_filter_scan_ndjson, directory),
+            },
+        )
+
+
+def _filter_apartments_list(properties_path: str) -> pl.DataFrame:
+    return pl.read_parquet(properties_path).filter(pl.col("property_type").list.get(0) == "apartment")
+
+
+def _filter_apartments_code(properties_path: str) -> pl.DataFrame:
+    return pl.read_parquet(properties_path).filter(PropertyType.parent_expr(PropertyType.APARTMENT))
+
+
+@benchmark("property_type")
+def property_type_benchmark(n_rows: int) -> None:
+    """Compare filtering apartments from `[parent, child]` lists against a range check on `PropertyType` codes."""
+    with tempfile.TemporaryDirectory() as directory:
+        lists_path = os.path.join(directory, "lists.parquet")
+        codes_path = os.path.join(directory, "codes.parquet")
+        properties_info = synthetic_properties_info(n_rows)
+        properties_info.write_parquet(lists_path)
+        properties_info.with_columns(PropertyType.encode_expr()).write_parquet(codes_path)
+
+        report(
+            "property_type",
+            {
+                "list": measure(_filter_apartments_list, lists_path),
+                "code": measure(_filter_apartments_code, codes_path),
+            },
+        )
+
+
+def _views_as_models(properties_path: str) -> int:
+    properties_info = pl.read_parquet(properties_path)
+    models = [PropertyInfo.from_stringified_dict(item) for item in properties_info.to_dicts()]
+    _ = [(model.beds, model.address.street_name) for model in models]
+    return len(models)
+
+
+def _views_as_row_views(properties_path: str) -> int:
+    properties_info = pl.read_parquet(properties_path)
+    views = list(PropertyInfo.iter_views(properties_info))
+    _ = [(view.beds, view.address.street_name) for view in views]
+    return len(views)
+
+
+@benchmark("views")
+def views_benchmark(n_rows: int) -> None:
+    """Compare reading two attributes of every property through `PropertyInfo` models against row views."""
+    with tempfile.TemporaryDirectory() as directory:
+        properties_path = os.path.join(directory, "properties.parquet")
+        synthetic_properties_info(n_rows).write_parquet(properties_path)
+
+        report(
+            "views",
+            {
+                "models": measure(_views_as_models, properties_path),
+                "row_views": measure(_views_as_row_views, properties_path),
+            },
+        )
+
+
+def _store_bulk_load(directory: str) -> int:
+    constants.SQLITE_STORE_FILE = os.path.join(directory, "store.sqlite")
+    price_records = pl.read_parquet(os.path.join(directory, "records.parquet"))
+    PriceRecord.write_store(price_records)
+    return price_records.height
+
+
+def _lookups_scan_parquet(directory: str) -> int:
+    address_ids = pl.read_parquet(os.path.join(directory, "lookups.parquet"))["address_id"].head(PARQUET_LOOKUPS)
+    for address_id in address_ids:
+        pl.scan_parquet(os.path.join(directory, "records.parquet")).filter(pl.col("address_id") == address_id).collect()
+    return len(address_ids)
+
+
+def _lookups_store(directory: str) -> int:
+    constants.SQLITE_STORE_FILE = os.path.join(directory, "store.sqlite")
+    address_ids = pl.read_parquet(os.path.join(directory, "lookups.parquet"))["address_id"]
+    for address_id in address_ids:
+        PriceRecord.read_store(address_id=address_id)
+    return len(address_ids)
+
+
+@benchmark("store")
+def store_benchmark(n_rows: int) -> None:
+    """Compare looking up the records of single addresses in the SQLite store against filtering a Parquet file.
+
+    The store is bulk loaded with all the records first. Filtering the Parquet file is slow, so it is only timed for
+    the first `PARQUET_LOOKUPS` of the 1000 addresses looked up.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        price_records = synthetic_price_records(synthetic_addresses(n_rows // 4), n_rows).pipe(Address.with_address_id)
+        price_records.write_parquet(os.path.join(directory, "records.parquet"))
+        price_records.select(pl.col("address_id").unique().sample(1000, seed=0)).write_parquet(
+            os.path.join(directory, "lookups.parquet")
+        )
+
+        report(
+            "store",
+            {
+                "bulk_load": measure(_store_bulk_load, directory),
+                "lookups_scan_parquet": measure(_lookups_scan_parquet, directory),
+                "lookups_store": measure(_lookups_store, directory),
+            },
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmarks named on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", metavar="name", help=f"benchmarks to run, from {', '.join(BENCHMARKS)}")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    arguments = parser.parse_args(argv)
+
+    if unknown := set(arguments.names) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in arguments.names or BENCHMARKS:
+        BENCHMARKS[name](arguments.rows)
+
+
+if __name__ == "__main__":
+    main()
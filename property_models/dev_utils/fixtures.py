@@ -1,10 +1,12 @@
 import os
 import tempfile
+from contextlib import suppress
 from datetime import date
 
 import pytest
 
 from property_models import constants
+from property_models.locking import LOCK_SUFFIX
 
 TEST_SUBURB = "MY_SUBURB"
 TEST_POSTCODE = 3000
@@ -71,15 +73,17 @@ def mock_postcodes():
 
     constants.POSTCODE_CSV_FILE = original_template
     os.remove(temp_file_path)
+    with suppress(FileNotFoundError):
+        os.remove(temp_file_path.removesuffix(".csv") + constants.POSTCODE_SIDECAR_SUFFIX)
 
 
 ###### PRICE RECORDS MOCKING ########
 
 MOCK_RECORDS_CSV_DATA = f"""
 unit_number,street_number,street_name,date,record_type,price
-{TEST_UNIT_NUMBERS[0] or ""},{TEST_STREET_NUMBERS[0] or ""},{TEST_STREET_NAMES[0] or ""},2020-01-01,auction,1000000
+{TEST_UNIT_NUMBERS[0] or ""},{TEST_STREET_NUMBERS[0] or ""},{TEST_STREET_NAMES[0] or ""},2020-01-01, Auction,1000000
 {TEST_UNIT_NUMBERS[1] or ""},{TEST_STREET_NUMBERS[1] or ""},{TEST_STREET_NAMES[1] or ""},2020-10-01,no_sale,500000
-{TEST_UNIT_NUMBERS[2] or ""},{TEST_STREET_NUMBERS[2] or ""},{TEST_STREET_NAMES[2] or ""},2025-12-01,private_sale,5000000
+{TEST_UNIT_NUMBERS[2] or ""},{TEST_STREET_NUMBERS[2] or ""},{TEST_STREET_NAMES[2] or ""},2025-12-01,PRIVATE SALE,5000000
 """
 
 CORRECT_RECORDS_JSON = {
@@ -115,7 +119,21 @@ def mock_price_records(mock_postcodes):  # noqa: ARG001
     yield temp_file_path
 
     constants.PRICE_RECORDS_CSV_FILE = original_template
-    os.remove(temp_file_path)
+    with suppress(FileNotFoundError):
+        os.remove(temp_file_path)
+    for suffix in (constants.PRICE_RECORDS_KEY_INDEX_SUFFIX, constants.PRICE_AGGREGATES_SUFFIX, ".csv" + LOCK_SUFFIX):
+        with suppress(FileNotFoundError):
+            os.remove(temp_file_path.removesuffix(".csv") + suffix)
+
+
+@pytest.fixture(scope="function")
+def mock_price_records_parquet():
+    """Point the Parquet store of price records at an empty temporary directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = constants.PRICE_RECORDS_PARQUET_DIR
+        constants.PRICE_RECORDS_PARQUET_DIR = temp_dir
+        yield temp_dir
+        constants.PRICE_RECORDS_PARQUET_DIR = original_dir
 
 
 ######## PROPERTY INFO MOCKING ###########
@@ -155,7 +173,7 @@ CORRECT_PROPERTY_INFO_JSON = {
 
 
 @pytest.fixture(scope="function")
-def mock_property_info(mock_postcodes):  # noqa: ARG001
+def mock_property_info(mock_postcodes, mock_validation_ledger):  # noqa: ARG001
     """Create a temporary file with the mock CSV data."""
     with tempfile.NamedTemporaryFile(
         mode="w", delete=False, suffix=f"_{TEST_COUNTRY}_{TEST_STATE}_{TEST_SUBURB}.csv"
@@ -165,7 +183,56 @@ def mock_property_info(mock_postcodes):  # noqa: ARG001
         temp_file_format = temp_file_path.split(f"_{TEST_COUNTRY}")[0] + "_{country}_{state}_{suburb}.csv"
 
     original_template = constants.PROPERTIES_INFO_JSON_FILE
+    original_ndjson_template = constants.PROPERTIES_INFO_NDJSON_FILE
     constants.PROPERTIES_INFO_JSON_FILE = temp_file_format
+    constants.PROPERTIES_INFO_NDJSON_FILE = temp_file_format.removesuffix(".csv") + ".ndjson"
     yield temp_file_path
     constants.PROPERTIES_INFO_JSON_FILE = original_template
-    os.remove(temp_file_path)
+    constants.PROPERTIES_INFO_NDJSON_FILE = original_ndjson_template
+    ndjson_file_path = temp_file_path.removesuffix(".csv") + ".ndjson"
+    for file_path in (temp_file_path, ndjson_file_path, temp_file_path + LOCK_SUFFIX, ndjson_file_path + LOCK_SUFFIX):
+        with suppress(FileNotFoundError):
+            os.remove(file_path)
+
+
+@pytest.fixture(scope="function")
+def mock_validation_ledger():
+    """Point the ledger of validated files at an empty temporary file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_file = constants.VALIDATION_LEDGER_FILE
+        constants.VALIDATION_LEDGER_FILE = os.path.join(temp_dir, "validation.sqlite")
+        yield constants.VALIDATION_LEDGER_FILE
+        constants.VALIDATION_LEDGER_FILE = original_file
+
+
+@pytest.fixture(scope="function")
+def mock_sqlite_store():
+    """Point the SQLite store at an empty temporary file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_file = constants.SQLITE_STORE_FILE
+        constants.SQLITE_STORE_FILE = os.path.join(temp_dir, "store.sqlite")
+        yield constants.SQLITE_STORE_FILE
+        constants.SQLITE_STORE_FILE = original_file
+
+
+######## ADDRESS CACHE MOCKING ###########
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_address_cache():
+    """Point the parsed address cache at an empty temporary file, for every test so none writes to the real cache."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_file = constants.ADDRESS_CACHE_FILE
+        constants.ADDRESS_CACHE_FILE = os.path.join(temp_dir, "address_parsing.sqlite")
+        yield constants.ADDRESS_CACHE_FILE
+        constants.ADDRESS_CACHE_FILE = original_file
+
+
+@pytest.fixture(scope="function")
+def mock_remote_cache():
+    """Point the cache of remote files at an empty temporary directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_dir = constants.REMOTE_CACHE_DIR
+        constants.REMOTE_CACHE_DIR = temp_dir
+        yield temp_dir
+        constants.REMOTE_CACHE_DIR = original_dir
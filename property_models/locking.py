@@ -0,0 +1,100 @@
+"""Crash safe writes and advisory locks for the files of the data tree, see `atomic_write` and `partition_lock`."""
+
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from typing import IO, Literal
+
+import fsspec
+from fsspec.implementations.local import LocalFileSystem
+
+try:
+    import fcntl
+except ImportError:  # Windows, where only threads of one process are serialised.
+    fcntl = None
+
+LOCK_SUFFIX = ".lock"
+
+_thread_locks: dict[str, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+
+
+@contextmanager
+def atomic_write(file: str, /, mode: Literal["w", "wb"] = "wb") -> Iterator[IO]:
+    """Open `file` for writing so that readers only ever see the old or the complete new contents.
+
+    Local files are written to a temporary file beside `file`, flushed to disk and renamed over it on success, then
+    the directory is flushed so the rename survives a crash. The temporary file is removed if writing fails. Object
+    stores already replace a file whole when it is closed, so remote files are written directly.
+
+    e.g.
+    ```
+    with atomic_write("records.csv") as open_file:
+        price_records.write_csv(open_file)
+    ```
+    """
+    file_system, path = fsspec.core.url_to_fs(file)
+    if not isinstance(file_system, LocalFileSystem):
+        with file_system.open(path, mode) as open_file:
+            yield open_file
+        return
+
+    temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, mode, **({"encoding": "utf-8", "newline": ""} if mode == "w" else {})) as open_file:
+            yield open_file
+            open_file.flush()
+            os.fsync(open_file.fileno())
+        os.replace(temp_file, path)
+        _fsync_directory(os.path.dirname(path) or ".")
+    finally:
+        with suppress(FileNotFoundError):
+            os.remove(temp_file)
+
+
+def _fsync_directory(directory: str, /) -> None:
+    """Flush the entries of a directory to disk, on POSIX systems where directories can be opened."""
+    if os.name != "posix":
+        return
+
+    directory_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+
+@contextmanager
+def partition_lock(file: str, /, *, create_directory: bool = False) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `file` and the files kept next to it, blocking until it is free.
+
+    The lock is taken with `flock` on `file` + `LOCK_SUFFIX`, so writers in other threads and processes on the same
+    host serialise on the same partition while different partitions are written in parallel. The lock file is left in
+    place, as removing it would race with the next writer. Remote files are not locked.
+
+    Writers creating a new partition pass `create_directory` to create the directory of `file`, otherwise it must
+    exist already.
+    """
+    file_system, path = fsspec.core.url_to_fs(file)
+    if not isinstance(file_system, LocalFileSystem):
+        yield
+        return
+
+    lock_file = path + LOCK_SUFFIX
+    if create_directory:
+        os.makedirs(os.path.dirname(lock_file) or ".", exist_ok=True)
+
+    if fcntl is None:
+        with _thread_locks_lock:
+            thread_lock = _thread_locks.setdefault(lock_file, threading.Lock())
+        with thread_lock:
+            yield
+        return
+
+    with open(lock_file, "a") as open_lock:
+        fcntl.flock(open_lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(open_lock, fcntl.LOCK_UN)
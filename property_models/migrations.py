@@ -0,0 +1,105 @@
+"""Migrations between storage layouts, run with `python -m property_models.migrations --country AUS`."""
+
+import argparse
+import re
+
+import fsspec
+from tqdm import tqdm
+
+from property_models import constants
+from property_models.constants import ALLOWED_COUNTRIES
+from property_models.locking import LOCK_SUFFIX, partition_lock
+from property_models.models import PriceRecord, PropertyInfo
+
+
+def list_partitions(template: str, /, *, country: ALLOWED_COUNTRIES) -> list[tuple[str, str]]:
+    """Return the `(state, suburb)` pairs with a file matching a `{country}/{state}/{suburb}` file template."""
+    file_system, glob_path = fsspec.core.url_to_fs(template.format(country=country, state="*", suburb="*"))
+    _, placeholder_path = fsspec.core.url_to_fs(template.format(country=country, state="{state}", suburb="{suburb}"))
+    pattern = re.compile(
+        re.escape(placeholder_path)
+        .replace(re.escape("{state}"), "(?P<state>[^/]+?)")
+        .replace(re.escape("{suburb}"), "(?P<suburb>[^/]+?)")
+    )
+
+    partitions = []
+    for path in sorted(file_system.glob(glob_path)):
+        if (match := pattern.fullmatch(path)) is not None:
+            partitions.append((match["state"], match["suburb"]))
+
+    return partitions
+
+
+def migrate_price_records_to_parquet(
+    country: ALLOWED_COUNTRIES, /, *, remove_csv: bool = False
+) -> list[tuple[str, str]]:
+    """Copy every price records csv of a country into the Parquet store, returning the `(state, suburb)` written.
+
+    Each csv is read under its `partition_lock`, so no append is lost. With `remove_csv` each csv is deleted once its
+    partition has been written, along with the key index, aggregates and lock file kept next to it.
+    """
+    partitions = list_partitions(constants.PRICE_RECORDS_CSV_FILE, country=country)
+    sidecar_suffixes = (constants.PRICE_RECORDS_KEY_INDEX_SUFFIX, constants.PRICE_AGGREGATES_SUFFIX)
+
+    for state, suburb in tqdm(partitions, desc="Migrating price records"):
+        csv_file = constants.PRICE_RECORDS_CSV_FILE.format(country=country, state=state, suburb=suburb)
+        file_system, path = fsspec.core.url_to_fs(csv_file)
+
+        with partition_lock(csv_file):
+            price_records = PriceRecord.read(country=country, state=state, suburb=suburb)
+            PriceRecord.write_parquet(price_records, country=country, state=state, suburb=suburb)
+
+            if remove_csv:
+                file_system.rm(path)
+                for sidecar_path in (path + suffix for suffix in sidecar_suffixes):
+                    if file_system.exists(sidecar_path):
+                        file_system.rm(sidecar_path)
+
+        if remove_csv and file_system.exists(path + LOCK_SUFFIX):
+            file_system.rm(path + LOCK_SUFFIX)
+
+    return partitions
+
+
+def migrate_properties_info_to_ndjson(
+    country: ALLOWED_COUNTRIES, /, *, remove_json: bool = False
+) -> list[tuple[str, str]]:
+    """Convert every `properties.json` of a country into `properties.ndjson`, returning the `(state, suburb)` written.
+
+    Each file is validated as it is read. With `remove_json` each json file is deleted once converted.
+    """
+    partitions = list_partitions(constants.PROPERTIES_INFO_JSON_FILE, country=country)
+
+    for state, suburb in tqdm(partitions, desc="Converting properties info"):
+        properties_info = PropertyInfo.read(country=country, state=state, suburb=suburb)
+        PropertyInfo.write(properties_info, country=country, state=state, suburb=suburb, ndjson=True)
+
+        if remove_json:
+            file_system, path = fsspec.core.url_to_fs(PropertyInfo.file(country=country, state=state, suburb=suburb))
+            file_system.rm(path)
+
+    return partitions
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Migrate the price records csv tree of a country into the Parquet store, or its properties info into ndjson."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--country", required=True)
+    parser.add_argument("--remove-csv", action="store_true", help="delete each csv once migrated")
+    parser.add_argument(
+        "--properties-ndjson", action="store_true", help="convert the properties.json files to ndjson instead"
+    )
+    parser.add_argument("--remove-json", action="store_true", help="delete each properties.json once converted")
+    arguments = parser.parse_args(argv)
+
+    if arguments.properties_ndjson:
+        partitions = migrate_properties_info_to_ndjson(arguments.country, remove_json=arguments.remove_json)
+        print(f"Converted {len(partitions)} suburbs to {constants.PROPERTIES_INFO_NDJSON_FILE}")
+        return
+
+    partitions = migrate_price_records_to_parquet(arguments.country, remove_csv=arguments.remove_csv)
+    print(f"Migrated {len(partitions)} suburbs to {constants.PRICE_RECORDS_PARQUET_DIR}")
+
+
+if __name__ == "__main__":
+    main()
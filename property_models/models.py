@@ -1,71 +1,545 @@
+import array
+import hashlib
+import inspect
 import json
+import multiprocessing
+import os
+import re
+import struct
+import time
+import warnings
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
 from datetime import date
-from functools import lru_cache
+from functools import lru_cache, partial
+from importlib.metadata import version
+from typing import ClassVar, Self, TypeVar, get_args
+from urllib.parse import quote
 
 import fsspec
+import numpy as np
 import polars as pl
+import pyarrow as pa
+import pyarrow.ipc
 from au_address_parser import AbAddressUtility
+from fsspec.implementations.local import LocalFileSystem
 from pydantic import BaseModel, ConfigDict
-from tqdm import tqdm
 
 from property_models import constants
+from property_models.caching import ParseCache, RemoteFileCache, ValidationLedger, local_path
 from property_models.constants import (
     ADDRESS_SCHEMA,
     ALLOWED_COUNTRIES,
+    COMPACT_ADDRESS_SCHEMA,
+    COMPACT_PRICE_RECORDS_SCHEMA,
     POSTCODE_SCHEMA,
+    POSTCODE_SIDECAR_SUFFIX,
+    POSTCODE_SIDECAR_VERSION,
+    PRICE_AGGREGATES_SCHEMA,
+    PRICE_AGGREGATES_SUFFIX,
+    PRICE_RECORDS_KEY_INDEX_SUFFIX,
     PRICE_RECORDS_SCHEMA,
+    PRICE_RECORDS_STORE_SCHEMA,
+    PROPERTIES_INFO_RAW_SCHEMA,
     PROPERTIES_INFO_SCHEMA,
+    PROPERTIES_INFO_STORE_SCHEMA,
     PropertyCondition,
     PropertyType,
     RecordType,
 )
+from property_models.locking import atomic_write, partition_lock
+from property_models.store import SqliteStore
+
+# Bump for parser changes `Address.parser_version` cannot see, i.e. outside the code of `Address._field_parser` and the
+# field parsers it returns.
+ADDRESS_PARSER_VERSION = "1"
+# Bump for validator changes `PropertyInfo.validator_version` cannot see, i.e. outside the code of
+# `PropertyInfo.validation_errors`, the raw schema and the fields and allowed values of `PropertyInfo`.
+PROPERTY_INFO_VALIDATOR_VERSION = "1"
+# The ndjson reader panics on small integer columns, so these are read as `pl.Int64` and cast afterwards.
+NDJSON_READ_SCHEMA = {
+    name: pl.Int64 if dtype.is_integer() else dtype for name, dtype in PROPERTIES_INFO_RAW_SCHEMA.items()
+}
+ADDRESS_ID_DTYPE = pl.UInt64
+
+FrameType = TypeVar("FrameType", pl.DataFrame, pl.LazyFrame)
+
+FNV_OFFSET_BASIS = np.uint64(0xCBF29CE484222325)
+FNV_PRIME = np.uint64(0x100000001B3)
+SEPARATORS_PATTERN = re.compile(r"[\s_]+")
+
+
+def _normalise_strings(strings: pl.Series, /) -> pl.Series:
+    """Strip, upper case and collapse runs of whitespace or underscores, normalising each distinct value once."""
+    distinct = strings.unique().drop_nulls()
+    normalised = distinct.str.strip_chars().str.to_uppercase().str.replace_all(SEPARATORS_PATTERN.pattern, " ")
+    return strings.replace_strict(distinct, normalised, default=None, return_dtype=pl.String)
+
+
+def _street_key(street_name: str | None, /) -> str | None:
+    """Normalise a street name as in `Address.canonical_expr`, into the `'street_key'` the SQLite store looks up.
+
+    Single names are normalised with Python string methods, as building a `pl.Series` per lookup is far slower.
+    """
+    return None if street_name is None else SEPARATORS_PATTERN.sub(" ", street_name.strip().upper())
+
+
+def _with_street_key(dataframe: pl.DataFrame, /) -> pl.DataFrame:
+    """Add the `'street_key'` of the `'street_name'` column of a flat frame, see `_street_key`."""
+    return dataframe.with_columns(
+        pl.col("street_name")
+        .map_batches(_normalise_strings, return_dtype=pl.String, is_elementwise=True)
+        .alias("street_key")
+    )
+
+
+class AddressCollisionError(ValueError):
+    """Different addresses were found to share the same `'address_id'`."""
+
+
+class PropertyInfoValidationError(ValueError):
+    """Some rows of property information break the rules of `PropertyInfo`, listed in `errors`."""
+
+    def __init__(self, message: str, /, errors: pl.DataFrame):
+        """Create the error with a report of the failing rows, as given by `PropertyInfo.validation_errors`."""
+        super().__init__(message)
+        self.errors = errors
+
+
+class MissingDataWarning(UserWarning):
+    """Some of the requested data files could not be found and were skipped."""
+
+
+def _read_files_concurrently(
+    read_file: Callable[[str], pl.DataFrame], files: list[str], /, *, max_workers: int | None = None
+) -> list[pl.DataFrame | None]:
+    """Read each file on a thread pool, giving `None` for the files that do not exist."""
+
+    def read_file_or_none(file: str) -> pl.DataFrame | None:
+        try:
+            return read_file(file)
+        except FileNotFoundError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(read_file_or_none, files))
+
+
+def _warn_missing(suburbs: list[tuple[str, str]], frames: list[pl.DataFrame | None], /) -> None:
+    """Warn about the `(state, suburb)` pairs whose file could not be read."""
+    if missing := [suburb for suburb, frame in zip(suburbs, frames, strict=True) if frame is None]:
+        warnings.warn(f"Skipped {len(missing)} suburbs without data: {missing!r}", MissingDataWarning, stacklevel=3)
+
+
+def _find_address_collisions(joined_addresses: pl.DataFrame, /) -> pl.DataFrame:
+    """Return the rows of a frame joined on `'address_id'` whose `'address'` and `'address_right'` differ.
+
+    Only rows whose addresses are not exactly equal get normalised and compared.
+    """
+    collisions = joined_addresses.filter(
+        pl.col("address").is_not_null()
+        & pl.col("address_right").is_not_null()
+        & pl.col("address").ne_missing(pl.col("address_right"))
+    ).filter(Address.canonical_expr(pl.col("address")) != Address.canonical_expr(pl.col("address_right")))
+
+    return collisions
+
+
+def _coalesce_checked_addresses(joined_addresses: pl.Series, /) -> pl.Series:
+    """Take the left address of a joined `{address, address_right}` struct, or the right one where it is missing.
+
+    Raises an `AddressCollisionError` if any row holds two different addresses.
+    """
+    addresses = joined_addresses.struct.unnest()
+
+    if not (collisions := _find_address_collisions(addresses)).is_empty():
+        raise AddressCollisionError(f"Different addresses were joined on the same `'address_id'`:\n{collisions}")
+
+    return addresses.select(pl.coalesce("address", "address_right")).to_series()
+
+
+def to_compact(dataframe: pl.DataFrame, /) -> pl.DataFrame:
+    """Cast the `'address'`, `'street_name'` and `'record_type'` columns present to their compact dtypes.
+
+    See `constants.COMPACT_ADDRESS_SCHEMA` and `constants.COMPACT_PRICE_RECORDS_SCHEMA`.
+    """
+    compact_dtypes = {
+        "address": pl.Struct(COMPACT_ADDRESS_SCHEMA),
+        "street_name": COMPACT_PRICE_RECORDS_SCHEMA["street_name"],
+        "record_type": COMPACT_PRICE_RECORDS_SCHEMA["record_type"],
+    }
+    columns = dataframe.collect_schema().names()
+
+    # Casting several chunks to `pl.Categorical` without a `pl.StringCache` gives clashing encodings, so rechunk first.
+    return dataframe.rechunk().cast({column: dtype for column, dtype in compact_dtypes.items() if column in columns})
+
+
+@lru_cache
+def _sqlite_store(store_file: str, /) -> SqliteStore:
+    """Open the SQLite store at `store_file`, shared by `PriceRecord` and `PropertyInfo`."""
+    return SqliteStore(store_file)
+
+
+@lru_cache
+def _remote_file_cache(cache_dir: str, /, *, max_bytes: int) -> RemoteFileCache:
+    return RemoteFileCache(cache_dir, max_bytes=max_bytes)
+
+
+def remote_file_cache() -> RemoteFileCache | None:
+    """Return the cache of remote files read, see `constants.REMOTE_CACHE_DIR`, or `None` if it is disabled."""
+    if constants.REMOTE_CACHE_DIR is None:
+        return None
+    return _remote_file_cache(constants.REMOTE_CACHE_DIR, max_bytes=constants.REMOTE_CACHE_SIZE)
+
+
+def _read_through(file: str, /) -> str:
+    """Return a local copy of a remote `file` from the remote file cache, or `file` itself if local or uncached."""
+    return file if (cache := remote_file_cache()) is None else cache.get(file)
+
+
+def _fnv1a_64(strings: pl.Series, /) -> pl.Series:
+    """Hash each string with 64-bit FNV-1a, vectorised over the rows one byte position at a time.
+
+    Rows are sorted by length once, so each byte position only touches the prefix of rows still long enough.
+    """
+    strings_arrow = strings.cast(pl.String).fill_null("").to_arrow(compat_level=pl.CompatLevel.oldest())
+    _validity, offsets_buffer, data_buffer = strings_arrow.buffers()
+
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[
+        strings_arrow.offset : strings_arrow.offset + len(strings) + 1
+    ]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.empty(0, dtype=np.uint8)
+    lengths = np.diff(offsets)
+
+    by_length = np.argsort(-lengths, kind="stable")
+    starts = offsets[:-1][by_length]
+    sorted_lengths = lengths[by_length]
+
+    hashes = np.full(len(strings), FNV_OFFSET_BASIS, dtype=np.uint64)
+    for position in range(int(sorted_lengths[0]) if len(strings) else 0):
+        active = int(np.searchsorted(-sorted_lengths, -position, side="left"))
+        hashes[:active] ^= data[starts[:active] + position]
+        hashes[:active] *= FNV_PRIME
+
+    unsorted_hashes = np.empty_like(hashes)
+    unsorted_hashes[by_length] = hashes
+
+    return pl.Series(strings.name, unsorted_hashes, dtype=ADDRESS_ID_DTYPE)
 
 
 ####### POSTCODES #####################
+class PostcodeIndex:
+    """Hash index over a postcode table, mapping suburbs to postcodes and postcodes to suburbs.
+
+    Both directions keep every match in file order, so the first entry of each list is the same row a
+    `pl.DataFrame.filter` over the table would have returned first.
+    """
+
+    def __init__(self, postcodes: pl.DataFrame, /):
+        """Build the lookup tables from a normalised postcode table."""
+        self.suburbs = (
+            postcodes.group_by("suburb", maintain_order=True)
+            .agg(pl.col("postcode").alias("postcodes"))
+            .with_columns(pl.col("postcodes").list.unique(maintain_order=True))
+        )
+        self.postcodes = (
+            postcodes.group_by("postcode", maintain_order=True)
+            .agg(pl.col("suburb").alias("suburbs"))
+            .with_columns(pl.col("suburbs").list.unique(maintain_order=True))
+        )
+
+        self.suburb_to_postcodes: dict[str, list[int]] = dict(self.suburbs.iter_rows())
+        self.postcode_to_suburbs: dict[int, list[str]] = dict(self.postcodes.iter_rows())
+
+
+class TrigramIndex:
+    """Inverted trigram index over a set of names, ranking fuzzy matches by trigram Jaccard similarity.
+
+    Names are split into words and each word is padded (`"  word "`) before taking trigrams, so word starts weigh
+    more than word ends. Each query gathers the posting lists of its trigrams and counts the overlap with one
+    `np.bincount`, which keeps a query against every Australian suburb well under a millisecond.
+    """
+
+    def __init__(self, names: pl.Series, /):
+        """Build the index over the (unique) names."""
+        self.names: list[str] = names.unique(maintain_order=True).drop_nulls().to_list()
+
+        postings: dict[str, list[int]] = {}
+        trigram_counts = []
+        for name_id, name in enumerate(self.names):
+            trigrams = self.trigrams(name)
+            trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(name_id)
+
+        self.trigram_counts = np.array(trigram_counts, dtype=np.int32)
+        self.postings = {trigram: np.array(name_ids, dtype=np.int32) for trigram, name_ids in postings.items()}
+
+    @staticmethod
+    def trigrams(name: str, /) -> set[str]:
+        """Return the set of padded word trigrams for a name."""
+        trigrams = set()
+        for word in re.findall(r"[A-Z0-9]+", name.upper()):
+            padded_word = f"  {word} "
+            trigrams.update(padded_word[i : i + 3] for i in range(len(word) + 1))
+        return trigrams
+
+    def query(self, name: str, /, *, limit: int = 5, min_score: float = 0.0) -> list[tuple[str, float]]:
+        """Return up to `limit` `(name, score)` candidates for `name`, best first, with scores in `[0, 1]`."""
+        trigrams = self.trigrams(name)
+        posting_lists = [self.postings[trigram] for trigram in trigrams if trigram in self.postings]
+        if not posting_lists:
+            return []
+
+        shared = np.bincount(np.concatenate(posting_lists), minlength=len(self.trigram_counts))
+        scores = shared / (len(trigrams) + self.trigram_counts - shared)
+
+        limit = min(limit, len(scores))
+        candidates = np.argpartition(-scores, limit - 1)[:limit]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        matches = [
+            (self.names[candidate], score)
+            for candidate, score in zip(candidates.tolist(), scores[candidates].tolist())
+            if score > 0 and score >= min_score
+        ]
+        return matches
+
+    def query_many(self, names: pl.Series, /, *, min_score: float = 0.0) -> pl.DataFrame:
+        """Resolve a column of names to their best match.
+
+        Each unique name is queried once. Returns a frame aligned with `names` holding the matched `name` and its
+        `score`, both null where nothing scores at least `min_score`.
+        """
+        unique_names = names.cast(pl.String).unique().drop_nulls()
+
+        best_matches = [
+            (name, *(matches[0] if (matches := self.query(name, limit=1, min_score=min_score)) else (None, None)))
+            for name in unique_names
+        ]
+        lookup = pl.DataFrame(
+            best_matches,
+            schema={"query": pl.String, "name": pl.String, "score": pl.Float64},
+            orient="row",
+        )
+
+        resolved = names.cast(pl.String).to_frame("query").join(lookup, on="query", how="left").select("name", "score")
+        return resolved
+
+
 class Postcode:
     """Class to hold postcodes for different countries and convert between postcodes and suburbs."""
 
+    REMOTE_RECHECK_SECONDS: ClassVar[float] = 60.0
+    _remote_file_keys: ClassVar[dict[str, tuple[float, tuple[str, float | str | None, int]]]] = {}
+
+    @classmethod
+    def read_postcodes(cls, *, country: ALLOWED_COUNTRIES) -> pl.DataFrame:
+        """Read postcode for given country.
+
+        Cached in process on the resolved file path, mtime and size, so pointing `constants.POSTCODE_CSV_FILE`
+        somewhere else or editing a local file is picked up by the next call, and editing a remote file within
+        `Postcode.REMOTE_RECHECK_SECONDS`.
+        """
+        return cls._read_postcodes_file(*cls._postcode_file_key(country=country))
+
+    @classmethod
+    def read_index(cls, *, country: ALLOWED_COUNTRIES) -> PostcodeIndex:
+        """Build (once per postcode file) the hash index over the postcodes for the given country."""
+        return cls._read_index_file(*cls._postcode_file_key(country=country))
+
+    @classmethod
+    def read_fuzzy_index(cls, *, country: ALLOWED_COUNTRIES) -> TrigramIndex:
+        """Build (once per postcode file) the trigram index over the suburbs for the given country."""
+        return cls._read_fuzzy_index_file(*cls._postcode_file_key(country=country))
+
+    @classmethod
+    def _postcode_file_key(cls, *, country: ALLOWED_COUNTRIES) -> tuple[str, float | str | None, int]:
+        """Return the resolved postcode file with its modification time and size, used as the cache key.
+
+        A local file is checked with one `os.stat` per call. A remote file is only checked again once its last check
+        is `REMOTE_RECHECK_SECONDS` old, as every check is a round trip.
+        """
+        postcode_file = constants.POSTCODE_CSV_FILE.format(country=country)
+
+        if (resolved_file := cls._resolve_local_file(postcode_file)) is not None:
+            file_stat = os.stat(resolved_file)
+            return resolved_file, file_stat.st_mtime, file_stat.st_size
+
+        checked_at, file_key = cls._remote_file_keys.get(postcode_file, (-np.inf, None))
+        if file_key is None or time.monotonic() - checked_at > cls.REMOTE_RECHECK_SECONDS:
+            file_system, path = fsspec.core.url_to_fs(postcode_file)
+            file_info = file_system.info(path)
+            file_key = (postcode_file, RemoteFileCache.version(file_info), file_info["size"])
+            cls._remote_file_keys[postcode_file] = (time.monotonic(), file_key)
+
+        return file_key
+
     @lru_cache
     @staticmethod
-    def read_postcodes(*, country: ALLOWED_COUNTRIES) -> pl.DataFrame:
-        """Read postcode for given country."""
-        postcode_file = constants.POSTCODE_CSV_FILE.format(country=country)
+    def _resolve_local_file(postcode_file: str, /) -> str | None:
+        """Return the real path of a local postcode file, or `None` if it is remote."""
+        return None if (path := local_path(postcode_file)) is None else os.path.realpath(path)
 
+    @lru_cache
+    @staticmethod
+    def _read_index_file(postcode_file: str, mtime: float | str | None, size: int, /) -> PostcodeIndex:
+        """Build the index for one version of a postcode file."""
+        return PostcodeIndex(Postcode._read_postcodes_file(postcode_file, mtime, size))
+
+    @lru_cache
+    @staticmethod
+    def _read_fuzzy_index_file(postcode_file: str, mtime: float | str | None, size: int, /) -> TrigramIndex:
+        """Build the trigram index for one version of a postcode file."""
+        return TrigramIndex(Postcode._read_index_file(postcode_file, mtime, size).suburbs["suburb"])
+
+    @lru_cache
+    @staticmethod
+    def _read_postcodes_file(postcode_file: str, mtime: float | str | None, size: int, /) -> pl.DataFrame:
+        """Read one version of a postcode file, through its binary sidecar when the file is local.
+
+        The sidecar is an Arrow IPC file holding the normalised table next to the csv, tagged with the mtime and
+        size of the csv it was built from. It is memory mapped on load and rebuilt whenever the tags go stale.
+        """
+        file_system, _path = fsspec.core.url_to_fs(postcode_file)
+        if not isinstance(file_system, LocalFileSystem):
+            return Postcode._parse_postcodes_csv(postcode_file)
+
+        sidecar_file = postcode_file.removesuffix(".csv") + POSTCODE_SIDECAR_SUFFIX
+        sidecar_tags = {
+            b"version": POSTCODE_SIDECAR_VERSION,
+            b"mtime": str(mtime).encode(),
+            b"size": str(size).encode(),
+        }
+
+        with suppress(OSError, pa.ArrowInvalid):
+            sidecar = pa.ipc.open_file(pa.memory_map(sidecar_file))
+            if sidecar.schema.metadata == sidecar_tags:
+                return pl.from_arrow(sidecar.read_all())
+
+        postcodes = Postcode._parse_postcodes_csv(postcode_file)
+
+        with suppress(OSError):
+            postcodes_arrow = postcodes.to_arrow()
+            postcodes_arrow = postcodes_arrow.replace_schema_metadata(sidecar_tags)
+            temp_file = f"{sidecar_file}.{os.getpid()}.tmp"
+            with pa.OSFile(temp_file, "wb") as sink, pa.ipc.new_file(sink, postcodes_arrow.schema) as writer:
+                writer.write_table(postcodes_arrow)
+            os.replace(temp_file, sidecar_file)
+
+        return postcodes
+
+    @staticmethod
+    def _parse_postcodes_csv(postcode_file: str, /) -> pl.DataFrame:
+        """Parse and normalise a postcode csv."""
         postcodes_raw = pl.read_csv(postcode_file, schema=POSTCODE_SCHEMA)
 
         postcodes = postcodes_raw.select(
-            pl.col("suburb").str.strip_chars().str.to_uppercase().str.replace(" ", "_"),
+            Postcode.clean_suburb_expr(pl.col("suburb")),
             pl.col("postcode"),
         )
 
         return postcodes
 
+    @staticmethod
+    def clean_suburb(suburb: str, /) -> str:
+        """Normalise a suburb name to the format stored in the postcode table."""
+        return suburb.strip().upper().replace(" ", "_")
+
+    @staticmethod
+    def clean_suburb_expr(suburb: pl.Expr, /) -> pl.Expr:
+        """Return polars expression normalising suburb names, see `Postcode.clean_suburb`."""
+        return suburb.str.strip_chars().str.to_uppercase().str.replace_all(" ", "_")
+
     @classmethod
     def find_suburb(cls, *, postcode: int, country: ALLOWED_COUNTRIES) -> str:
         """Find suburb name for the given postcode."""
-        postcodes = cls.read_postcodes(country=country)
+        index = cls.read_index(country=country)
 
         try:
-            suburb = postcodes.filter(pl.col("postcode") == postcode).select("suburb").item(0, 0)
-        except IndexError:
-            raise ValueError(f"Could not find suburb: {suburb!r}") from None
+            suburb = index.postcode_to_suburbs[postcode][0]
+        except KeyError:
+            raise ValueError(f"Could not find postcode: {postcode!r}") from None
 
         return suburb
 
     @classmethod
     def find_postcode(cls, *, suburb: str, country: ALLOWED_COUNTRIES) -> int:
         """Find postcode name for the given suburb."""
-        postcodes = cls.read_postcodes(country=country)
-
-        suburb_clean = suburb.strip().upper().replace(" ", "_")
+        index = cls.read_index(country=country)
 
         try:
-            clean = postcodes.filter(pl.col("suburb") == suburb_clean).select("postcode").item(0, 0)
-        except IndexError:
+            clean = index.suburb_to_postcodes[cls.clean_suburb(suburb)][0]
+        except KeyError:
             raise ValueError(f"Could not find suburb: {suburb!r}") from None
 
         return clean
 
+    @classmethod
+    def find_suburbs(cls, postcodes: pl.Series, /, *, country: ALLOWED_COUNTRIES) -> pl.Series:
+        """Find every suburb for each postcode in a column.
+
+        Returns a `pl.List(pl.String)` series aligned with `postcodes`, null where a postcode is unknown.
+        """
+        index = cls.read_index(country=country)
+
+        suburbs = (
+            postcodes.cast(POSTCODE_SCHEMA["postcode"], strict=False)
+            .alias("postcode")
+            .to_frame()
+            .join(index.postcodes, on="postcode", how="left")
+            .get_column("suburbs")
+        )
+
+        return suburbs
+
+    @classmethod
+    def find_postcodes(cls, suburbs: pl.Series, /, *, country: ALLOWED_COUNTRIES) -> pl.Series:
+        """Find every postcode for each suburb in a column.
+
+        Returns a `pl.List(pl.UInt16)` series aligned with `suburbs`, null where a suburb is unknown.
+        """
+        index = cls.read_index(country=country)
+
+        postcodes = (
+            suburbs.cast(pl.String)
+            .to_frame("suburb")
+            .select(cls.clean_suburb_expr(pl.col("suburb")))
+            .join(index.suburbs, on="suburb", how="left")
+            .get_column("postcodes")
+        )
+
+        return postcodes
+
+    @classmethod
+    def fuzzy_find_suburb(
+        cls, *, suburb: str, country: ALLOWED_COUNTRIES, limit: int = 5, min_score: float = 0.0
+    ) -> list[tuple[str, float]]:
+        """Find the suburbs closest to a possibly misspelt name, as ranked `(suburb, score)` candidates."""
+        return cls.read_fuzzy_index(country=country).query(suburb, limit=limit, min_score=min_score)
+
+    @classmethod
+    def fuzzy_find_postcodes(
+        cls, suburbs: pl.Series, /, *, country: ALLOWED_COUNTRIES, min_score: float = 0.5
+    ) -> pl.DataFrame:
+        """Fuzzy resolve a column of suburbs.
+
+        Returns a frame aligned with `suburbs` holding the best matching `suburb`, its `score` and every
+        `postcodes` for it. Exact matches always score `1.0`, and rows scoring under `min_score` are null.
+        """
+        index = cls.read_index(country=country)
+
+        resolved = (
+            cls.read_fuzzy_index(country=country)
+            .query_many(suburbs, min_score=min_score)
+            .rename({"name": "suburb"})
+            .join(index.suburbs, on="suburb", how="left")
+        )
+
+        return resolved
+
 
 ####### ADDRESSES ########################
 class Address(BaseModel):
@@ -80,67 +554,355 @@ class Address(BaseModel):
     country: ALLOWED_COUNTRIES
 
     @classmethod
-    def parse(cls, address, *, country: ALLOWED_COUNTRIES) -> "Address":
-        """Takes an address and a country and parses to a common format."""
+    def parse(cls, address, *, country: ALLOWED_COUNTRIES, cache: bool = True) -> "Address":
+        """Takes an address and a country and parses to a common format.
+
+        Parsed fields are memoised in `Address.cache`, so each raw address is only parsed once per
+        `Address.parser_version`.
+        """
+        field_parser = cls._field_parser(country)
+
+        if not cache:
+            return cls(**field_parser(address))
+
+        address_cache = cls.cache()
+        if (address_fields := address_cache.get(country, address)) is None:
+            address_fields = field_parser(address)
+            address_cache.put(country, address, address_fields)
+
+        address_object = cls(**address_fields)
+
+        return address_object
+
+    @classmethod
+    def cache(cls) -> ParseCache:
+        """Return the parsed address cache for `constants.ADDRESS_CACHE_FILE`, its hit counters are in `.stats`."""
+        return cls._read_cache(constants.ADDRESS_CACHE_FILE, constants.ADDRESS_CACHE_SIZE)
+
+    @lru_cache
+    @staticmethod
+    def _read_cache(cache_file: str | None, max_size: int, /) -> ParseCache:
+        """Create the parsed address cache for one cache file."""
+        return ParseCache(cache_file, parser_version=Address.parser_version(), max_size=max_size)
+
+    @lru_cache
+    @staticmethod
+    def parser_version() -> str:
+        """Return the version keying `Address.cache`, changing whenever the address parsing code changes.
+
+        Combines `ADDRESS_PARSER_VERSION`, a hash of the source of the field parsers and the `au-address-parser`
+        version, so a parser change does not serve stale results from the cache.
+        """
+        parser_source = hashlib.blake2b(digest_size=8)
+        for parser in (Address._field_parser, Address._parse_australian_address_fields):
+            with suppress(OSError, TypeError):
+                parser_source.update(inspect.getsource(parser).encode())
+
+        return f"{ADDRESS_PARSER_VERSION}+{parser_source.hexdigest()}+au-address-parser-{version('au-address-parser')}"
+
+    @classmethod
+    def parse_many(
+        cls,
+        addresses: Iterable[str] | pl.Series,
+        /,
+        *,
+        country: ALLOWED_COUNTRIES,
+        workers: int | None = None,
+        chunk_size: int = 1_000,
+        cache: bool = True,
+    ) -> pl.DataFrame:
+        """Parse many addresses straight into an `'address'` struct column, spreading chunks over a process pool.
+
+        Returns a frame aligned with `addresses` holding the parsed `address` (null where parsing failed) and the
+        `error` message for rows that could not be parsed (null where parsing worked). No `Address` is built per
+        row. With `workers` unset or `1` the chunks are parsed in the current process. Like `Address.parse`, results
+        go through `Address.cache`, and the hit counters of the workers are added to the ones of this process.
+        """
+        cls._field_parser(country)
+
+        addresses = addresses.to_list() if isinstance(addresses, pl.Series) else list(addresses)
+        chunks = [addresses[start : start + chunk_size] for start in range(0, len(addresses), chunk_size)]
+        # Spawned workers import fresh constants, so they are told which cache file to use.
+        parse_chunk = partial(
+            cls._parse_chunk,
+            country=country,
+            cache=cache,
+            cache_file=constants.ADDRESS_CACHE_FILE,
+            cache_size=constants.ADDRESS_CACHE_SIZE,
+        )
+
+        if workers is None or workers <= 1 or len(chunks) <= 1:
+            parsed_chunks = [parse_chunk(chunk)[0] for chunk in chunks]
+        else:
+            # polars is multithreaded, so forking is unsafe, spawn fresh workers instead
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                parsed_chunks = []
+                for parsed_chunk, cache_stats in executor.map(parse_chunk, chunks):
+                    parsed_chunks.append(parsed_chunk)
+                    cls.cache().stats.update(cache_stats)
+
+        parsed_addresses = pl.concat(parsed_chunks) if parsed_chunks else cls._build_parsed_frame([], [])
+
+        return parsed_addresses
+
+    @classmethod
+    def _parse_chunk(
+        cls,
+        addresses: list[str],
+        /,
+        *,
+        country: ALLOWED_COUNTRIES,
+        cache: bool = True,
+        cache_file: str | None,
+        cache_size: int,
+    ) -> tuple[pl.DataFrame, Counter]:
+        """Parse a chunk of addresses, see `Address.parse_many`, also returning the cache hits it made."""
+        field_parser = cls._field_parser(country)
+
+        address_cache = cls._read_cache(cache_file, cache_size)
+        cache_stats_before = address_cache.stats.copy()
+        cached_addresses = address_cache.get_many(country, addresses) if cache else {}
+        new_addresses = {}
+
+        parsed_addresses, errors = [], []
+        for address in addresses:
+            if (address_fields := cached_addresses.get(address, new_addresses.get(address))) is not None:
+                parsed_addresses.append(address_fields)
+                errors.append(None)
+                continue
+
+            try:
+                address_fields = field_parser(address)
+                parsed_addresses.append(address_fields)
+                errors.append(None)
+                new_addresses[address] = address_fields
+            except Exception as exc:
+                parsed_addresses.append(None)
+                errors.append(f"{type(exc).__name__}: {exc}")
+
+        try:
+            parsed_chunk = cls._build_parsed_frame(parsed_addresses, errors)
+        except OverflowError:
+            # A value does not fit `ADDRESS_SCHEMA`, build row by row to find which.
+            parsed_chunk = pl.concat(
+                [cls._build_parsed_row(address, error) for address, error in zip(parsed_addresses, errors)]
+            )
+
+        if cache:
+            address_cache.put_many(country, new_addresses)
+
+        return parsed_chunk, address_cache.stats - cache_stats_before
+
+    @classmethod
+    def _build_parsed_row(cls, parsed_address: dict | None, error: str | None, /) -> pl.DataFrame:
+        """Build a single parsed row, moving an address which does not fit `ADDRESS_SCHEMA` to the error column."""
+        try:
+            return cls._build_parsed_frame([parsed_address], [error])
+        except OverflowError as exc:
+            return cls._build_parsed_frame([None], [f"{type(exc).__name__}: {exc} in {parsed_address!r}"])
+
+    @staticmethod
+    def _build_parsed_frame(parsed_addresses: list[dict | None], errors: list[str | None], /) -> pl.DataFrame:
+        """Build the `'address'` struct and `'error'` columns from parsed field dictionaries, column by column."""
+        address_columns = {
+            field: [None if parsed_address is None else parsed_address[field] for parsed_address in parsed_addresses]
+            for field in ADDRESS_SCHEMA
+        }
+
+        parsed_frame = pl.DataFrame(address_columns, schema=ADDRESS_SCHEMA).select(
+            pl.when(pl.lit(pl.Series(errors, dtype=pl.String)).is_null())
+            .then(pl.struct(*ADDRESS_SCHEMA.names()))
+            .alias("address"),
+            pl.lit(pl.Series(errors, dtype=pl.String)).alias("error"),
+        )
+
+        return parsed_frame
+
+    @classmethod
+    def _field_parser(cls, country: ALLOWED_COUNTRIES, /) -> Callable[[str], dict]:
+        """Return the function parsing an address into a dictionary of `ADDRESS_SCHEMA` fields for a country."""
         match country:
             case "AUS":
-                address_object = cls._parse_australian_address(address)
+                field_parser = cls._parse_australian_address_fields
 
             case _:
                 raise NotImplementedError(f"Cannot parse address for {country!r}")
 
-        return address_object
+        return field_parser
 
     @classmethod
     def _parse_australian_address(cls, address) -> "Address":
         """Parses Australia specific address."""
+        return cls(**cls._parse_australian_address_fields(address))
+
+    @staticmethod
+    def _parse_australian_address_fields(address) -> dict:
+        """Parses Australia specific address into a dictionary of `ADDRESS_SCHEMA` fields."""
         parsed_address = AbAddressUtility(address)
 
-        address_object = cls(
-            unit_number=int(parsed_address._flat) if parsed_address._flat else None,
-            street_number=int(parsed_address._number_first),
-            street_name=parsed_address._street,
-            suburb=parsed_address._locality,
-            postcode=int(parsed_address._post),
-            state=parsed_address._state,
-            country="AUS",
-        )
+        address_fields = {
+            "unit_number": int(parsed_address._flat) if parsed_address._flat else None,
+            "street_number": int(parsed_address._number_first),
+            "street_name": parsed_address._street,
+            "suburb": parsed_address._locality,
+            "postcode": int(parsed_address._post),
+            "state": parsed_address._state,
+            "country": "AUS",
+        }
 
-        return address_object
+        return address_fields
 
     @classmethod
-    def join_on(cls, dataframe_1: pl.DataFrame, dataframe_2: pl.DataFrame, /) -> pl.DataFrame:
-        """Join two dataframes with a `pl.Struct` `'address'` column on the addresses."""
+    def join_on(cls, dataframe_1: FrameType, dataframe_2: FrameType, /, *, check_collisions: bool = True) -> FrameType:
+        """Join two dataframes with a `pl.Struct` `'address'` column on the addresses.
+
+        The join runs on the single `'address_id'` key, added where missing with `Address.with_address_id`. With
+        `check_collisions` an `AddressCollisionError` is raised if rows joined on the same id hold different
+        addresses. If one frame was read with the compact schema and the other was not, both addresses are cast to
+        `ADDRESS_SCHEMA` first.
+
+        Either frame can be a `pl.LazyFrame`, in which case a `pl.LazyFrame` is returned, so only the columns and rows
+        used downstream are read and joined. The collision check is then done batch by batch as the joined addresses
+        are produced, and polars surfaces the `AddressCollisionError` as a `pl.exceptions.ComputeError` when
+        collecting. Collect without `streaming=True`, as the polars 1.x streaming engine does not handle full joins
+        reliably.
+        """
+        is_lazy = isinstance(dataframe_1, pl.LazyFrame) or isinstance(dataframe_2, pl.LazyFrame)
+
         cls._check_address_column(dataframe_1)
         cls._check_address_column(dataframe_2)
 
+        # Compact and plain addresses cannot be compared, so join frames read with different schemas as plain strings.
+        if dataframe_1.collect_schema()["address"] != dataframe_2.collect_schema()["address"]:
+            dataframe_1 = dataframe_1.cast({"address": pl.Struct(ADDRESS_SCHEMA)})
+            dataframe_2 = dataframe_2.cast({"address": pl.Struct(ADDRESS_SCHEMA)})
+
         dataframe_joined = (
-            dataframe_1.select(cls.expand_address_column())
+            cls.with_address_id(dataframe_1, check_collisions=check_collisions)
+            .lazy()
             .join(
-                dataframe_2.select(cls.expand_address_column()),
-                on=cls.unnested_address_columns(),
-                how="outer",
+                cls.with_address_id(dataframe_2, check_collisions=check_collisions).lazy(),
+                on="address_id",
+                how="full",
+                coalesce=True,
                 suffix="_right",
                 join_nulls=True,
             )
-            .with_columns(cls.collapse_address_column())
-            .drop(*cls.unnested_address_columns(), *cls.unnested_address_columns(suffix="_right"))
         )
 
+        if not is_lazy:
+            dataframe_joined = dataframe_joined.collect()
+            if check_collisions and not (collisions := _find_address_collisions(dataframe_joined)).is_empty():
+                raise AddressCollisionError(
+                    f"Different addresses were joined on the same `'address_id'`:\n{collisions}"
+                )
+            return dataframe_joined.with_columns(pl.coalesce("address", "address_right")).drop("address_right")
+
+        joined_address = (
+            pl.struct("address", "address_right").map_batches(
+                _coalesce_checked_addresses,
+                return_dtype=dataframe_joined.collect_schema()["address"],
+                is_elementwise=True,
+            )
+            if check_collisions
+            else pl.coalesce("address", "address_right")
+        )
+        dataframe_joined = dataframe_joined.with_columns(joined_address.alias("address")).drop("address_right")
+
         return dataframe_joined
 
     @classmethod
-    def _check_address_column(_cls, df: pl.DataFrame) -> None:
+    def id_expr(cls, address: pl.Expr | None = None, /) -> pl.Expr:
+        """Return polars expression for the stable 64-bit id of an `'address'` struct column.
+
+        The id is the 64-bit FNV-1a hash of `Address.canonical_expr`, so it is the same across processes, runs
+        and polars versions, and can be stored.
+        """
+        return (
+            cls.canonical_expr(address)
+            .map_batches(_fnv1a_64, return_dtype=ADDRESS_ID_DTYPE, is_elementwise=True)
+            .alias("address_id")
+        )
+
+    @classmethod
+    def canonical_expr(cls, address: pl.Expr | None = None, /) -> pl.Expr:
+        """Return polars expression joining the normalised `ADDRESS_SCHEMA` fields of an address into one string.
+
+        Strings are stripped, upper cased and have runs of whitespace or underscores collapsed to a single space.
+        """
+        address = pl.col("address") if address is None else address
+
+        fields = []
+        for field, dtype in ADDRESS_SCHEMA.items():
+            value = address.struct.field(field).cast(pl.String)
+            if dtype == pl.String:
+                value = value.map_batches(_normalise_strings, return_dtype=pl.String, is_elementwise=True)
+            fields.append(value.fill_null(""))
+
+        return pl.concat_str(fields, separator="\x1f").alias("address_canonical")
+
+    @classmethod
+    def with_address_id(cls, dataframe: FrameType, /, *, check_collisions: bool = True) -> FrameType:
+        """Add an `'address_id'` column after the `'address'` column, unless the frame already has one.
+
+        With `check_collisions` an `AddressCollisionError` is raised if different addresses get the same id. This
+        check needs the whole frame, so it is skipped for a `pl.LazyFrame`.
+        """
+        if "address_id" in dataframe.collect_schema().names():
+            return dataframe
+
+        # The id is computed by python functions called once per chunk, so many small chunks are slow.
+        if isinstance(dataframe, pl.DataFrame):
+            dataframe = dataframe.rechunk()
+
+        dataframe_with_id = dataframe.with_columns(cls.canonical_expr()).with_columns(
+            pl.col("address_canonical")
+            .map_batches(_fnv1a_64, return_dtype=ADDRESS_ID_DTYPE, is_elementwise=True)
+            .alias("address_id")
+        )
+
+        if check_collisions and isinstance(dataframe_with_id, pl.DataFrame):
+            cls._check_address_ids(dataframe_with_id)
+
+        return dataframe_with_id.select(
+            "address", "address_id", pl.exclude("address", "address_id", "address_canonical")
+        )
+
+    @classmethod
+    def check_address_ids(cls, dataframe: pl.DataFrame, /) -> None:
+        """Raise an `AddressCollisionError` if different addresses in the frame share an `'address_id'`."""
+        cls._check_address_ids(dataframe.with_columns(cls.canonical_expr()))
+
+    @classmethod
+    def _check_address_ids(cls, dataframe: pl.DataFrame, /) -> None:
+        """Check for collisions using the `'address_canonical'` column, compared through its (fast) polars hash."""
+        colliding_ids = (
+            dataframe.group_by("address_id")
+            .agg(pl.col("address_canonical").hash().n_unique().alias("addresses"))
+            .filter(pl.col("addresses") > 1)
+            .get_column("address_id")
+        )
+
+        if not colliding_ids.is_empty():
+            collisions = (
+                dataframe.filter(pl.col("address_id").is_in(colliding_ids))
+                .select("address_id", "address")
+                .unique("address", maintain_order=True)
+            )
+            raise AddressCollisionError(f"Different addresses share an `'address_id'`:\n{collisions}")
+
+    @classmethod
+    def _check_address_column(_cls, df: pl.DataFrame | pl.LazyFrame) -> None:
         try:
-            is_address_struct = isinstance(df["address"].dtype, pl.Struct)
+            is_address_struct = isinstance(df.collect_schema()["address"], pl.Struct)
             if not is_address_struct:
-                raise pl.exceptions.ColumnNotFoundError()
-        except pl.exceptions.ColumnNotFoundError:
+                raise KeyError()
+        except KeyError:
             raise ValueError(f"Data found to not have a valid `'address'` column:\n{df}") from None
 
     @classmethod
     def expand_address_column(cls) -> pl.Expr:
-        """Return polars expression for expand_address_column."""
+        """Return polars expression for expand_address_column, usable on both eager and lazy frames."""
         return (pl.exclude("address"), pl.col("address").struct.unnest())
 
     @classmethod
@@ -150,11 +912,70 @@ class Address(BaseModel):
 
     @classmethod
     def collapse_address_column(cls) -> pl.Expr:
-        """Return polars expression for collapse_address_column."""
+        """Return polars expression for collapse_address_column, usable on both eager and lazy frames."""
         return pl.struct(cls.unnested_address_columns()).alias("address")
 
 
 ########## PRICE RECORDS ###############
+class RecordKeyIndex:
+    """On-disk index of the 64-bit keys of the rows already in a records file.
+
+    The file holds a header with the size of the records file when the index was last written and the number of
+    appends since the records file was last compacted, followed by the keys as little endian `uint64`. An index whose
+    recorded size does not match the records file is stale.
+    """
+
+    HEADER = struct.Struct("<8sQQ")
+    MAGIC = b"PRKEYS01"
+
+    def __init__(self, index_file: str, /):
+        """Refer to the index stored at `index_file`, which may not exist yet."""
+        self.index_file = index_file
+        self.file_system, self.path = fsspec.core.url_to_fs(index_file)
+
+    def read(self, *, data_size: int) -> tuple[np.ndarray, int] | None:
+        """Return the keys and the number of appends since compaction, or `None` if missing or stale."""
+        try:
+            with self.file_system.open(self.path, "rb") as open_file:
+                magic, indexed_size, appends = self.HEADER.unpack(open_file.read(self.HEADER.size))
+                keys = np.frombuffer(open_file.read(), dtype="<u8")
+        except (FileNotFoundError, struct.error):
+            return None
+
+        if magic != self.MAGIC or indexed_size != data_size:
+            return None
+        return keys, appends
+
+    def write(self, keys: np.ndarray, /, *, data_size: int, appends: int = 0) -> None:
+        """Replace the index with `keys`."""
+        with atomic_write(self.file_system.unstrip_protocol(self.path)) as open_file:
+            open_file.write(self.HEADER.pack(self.MAGIC, data_size, appends))
+            open_file.write(keys.astype("<u8").tobytes())
+
+    def indexed_size(self) -> int | None:
+        """Return the size of the records file when the index was last written, or `None` if there is no index."""
+        try:
+            with self.file_system.open(self.path, "rb") as open_file:
+                magic, indexed_size, _appends = self.HEADER.unpack(open_file.read(self.HEADER.size))
+        except (FileNotFoundError, struct.error):
+            return None
+
+        return indexed_size if magic == self.MAGIC else None
+
+    def append(self, keys: np.ndarray, /, *, data_size: int, appends: int) -> None:
+        """Add `keys` to the end of the index and update its header."""
+        with self.file_system.open(self.path, "r+b") as open_file:
+            open_file.seek(0, os.SEEK_END)
+            open_file.write(keys.astype("<u8").tobytes())
+            open_file.seek(0)
+            open_file.write(self.HEADER.pack(self.MAGIC, data_size, appends))
+
+    def remove(self) -> None:
+        """Delete the index, if there is one."""
+        with suppress(FileNotFoundError):
+            self.file_system.rm(self.path)
+
+
 class PriceRecord(BaseModel):
     """Model to organise price records."""
 
@@ -164,8 +985,12 @@ class PriceRecord(BaseModel):
     price: int | None
 
     @classmethod
-    def read(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> pl.DataFrame:
-        """Read historical records for a specific physical location."""
+    def read(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str, compact: bool = False) -> pl.DataFrame:
+        """Read historical records for a specific physical location.
+
+        With `compact` the repeated strings are stored as `pl.Enum` and `pl.Categorical`, see
+        `constants.COMPACT_PRICE_RECORDS_SCHEMA`.
+        """
         price_records_file = constants.PRICE_RECORDS_CSV_FILE.format(
             country=country,
             state=state,
@@ -175,20 +1000,90 @@ class PriceRecord(BaseModel):
 
         postcode = Postcode.find_postcode(suburb=suburb, country=country)
 
+        price_records_formatted = cls._format_records(
+            price_records_raw.with_columns(
+                pl.lit(suburb).alias("suburb"),
+                pl.lit(postcode).alias("postcode"),
+                pl.lit(state).alias("state"),
+                pl.lit(country).alias("country"),
+            ),
+            compact=compact,
+        )
+
+        return price_records_formatted
+
+    @classmethod
+    def read_many(
+        cls,
+        *,
+        country: ALLOWED_COUNTRIES,
+        suburbs: Iterable[tuple[str, str]],
+        max_workers: int | None = None,
+        compact: bool = False,
+    ) -> pl.DataFrame:
+        """Read the historical records of several `(state, suburb)` pairs into one frame.
+
+        Files are read concurrently on `max_workers` threads and the postcodes are found in one batch. Suburbs
+        without a records file are skipped and reported with a `MissingDataWarning`.
+        """
+        suburbs = list(dict.fromkeys(suburbs))
+
+        postcodes = Postcode.find_postcodes(
+            pl.Series([suburb for _, suburb in suburbs], dtype=pl.String), country=country
+        )
+        if unknown := [suburb for (_, suburb), postcode in zip(suburbs, postcodes, strict=True) if postcode is None]:
+            raise ValueError(f"Could not find suburbs: {unknown!r}")
+
+        price_records_files = [
+            constants.PRICE_RECORDS_CSV_FILE.format(country=country, state=state, suburb=suburb)
+            for state, suburb in suburbs
+        ]
+        price_records_raw = _read_files_concurrently(cls._read_csv, price_records_files, max_workers=max_workers)
+
+        price_records_found = [
+            raw.with_columns(
+                pl.lit(suburb).alias("suburb"),
+                pl.lit(postcode[0]).alias("postcode"),
+                pl.lit(state).alias("state"),
+                pl.lit(country).alias("country"),
+            )
+            for raw, (state, suburb), postcode in zip(price_records_raw, suburbs, postcodes, strict=True)
+            if raw is not None
+        ]
+        _warn_missing(suburbs, price_records_raw)
+
+        if not price_records_found:
+            price_records_found = [
+                pl.DataFrame(schema=PRICE_RECORDS_SCHEMA).with_columns(
+                    pl.lit(None, dtype=pl.String).alias("suburb"),
+                    pl.lit(None, dtype=POSTCODE_SCHEMA["postcode"]).alias("postcode"),
+                    pl.lit(None, dtype=pl.String).alias("state"),
+                    pl.lit(None, dtype=pl.String).alias("country"),
+                )
+            ]
+
+        return cls._format_records(pl.concat(price_records_found, how="vertical_relaxed"), compact=compact)
+
+    @classmethod
+    def _format_records(_cls, price_records_raw: pl.DataFrame, /, *, compact: bool = False) -> pl.DataFrame:
+        """Collect the address columns of raw records with their location into an `'address'` struct."""
         price_records_formatted = price_records_raw.select(
             pl.struct(
                 pl.col("unit_number").cast(ADDRESS_SCHEMA["unit_number"]),
                 pl.col("street_number").cast(ADDRESS_SCHEMA["street_number"]),
                 pl.col("street_name").cast(ADDRESS_SCHEMA["street_name"]),
-                pl.lit(suburb).alias("suburb").cast(ADDRESS_SCHEMA["suburb"]),
-                pl.lit(postcode).alias("postcode").cast(ADDRESS_SCHEMA["postcode"]),
-                pl.lit(state).alias("state").cast(ADDRESS_SCHEMA["state"]),
-                pl.lit(country).alias("country").cast(ADDRESS_SCHEMA["country"]),
+                pl.col("suburb").cast(ADDRESS_SCHEMA["suburb"]),
+                pl.col("postcode").cast(ADDRESS_SCHEMA["postcode"]),
+                pl.col("state").cast(ADDRESS_SCHEMA["state"]),
+                pl.col("country").cast(ADDRESS_SCHEMA["country"]),
             ).alias("address"),
             pl.col("date"),
             pl.col("record_type"),
             pl.col("price"),
-        )
+        ).pipe(Address.with_address_id)
+
+        if compact:
+            price_records_formatted = to_compact(price_records_formatted)
 
         return price_records_formatted
 
@@ -196,40 +1091,367 @@ class PriceRecord(BaseModel):
     def _read_csv(_cls, file: str, /) -> pl.DataFrame:
         """Read and validate contents of file containing several records."""
         price_records = pl.read_csv(
-            file,
+            _read_through(file),
             schema_overrides=PRICE_RECORDS_SCHEMA,
         )
 
-        (
-            price_records.with_columns(
-                pl.col("record_type").map_elements(
-                    lambda record_type: RecordType.parse(record_type, errors="null"), return_dtype=pl.String
-                )
-            )
-        )
+        price_records = price_records.with_columns(RecordType.parse_expr("record_type", errors="null"))
 
         return price_records
 
     @classmethod
     def write(cls, price_records: pl.DataFrame, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> None:
-        """Write records to a csv file."""
+        """Write records to a csv file, replacing it atomically under the suburb's `partition_lock`."""
         price_records_file = constants.PRICE_RECORDS_CSV_FILE.format(
             country=country,
             state=state,
             suburb=suburb,
         )
 
-        price_records_compressed = price_records.select(
+        price_records_compressed = cls._compress(price_records)
+
+        with partition_lock(price_records_file, create_directory=True):
+            with atomic_write(price_records_file) as open_file:
+                price_records_compressed.write_csv(open_file)
+
+            cls._key_index(price_records_file).remove()
+            cls._aggregates(price_records_file).remove()
+
+    @classmethod
+    def append(
+        cls,
+        new_records: pl.DataFrame,
+        *,
+        country: ALLOWED_COUNTRIES,
+        state: str,
+        suburb: str,
+        compact_every: int | None = None,
+    ) -> int:
+        """Append the records not already in a suburb's csv file, returning the number of rows written.
+
+        Records are deduplicated on `PriceRecord.key_expr`, against an index of the keys already written kept next to
+        the csv, so the csv itself is only read when that index is missing or stale. With `compact_every` the file is
+        compacted by `PriceRecord.compact` once that many appends have been made since it was last compacted.
+
+        The suburb's `partition_lock` is held throughout, so concurrent appends to one suburb are serialised. Rows are
+        appended in place and cut off again if writing them fails, and a partial row left by an append that was killed
+        is cut off by the next one.
+        """
+        price_records_file = constants.PRICE_RECORDS_CSV_FILE.format(country=country, state=state, suburb=suburb)
+
+        new_records_compressed = cls._compress(new_records).with_columns(RecordType.parse_expr(errors="raise"))
+
+        with partition_lock(price_records_file, create_directory=True):
+            return cls._append(price_records_file, new_records_compressed, compact_every=compact_every)
+
+    @classmethod
+    def _append(
+        cls, price_records_file: str, new_records_compressed: pl.DataFrame, /, *, compact_every: int | None
+    ) -> int:
+        """Append compressed records to a csv file, see `PriceRecord.append`, with its `partition_lock` held."""
+        file_system, path = fsspec.core.url_to_fs(price_records_file)
+        key_index = cls._key_index(price_records_file)
+        new_keys = new_records_compressed.select(cls.key_expr()).to_series().to_numpy()
+
+        if not file_system.exists(path):
+            is_new = pl.Series(new_keys).is_first_distinct().to_numpy()
+            with atomic_write(price_records_file) as open_file:
+                new_records_compressed.filter(is_new).write_csv(open_file)
+            key_index.write(new_keys[is_new], data_size=file_system.size(path))
+            cls._aggregates(price_records_file).update(new_records_compressed.filter(is_new))
+            return int(is_new.sum())
+
+        indexed_size = key_index.indexed_size()
+        if isinstance(file_system, LocalFileSystem) and indexed_size is not None:
+            cls._cut_partial_row(path, indexed_size)
+
+        if (index := key_index.read(data_size=file_system.size(path))) is None:
+            if indexed_size is not None:
+                # The csv was changed other than by appending, so its aggregates cannot be trusted either.
+                cls._aggregates(price_records_file).remove()
+            existing_keys = cls._read_csv(price_records_file).select(cls.key_expr()).to_series().to_numpy()
+            index = (existing_keys, 0)
+            key_index.write(existing_keys, data_size=file_system.size(path))
+        existing_keys, appends = index
+
+        is_new = ~np.isin(new_keys, existing_keys) & pl.Series(new_keys).is_first_distinct().to_numpy()
+        if is_new.any():
+            data_size = file_system.size(path)
+            try:
+                with file_system.open(path, "ab") as open_file:
+                    new_records_compressed.filter(is_new).write_csv(open_file, include_header=False)
+            except BaseException:
+                # A partial row would corrupt the csv, so cut the file back to its size before the append.
+                if isinstance(file_system, LocalFileSystem):
+                    with suppress(OSError):
+                        os.truncate(path, data_size)
+                raise
+            appends += 1
+            key_index.append(new_keys[is_new], data_size=file_system.size(path), appends=appends)
+            cls._aggregates(price_records_file).update(new_records_compressed.filter(is_new))
+
+        if compact_every is not None and appends >= compact_every:
+            cls._compact(price_records_file)
+
+        return int(is_new.sum())
+
+    @staticmethod
+    def _cut_partial_row(path: str, indexed_size: int, /, *, tail_bytes: int = 2**16) -> None:
+        """Cut off a partial last row written past `indexed_size` by an append that was killed part way through.
+
+        Only the bytes written since the key index was last updated are checked, so complete rows appended around the
+        index are kept.
+        """
+        data_size = os.path.getsize(path)
+        if data_size <= indexed_size:
+            return
+
+        tail_start = max(indexed_size, data_size - tail_bytes)
+        with open(path, "r+b") as open_file:
+            open_file.seek(tail_start)
+            tail = open_file.read()
+            if tail.endswith(b"\n"):
+                return
+            if (last_newline := tail.rfind(b"\n")) != -1:
+                open_file.truncate(tail_start + last_newline + 1)
+            elif tail_start == indexed_size:
+                open_file.truncate(indexed_size)
+
+    @classmethod
+    def compact(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> int:
+        """Rewrite a suburb's csv file without duplicate records and sorted by address and date.
+
+        Rebuilds the key index and returns the number of rows kept. The file is replaced atomically under the suburb's
+        `partition_lock`.
+        """
+        price_records_file = constants.PRICE_RECORDS_CSV_FILE.format(country=country, state=state, suburb=suburb)
+
+        with partition_lock(price_records_file):
+            return cls._compact(price_records_file)
+
+    @classmethod
+    def _compact(cls, price_records_file: str, /) -> int:
+        """Compact a csv file, see `PriceRecord.compact`, with its `partition_lock` held."""
+        file_system, path = fsspec.core.url_to_fs(price_records_file)
+
+        price_records_compacted = (
+            cls._read_csv(price_records_file)
+            .with_columns(cls.key_expr())
+            .filter(pl.col("record_key").is_first_distinct())
+            .sort("street_name", "street_number", "unit_number", "date", nulls_last=True, maintain_order=True)
+        )
+
+        with atomic_write(price_records_file) as open_file:
+            price_records_compacted.drop("record_key").write_csv(open_file)
+        cls._key_index(price_records_file).write(
+            price_records_compacted["record_key"].to_numpy(), data_size=file_system.size(path)
+        )
+        if (aggregates := cls._aggregates(price_records_file)).exists():
+            aggregates.write(aggregates.aggregate(price_records_compacted))
+
+        return price_records_compacted.height
+
+    @classmethod
+    def key_expr(cls) -> pl.Expr:
+        """Return polars expression for the stable 64-bit key of a record in the csv columns of `PRICE_RECORDS_SCHEMA`.
+
+        Records with the same address, date, record type and price share a key.
+        """
+        fields = [
+            pl.col("unit_number").cast(pl.String),
+            pl.col("street_number").cast(pl.String),
+            pl.col("street_name")
+            .cast(pl.String)
+            .map_batches(_normalise_strings, return_dtype=pl.String, is_elementwise=True),
+            pl.col("date").cast(pl.String),
+            pl.col("record_type").cast(pl.String),
+            pl.col("price").cast(pl.String),
+        ]
+        return (
+            pl.concat_str([field.fill_null("") for field in fields], separator="\x1f")
+            .map_batches(_fnv1a_64, return_dtype=ADDRESS_ID_DTYPE, is_elementwise=True)
+            .alias("record_key")
+        )
+
+    @classmethod
+    def _compress(_cls, price_records: pl.DataFrame, /) -> pl.DataFrame:
+        """Select the csv columns of records, dropping the parts of the address given by the file path.
+
+        Strings stored as `pl.Enum` or `pl.Categorical` by a compact read are cast back to `pl.String`.
+        """
+        return price_records.select(
             pl.col("address").struct["unit_number"],
             pl.col("address").struct["street_number"],
-            pl.col("address").struct["street_name"],
+            pl.col("address").struct["street_name"].cast(pl.String),
+            pl.col("date"),
+            pl.col("record_type").cast(pl.String),
+            pl.col("price"),
+        )
+
+    @classmethod
+    def _key_index(_cls, price_records_file: str, /) -> RecordKeyIndex:
+        return RecordKeyIndex(price_records_file.removesuffix(".csv") + PRICE_RECORDS_KEY_INDEX_SUFFIX)
+
+    @classmethod
+    def _aggregates(_cls, price_records_file: str, /) -> "PriceAggregates":
+        return PriceAggregates(price_records_file)
+
+    @classmethod
+    def read_aggregates(
+        cls, *, country: ALLOWED_COUNTRIES, suburbs: Iterable[tuple[str, str]], max_workers: int | None = None
+    ) -> pl.DataFrame:
+        """Read the monthly price aggregates of several `(state, suburb)` pairs into one frame.
+
+        Aggregates are built from the records of a suburb the first time they are read, and kept up to date by
+        `PriceRecord.append`. Suburbs without a records file are skipped and reported with a `MissingDataWarning`.
+        See `PriceAggregates`.
+        """
+        suburbs = list(dict.fromkeys(suburbs))
+
+        price_records_files = [
+            constants.PRICE_RECORDS_CSV_FILE.format(country=country, state=state, suburb=suburb)
+            for state, suburb in suburbs
+        ]
+        aggregates = _read_files_concurrently(
+            lambda price_records_file: cls._aggregates(price_records_file).read(),
+            price_records_files,
+            max_workers=max_workers,
+        )
+
+        aggregates_found = [
+            suburb_aggregates.select(pl.lit(state).alias("state"), pl.lit(suburb).alias("suburb"), pl.all())
+            for suburb_aggregates, (state, suburb) in zip(aggregates, suburbs, strict=True)
+            if suburb_aggregates is not None
+        ]
+        _warn_missing(suburbs, aggregates)
+
+        if not aggregates_found:
+            aggregates_found = [
+                pl.DataFrame(schema={"state": pl.String, "suburb": pl.String} | PRICE_AGGREGATES_SCHEMA)
+            ]
+
+        return pl.concat(aggregates_found)
+
+    @classmethod
+    def write_parquet(cls, price_records: pl.DataFrame, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> None:
+        """Write records to their `country=/state=/suburb=` partition of the Parquet store, sorted by address and date.
+
+        The `'address_id'` and postcode are stored alongside the records, so `PriceRecord.scan` does not recompute
+        them.
+        """
+        price_records_file = cls.parquet_file(country=country, state=state, suburb=suburb)
+
+        price_records_compressed = (
+            price_records.pipe(Address.with_address_id)
+            .select(
+                pl.col("address_id"),
+                pl.col("address").struct["unit_number"],
+                pl.col("address").struct["street_number"],
+                pl.col("address").struct["street_name"],
+                pl.col("address").struct["postcode"],
+                pl.col("date"),
+                pl.col("record_type").cast(pl.String),
+                pl.col("price"),
+            )
+            .sort("street_name", "street_number", "unit_number", "date", nulls_last=True)
+        )
+
+        file_system, path = fsspec.core.url_to_fs(price_records_file)
+        file_system.makedirs(os.path.dirname(path), exist_ok=True)
+        with partition_lock(price_records_file, create_directory=True), atomic_write(price_records_file) as open_file:
+            price_records_compressed.write_parquet(open_file, statistics=True)
+
+    @classmethod
+    def scan(cls, *, country: ALLOWED_COUNTRIES, state: str | None = None, suburb: str | None = None) -> pl.LazyFrame:
+        """Lazily scan the Parquet store of records for a country, optionally limited to a state and suburb.
+
+        Partitions are read with hive partitioning, so filtering on `state` and `suburb` here skips other partitions,
+        and filters on `'date'`, `'price'` or `'address_id'` downstream are pushed into the row group statistics.
+        """
+        price_records = pl.scan_parquet(
+            constants.PRICE_RECORDS_PARQUET_DIR + f"/country={quote(country, safe='')}/*/*/*.parquet",
+            hive_partitioning=True,
+            hive_schema={"country": pl.String, "state": pl.String, "suburb": pl.String},
+            try_parse_hive_dates=False,
+        )
+
+        if state is not None:
+            price_records = price_records.filter(pl.col("state") == state)
+        if suburb is not None:
+            price_records = price_records.filter(pl.col("suburb") == suburb)
+
+        price_records_formatted = price_records.select(
+            pl.struct(
+                pl.col("unit_number").cast(ADDRESS_SCHEMA["unit_number"]),
+                pl.col("street_number").cast(ADDRESS_SCHEMA["street_number"]),
+                pl.col("street_name").cast(ADDRESS_SCHEMA["street_name"]),
+                pl.col("suburb").cast(ADDRESS_SCHEMA["suburb"]),
+                pl.col("postcode").cast(ADDRESS_SCHEMA["postcode"]),
+                pl.col("state").cast(ADDRESS_SCHEMA["state"]),
+                pl.col("country").cast(ADDRESS_SCHEMA["country"]),
+            ).alias("address"),
+            pl.col("address_id"),
             pl.col("date"),
             pl.col("record_type"),
             pl.col("price"),
         )
 
-        with fsspec.open(price_records_file, "w") as open_file:
-            price_records_compressed.write_csv(open_file)
+        return price_records_formatted
+
+    @classmethod
+    def parquet_file(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> str:
+        """Return the path of a suburb's partition in the Parquet store, with the partition values url quoted."""
+        return (
+            constants.PRICE_RECORDS_PARQUET_DIR
+            + "/"
+            + constants.PRICE_RECORDS_PARQUET_PARTITION.format(
+                country=quote(country, safe=""), state=quote(state, safe=""), suburb=quote(suburb, safe="")
+            )
+        )
+
+    @classmethod
+    def write_store(cls, price_records: pl.DataFrame, /) -> None:
+        """Write records to the SQLite store at `constants.SQLITE_STORE_FILE`, see `store.SqliteStore`.
+
+        The stored records of every address in `price_records` are replaced by its records, in one transaction.
+        """
+        price_records_flat = price_records.pipe(Address.with_address_id).select(
+            "address_id", pl.col("address").struct.unnest(), "date", pl.col("record_type").cast(pl.String), "price"
+        )
+        _sqlite_store(constants.SQLITE_STORE_FILE).write(
+            "price_records", price_records_flat.pipe(_with_street_key), schema=PRICE_RECORDS_STORE_SCHEMA
+        )
+
+    @classmethod
+    def read_store(
+        cls,
+        *,
+        address_id: int | None = None,
+        postcode: int | None = None,
+        street_name: str | None = None,
+        street_number: int | None = None,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> pl.DataFrame:
+        """Look up the records of one address in the SQLite store, by `address_id` or street address, via its indexes.
+
+        The `street_name` is normalised as in `Address.canonical_expr`, so its case and spacing do not matter. Records
+        can be limited to dates in `[since, until)`. Returns the layout of `PriceRecord.scan`.
+        """
+        price_records_flat = _sqlite_store(constants.SQLITE_STORE_FILE).read(
+            "price_records",
+            schema=PRICE_RECORDS_STORE_SCHEMA,
+            address_id=address_id,
+            postcode=postcode,
+            street_key=_street_key(street_name),
+            street_number=street_number,
+            since=since,
+            until=until,
+        )
+
+        return price_records_flat.select(
+            Address.collapse_address_column(), "address_id", "date", "record_type", "price"
+        )
 
     @classmethod
     def to_records(cls, price_record_list: list["PriceRecord"], /) -> pl.DataFrame:
@@ -250,7 +1472,345 @@ class PriceRecord(BaseModel):
         return price_records_frame
 
 
+class PriceRecordBatchBuilder:
+    """Build a `PRICE_RECORDS_SCHEMA` frame one record at a time, without creating a `PriceRecord` per row.
+
+    Each column is buffered in a typed `array.array`, with a separate validity buffer for the nullable ones, and
+    `finish` hands the buffers to Arrow without copying the numeric columns.
+
+    e.g.
+    ```
+    builder = PriceRecordBatchBuilder()
+    builder.append(None, 80, "FIFTH STREET", date(2020, 1, 1), RecordType.AUCTION, 100000)
+    price_records = builder.finish()
+    ```
+    """
+
+    EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+    RECORD_TYPES = [record_type.value for record_type in RecordType]
+
+    def __init__(self):
+        """Create an empty builder."""
+        self._record_type_codes = {record_type: code for code, record_type in enumerate(self.RECORD_TYPES)}
+        self._reset()
+
+    def __len__(self) -> int:
+        """Return the number of records appended since the last `finish`."""
+        return len(self._dates)
+
+    def append(
+        self,
+        unit_number: int | None,
+        street_number: int | None,
+        street_name: str | None,
+        date: date,
+        record_type: RecordType | str,
+        price: int | None,
+    ) -> None:
+        """Append one record, raising an `OverflowError` for numbers out of range of `PRICE_RECORDS_SCHEMA`.
+
+        A record that fails to append leaves the builder unchanged.
+        """
+        if (record_type_code := self._record_type_codes.get(record_type)) is None:
+            record_type_code = self._record_type_codes[record_type] = self.RECORD_TYPES.index(
+                RecordType.parse(record_type).value
+            )
+
+        n_rows = len(self)
+        try:
+            self._unit_numbers.append(unit_number or 0)
+            self._street_numbers.append(street_number or 0)
+            self._prices.append(price or 0)
+            self._dates.append(date.toordinal() - self.EPOCH_ORDINAL)
+        except (OverflowError, TypeError, AttributeError):
+            for buffer in (self._unit_numbers, self._street_numbers, self._prices, self._dates):
+                del buffer[n_rows:]
+            raise
+
+        self._unit_numbers_valid.append(unit_number is not None)
+        self._street_numbers_valid.append(street_number is not None)
+        self._prices_valid.append(price is not None)
+        self._street_names.append(street_name)
+        self._record_types.append(record_type_code)
+
+    def finish(self) -> pl.DataFrame:
+        """Return the appended records as a `PRICE_RECORDS_SCHEMA` frame and empty the builder."""
+        table = pa.table(
+            {
+                "unit_number": self._to_arrow(pa.uint16(), self._unit_numbers, self._unit_numbers_valid),
+                "street_number": self._to_arrow(pa.uint16(), self._street_numbers, self._street_numbers_valid),
+                "street_name": pa.array(self._street_names, type=pa.large_string()),
+                "date": self._to_arrow(pa.date32(), self._dates),
+                "record_type": pa.DictionaryArray.from_arrays(
+                    self._to_arrow(pa.uint8(), self._record_types), pa.array(self.RECORD_TYPES)
+                ),
+                "price": self._to_arrow(pa.uint32(), self._prices, self._prices_valid),
+            }
+        )
+        self._reset()
+
+        price_records = pl.from_arrow(table).cast(PRICE_RECORDS_SCHEMA)
+
+        return price_records
+
+    def _reset(self) -> None:
+        self._unit_numbers = array.array("H")
+        self._unit_numbers_valid = bytearray()
+        self._street_numbers = array.array("H")
+        self._street_numbers_valid = bytearray()
+        self._street_names: list[str | None] = []
+        self._dates = array.array("i")
+        self._record_types = array.array("B")
+        self._prices = array.array("I")
+        self._prices_valid = bytearray()
+
+    @staticmethod
+    def _to_arrow(dtype: pa.DataType, values: array.array, valid: bytearray | None = None) -> pa.Array:
+        """Wrap a typed buffer as an Arrow array, packing the validity bytes into a bitmap if any value is null."""
+        validity = None
+        if valid is not None and not all(valid):
+            validity = pa.py_buffer(np.packbits(np.frombuffer(valid, dtype=np.bool_), bitorder="little"))
+        return pa.Array.from_buffers(dtype, len(values), [validity, pa.py_buffer(values)])
+
+
+class PriceAggregates:
+    """Monthly price aggregates of a suburb's records, stored next to its csv file.
+
+    Each row summarises the records of one month and `RecordType` with the number of records (`'volume'`), the mean
+    and median price, and the sorted prices themselves, so that merging in new records (`PriceAggregates.update`) and
+    summarising several months (`PriceAggregates.rolling`) stay exact without reading the records again. See
+    `constants.PRICE_AGGREGATES_SCHEMA`.
+    """
+
+    KEYS = ["month", "record_type"]
+
+    def __init__(self, price_records_file: str, /):
+        """Refer to the aggregates of the records in `price_records_file`, which may not exist yet."""
+        self.price_records_file = price_records_file
+        self.file_system, self.path = fsspec.core.url_to_fs(
+            price_records_file.removesuffix(".csv") + PRICE_AGGREGATES_SUFFIX
+        )
+
+    def exists(self) -> bool:
+        """Return whether the aggregates have been written."""
+        return self.file_system.exists(self.path)
+
+    def read(self) -> pl.DataFrame:
+        """Read the aggregates, building them from the records the first time under the records' `partition_lock`.
+
+        Raises `FileNotFoundError` without taking the lock if there are no records.
+        """
+        with suppress(FileNotFoundError):
+            return self._read_file()
+
+        file_system, path = fsspec.core.url_to_fs(self.price_records_file)
+        if not file_system.exists(path):
+            raise FileNotFoundError(self.price_records_file)
+
+        with partition_lock(self.price_records_file):
+            # Another writer may have built them while this one waited for the lock.
+            with suppress(FileNotFoundError):
+                return self._read_file()
+            return self._build()
+
+    def build(self) -> pl.DataFrame:
+        """Aggregate all the records, replacing any stored aggregates, under the records' `partition_lock`."""
+        with partition_lock(self.price_records_file):
+            return self._build()
+
+    def _read_file(self) -> pl.DataFrame:
+        with self.file_system.open(self.path, "rb") as open_file:
+            return pl.read_parquet(open_file)
+
+    def _build(self) -> pl.DataFrame:
+        aggregates = self.aggregate(PriceRecord._read_csv(self.price_records_file))
+        self.write(aggregates)
+        return aggregates
+
+    def write(self, aggregates: pl.DataFrame, /) -> None:
+        """Replace the stored aggregates."""
+        with atomic_write(self.file_system.unstrip_protocol(self.path)) as open_file:
+            aggregates.write_parquet(open_file)
+
+    def update(self, new_records: pl.DataFrame, /) -> None:
+        """Merge records just added to the csv file into the stored aggregates, if there are any.
+
+        Only the months and record types of `new_records` are recomputed. Called with the records' `partition_lock`
+        held, as by `PriceRecord.append`.
+        """
+        if not self.exists():
+            return
+        self.write(self.merge(self._read_file(), self.aggregate(new_records)))
+
+    def remove(self) -> None:
+        """Delete the aggregates, if there are any."""
+        with suppress(FileNotFoundError):
+            self.file_system.rm(self.path)
+
+    @classmethod
+    def aggregate(cls, price_records: pl.DataFrame, /) -> pl.DataFrame:
+        """Aggregate records with a `'date'`, `'record_type'` and `'price'` column by month and record type."""
+        aggregates = (
+            price_records.group_by(pl.col("date").dt.truncate("1mo").alias("month"), pl.col("record_type"))
+            .agg(
+                pl.len().alias("volume"),
+                pl.col("price").cast(PRICE_AGGREGATES_SCHEMA["price_sum"]).sum().alias("price_sum"),
+                pl.col("price").drop_nulls().sort().alias("prices"),
+            )
+            .pipe(cls._summarise)
+            .sort(cls.KEYS, nulls_last=True)
+        )
+
+        return aggregates
+
+    @classmethod
+    def merge(cls, aggregates: pl.DataFrame, more_aggregates: pl.DataFrame, /) -> pl.DataFrame:
+        """Combine the aggregates of two disjoint sets of records, recomputing only the groups found in both."""
+        touched = more_aggregates.select(cls.KEYS)
+
+        merged = (
+            pl.concat([aggregates.join(touched, on=cls.KEYS, how="semi", join_nulls=True), more_aggregates])
+            .group_by(cls.KEYS)
+            .agg(pl.col("volume").sum(), pl.col("price_sum").sum(), pl.col("prices").flatten().drop_nulls().sort())
+            .pipe(cls._summarise)
+        )
+
+        return pl.concat([aggregates.join(touched, on=cls.KEYS, how="anti", join_nulls=True), merged]).sort(
+            cls.KEYS, nulls_last=True
+        )
+
+    @classmethod
+    def rolling(cls, aggregates: pl.DataFrame, /, *, months: int) -> pl.DataFrame:
+        """Summarise each month with the `months` months up to and including it, e.g. 3, 6 or 12.
+
+        Groups by record type, and by any `'state'` and `'suburb'` columns as given by `PriceRecord.read_aggregates`.
+        Months without records have no row, the returned frame has the columns of `PRICE_AGGREGATES_SCHEMA` without
+        `'prices'`.
+        """
+        group_by = [column for column in ("state", "suburb") if column in aggregates.columns] + ["record_type"]
+
+        rolled = (
+            aggregates.sort(*group_by, "month")
+            .rolling("month", period=f"{months}mo", group_by=group_by)
+            .agg(pl.col("volume").sum(), pl.col("price_sum").sum(), pl.col("prices").flatten().drop_nulls())
+            .pipe(cls._summarise)
+            .sort(*group_by, "month", nulls_last=True)
+        )
+
+        return rolled.drop("prices")
+
+    @staticmethod
+    def _summarise(aggregates: pl.DataFrame, /) -> pl.DataFrame:
+        """Compute the price statistics from `'volume'`, `'price_sum'` and `'prices'`, in schema order."""
+        columns = [column for column in aggregates.columns if column not in PRICE_AGGREGATES_SCHEMA]
+        price_count = pl.col("prices").list.len()
+
+        return aggregates.select(
+            *columns,
+            pl.col("month"),
+            pl.col("record_type"),
+            pl.col("volume"),
+            price_count.alias("price_count"),
+            pl.col("price_sum"),
+            pl.when(price_count > 0).then(pl.col("price_sum") / price_count).alias("mean_price"),
+            pl.col("prices").list.median().alias("median_price"),
+            pl.col("prices"),
+        ).cast(PRICE_AGGREGATES_SCHEMA)
+
+
 ##### PROPERTY INFO ################
+class RowView:
+    """Read-only attribute access to one row of a frame, without a dict or model per row.
+
+    Views of the same frame share its Arrow columns and each holds only its row number, so a value is read from its
+    column when the attribute is accessed. Struct columns named in `NESTED` are returned as views of their own.
+    """
+
+    __slots__ = ("_columns", "_row")
+
+    NESTED: ClassVar[dict[str, type["RowView"]]] = {}
+
+    def __init__(self, columns: dict[str, pa.Array | tuple[pa.BooleanArray, dict]], row: int, /):
+        """Create a view of `row` of the columns prepared by `RowView.iter_rows`."""
+        self._columns = columns
+        self._row = row
+
+    @classmethod
+    def iter_rows(cls, dataframe: pl.DataFrame, /) -> Iterator[Self]:
+        """Return a view of each row of `dataframe` in order."""
+        columns = cls._prepare_columns(dict(zip(dataframe.columns, dataframe.to_arrow().columns, strict=True)))
+        return (cls(columns, row) for row in range(dataframe.height))
+
+    @classmethod
+    def _prepare_columns(
+        cls, columns: dict[str, pa.ChunkedArray | pa.Array], /
+    ) -> dict[str, pa.Array | tuple[pa.BooleanArray, dict]]:
+        """Combine the chunks of each column, splitting nested struct columns into their validity and fields."""
+        prepared = {}
+        for name, column in columns.items():
+            combined = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+            if (nested_view := cls.NESTED.get(name)) is not None:
+                fields = {field.name: combined.field(field_index) for field_index, field in enumerate(combined.type)}
+                prepared[name] = (combined.is_valid(), nested_view._prepare_columns(fields))
+            else:
+                prepared[name] = combined
+
+        return prepared
+
+    def __getattr__(self, name: str):
+        """Return the value of column `name` in this row."""
+        # Private names are never columns, and looking them up before `__init__` has run, as `copy` does, would recurse.
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        try:
+            column = self._columns[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} has no column {name!r}") from None
+
+        if isinstance(column, tuple):
+            validity, fields = column
+            return self.NESTED[name](fields, self._row) if validity[self._row].as_py() else None
+
+        return column[self._row].as_py()
+
+    def __dir__(self) -> list[str]:
+        """List the columns of the view along with its methods."""
+        return [*super().__dir__(), *self._columns]
+
+    def __repr__(self) -> str:
+        """Show the row as its values."""
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._columns)
+        return f"{type(self).__name__}({values})"
+
+    def as_dict(self) -> dict:
+        """Return the row as a dict, with nested views as dicts."""
+        return {
+            name: value.as_dict() if isinstance(value := getattr(self, name), RowView) else value
+            for name in self._columns
+        }
+
+
+class AddressView(RowView):
+    """View of one address in the layout of `ADDRESS_SCHEMA`, see `RowView`."""
+
+    __slots__ = ()
+
+
+class PropertyInfoView(RowView):
+    """View of one property in the layout of `PROPERTIES_INFO_SCHEMA`, see `PropertyInfo.iter_views`."""
+
+    __slots__ = ()
+
+    NESTED: ClassVar[dict[str, type[RowView]]] = {"address": AddressView}
+
+    def to_model(self) -> "PropertyInfo":
+        """Build and validate the `PropertyInfo` of this row."""
+        return PropertyInfo.from_stringified_dict(
+            {name: value for name, value in self.as_dict().items() if name != "address_id"}
+        )
+
+
 class PropertyInfo(BaseModel):
     """Model to hold the general information about a property."""
 
@@ -272,32 +1832,291 @@ class PropertyInfo(BaseModel):
     model_config = ConfigDict({"arbitrary_types_allowed": True})
 
     @classmethod
-    def read(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> pl.DataFrame:
-        """Read historical records for a specific physical location."""
-        properties_info_file = constants.PROPERTIES_INFO_JSON_FILE.format(
-            country=country,
-            state=state,
-            suburb=suburb,
-        )
-        properties_info = cls.read_json(properties_info_file)
+    def read(
+        cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str, compact: bool = False, ndjson: bool = False
+    ) -> pl.DataFrame:
+        """Read historical records for a specific physical location.
+
+        With `compact` the repeated address strings are stored as `pl.Enum` and `pl.Categorical`, see
+        `constants.COMPACT_PROPERTIES_INFO_SCHEMA`. With `ndjson` the `properties.ndjson` file is read instead of
+        `properties.json`, see `PropertyInfo.read_ndjson`.
+        """
+        properties_info_file = cls.file(country=country, state=state, suburb=suburb, ndjson=ndjson)
+        read_file = cls.read_ndjson if ndjson else cls.read_json
+        properties_info = read_file(properties_info_file).pipe(Address.with_address_id)
+
+        if compact:
+            properties_info = to_compact(properties_info)
+
         return properties_info
 
     @classmethod
-    def read_json(_cls, properties_info_file: str, /, full_validation: bool = True) -> pl.DataFrame:
-        """Read and validate contents of file containing several records."""
-        """Read local `.json` file containing properties info into a dataframe."""
+    def read_many(
+        cls,
+        *,
+        country: ALLOWED_COUNTRIES,
+        suburbs: Iterable[tuple[str, str]],
+        max_workers: int | None = None,
+        compact: bool = False,
+        ndjson: bool = False,
+    ) -> pl.DataFrame:
+        """Read the property information of several `(state, suburb)` pairs into one frame.
+
+        Files are read concurrently on `max_workers` threads. Suburbs without a properties file are skipped and
+        reported with a `MissingDataWarning`. With `ndjson` the `properties.ndjson` files are read.
+        """
+        suburbs = list(dict.fromkeys(suburbs))
 
-        properties_info_raw = pl.read_json(
-            properties_info_file, schema=PROPERTIES_INFO_SCHEMA | {"construction_date": pl.String}
+        properties_info_files = [
+            cls.file(country=country, state=state, suburb=suburb, ndjson=ndjson) for state, suburb in suburbs
+        ]
+        properties_info_raw = _read_files_concurrently(
+            cls.read_ndjson if ndjson else cls.read_json, properties_info_files, max_workers=max_workers
         )
+        _warn_missing(suburbs, properties_info_raw)
+
+        properties_info_found = [raw for raw in properties_info_raw if raw is not None] or [
+            pl.DataFrame(schema=PROPERTIES_INFO_SCHEMA)
+        ]
+        properties_info = pl.concat(properties_info_found).pipe(Address.with_address_id)
+
+        if compact:
+            properties_info = to_compact(properties_info)
+
+        return properties_info
+
+    @classmethod
+    def read_json(
+        cls, properties_info_file: str, /, full_validation: bool = True, pydantic_fallback: bool = False
+    ) -> pl.DataFrame:
+        """Read local `.json` file containing properties info into a dataframe.
+
+        With `full_validation` the rows are checked against the rules of `PropertyInfo` by
+        `PropertyInfo.validation_errors`, raising a `PropertyInfoValidationError` holding the report if any fail. With
+        `pydantic_fallback` the failing rows are instead built as `PropertyInfo` models one by one, so the error raised
+        is the one pydantic gives for the first bad row.
+
+        Files that pass are recorded in the validation ledger, see `PropertyInfo.ledger`, and are not validated again
+        until their contents change.
+        """
+        file_system, path = fsspec.core.url_to_fs(_read_through(properties_info_file))
+        with file_system.open(path, "rb") as open_file:
+            contents = open_file.read()
+
+        properties_info_raw = pl.read_json(contents, schema=PROPERTIES_INFO_RAW_SCHEMA)
+
+        if full_validation:
+            cls._validate_file(
+                properties_info_raw,
+                properties_info_file,
+                fingerprint=cls._fingerprint(file_system, path, hashlib.blake2b(contents, digest_size=16).hexdigest()),
+                pydantic_fallback=pydantic_fallback,
+            )
+
         properties_info = properties_info_raw.with_columns(pl.col("construction_date").str.to_date())
 
+        return properties_info
+
+    @classmethod
+    def read_ndjson(
+        cls,
+        properties_info_file: str,
+        /,
+        full_validation: bool = True,
+        pydantic_fallback: bool = False,
+        batch_bytes: int = 16 * 2**20,
+    ) -> pl.DataFrame:
+        """Read a `.ndjson` file with one property per line into a dataframe, validated as by `PropertyInfo.read_json`.
+
+        The file is parsed and hashed for the validation ledger `batch_bytes` of lines at a time, each batch cast to
+        the compact dtypes of `PROPERTIES_INFO_RAW_SCHEMA` as it is parsed, so memory peaks at the returned frame plus
+        one batch. The whole file is still returned, to read only part of a large file use `PropertyInfo.scan_ndjson`.
+        """
+        file_system, path = fsspec.core.url_to_fs(_read_through(properties_info_file))
+        contents_hash = hashlib.blake2b(digest_size=16)
+
+        batches = []
+        with file_system.open(path, "rb") as open_file:
+            for lines in iter(partial(open_file.readlines, batch_bytes), []):
+                batch = b"".join(lines)
+                contents_hash.update(batch)
+                batches.append(pl.read_ndjson(batch, schema=NDJSON_READ_SCHEMA).cast(PROPERTIES_INFO_RAW_SCHEMA))
+                del batch, lines
+
+        properties_info_raw = pl.concat(batches or [pl.DataFrame(schema=PROPERTIES_INFO_RAW_SCHEMA)], rechunk=False)
+
         if full_validation:
-            for item in tqdm(pl.concat([properties_info_raw]).to_dicts(), desc="Validating properties"):
-                PropertyInfo.from_stringified_dict(item)
+            cls._validate_file(
+                properties_info_raw,
+                properties_info_file,
+                fingerprint=cls._fingerprint(file_system, path, contents_hash.hexdigest()),
+                pydantic_fallback=pydantic_fallback,
+            )
+
+        properties_info = properties_info_raw.with_columns(pl.col("construction_date").str.to_date())
 
         return properties_info
 
+    @classmethod
+    def scan_ndjson(cls, properties_info_file: str, /) -> pl.LazyFrame:
+        """Lazily scan a local or object store `.ndjson` file with one property per line, without validating it.
+
+        Filters and projections are pushed into `pl.scan_ndjson`, so only the rows and columns asked for are kept.
+        """
+        return (
+            pl.scan_ndjson(properties_info_file, schema=NDJSON_READ_SCHEMA)
+            .cast(PROPERTIES_INFO_RAW_SCHEMA)
+            .with_columns(pl.col("construction_date").str.to_date())
+        )
+
+    @classmethod
+    def _validate_file(
+        cls,
+        properties_info_raw: pl.DataFrame,
+        properties_info_file: str,
+        /,
+        *,
+        fingerprint: str,
+        pydantic_fallback: bool,
+    ) -> None:
+        """Validate the raw contents of a file unless the ledger has them, recording them once they pass."""
+        if cls.ledger().is_validated(fingerprint):
+            return
+
+        if not (errors := cls.validation_errors(properties_info_raw)).is_empty():
+            if not pydantic_fallback:
+                raise PropertyInfoValidationError(
+                    f"{errors['row'].n_unique()} properties in {properties_info_file!r} are invalid:\n{errors}",
+                    errors=errors,
+                )
+            for item in properties_info_raw[errors["row"].unique().sort()].to_dicts():
+                PropertyInfo.from_stringified_dict(item)
+
+        cls.ledger().record(fingerprint)
+
+    @classmethod
+    def ledger(cls) -> ValidationLedger:
+        """Return the ledger of validated files for `constants.VALIDATION_LEDGER_FILE`, its counters are in `.stats`."""
+        return cls._read_ledger(constants.VALIDATION_LEDGER_FILE)
+
+    @lru_cache
+    @staticmethod
+    def _read_ledger(ledger_file: str | None, /) -> ValidationLedger:
+        """Create the validation ledger for one ledger file."""
+        return ValidationLedger(ledger_file, validator_version=PropertyInfo.validator_version())
+
+    @lru_cache
+    @staticmethod
+    def validator_version() -> str:
+        """Return the version keying `PropertyInfo.ledger`, changing whenever the validation rules change.
+
+        Combines `PROPERTY_INFO_VALIDATOR_VERSION` with a hash of the source of `PropertyInfo.validation_errors`, of
+        `PROPERTIES_INFO_RAW_SCHEMA`, of the model fields and of the allowed values, so files validated under old rules
+        are validated again.
+        """
+        validator_source = hashlib.blake2b(digest_size=8)
+        with suppress(OSError, TypeError):
+            validator_source.update(inspect.getsource(PropertyInfo.validation_errors).encode())
+        for rules in (
+            PROPERTIES_INFO_RAW_SCHEMA,
+            PropertyInfo.model_fields,
+            get_args(ALLOWED_COUNTRIES),
+            [condition.value for condition in PropertyCondition],
+            PropertyType.code_table()["label"].to_list(),
+        ):
+            validator_source.update(repr(rules).encode())
+
+        return f"{PROPERTY_INFO_VALIDATOR_VERSION}+{validator_source.hexdigest()}"
+
+    @staticmethod
+    def _fingerprint(file_system: fsspec.AbstractFileSystem, path: str, contents_digest: str, /) -> str:
+        """Identify a version of a file by the digest of its contents, or for remote files its path, mtime and size."""
+        if not isinstance(file_system, LocalFileSystem):
+            file_info = file_system.info(path)
+            modified = file_info.get("ETag", file_info.get("mtime", file_info.get("LastModified")))
+            if modified is not None:
+                return f"{file_system.unstrip_protocol(path)}@{modified}:{file_info['size']}"
+
+        return "blake2b:" + contents_digest
+
+    @classmethod
+    def validation_errors(cls, properties_info_raw: pl.DataFrame, /) -> pl.DataFrame:
+        """Check every row of raw property information against the rules of `PropertyInfo` in one pass.
+
+        Takes the columns of `PROPERTIES_INFO_RAW_SCHEMA`, with `'construction_date'` still as a string, and returns a
+        report with the position of each failing `'row'`, the `'field'` at fault and the `'error'`, one row per broken
+        rule.
+        """
+        address = pl.col("address")
+        parent = pl.col("property_type").list.get(0, null_on_oob=True)
+        sub_type = pl.col("property_type").list.get(1, null_on_oob=True).fill_null("None")
+        pair_length = 2
+        property_types = PropertyType.code_table()["label"]
+
+        rules = [
+            ("address", "address is missing", address.is_null()),
+            *[
+                (f"address.{field}", f"{field} is missing", address.is_not_null() & address.struct[field].is_null())
+                for field in ("street_number", "street_name", "suburb", "postcode", "state")
+            ],
+            (
+                "address.country",
+                f"country must be one of {get_args(ALLOWED_COUNTRIES)!r}",
+                address.is_not_null()
+                & ~address.struct["country"].is_in(get_args(ALLOWED_COUNTRIES)).fill_null(value=False),
+            ),
+            (
+                "condition",
+                "condition is not a `PropertyCondition`",
+                ~pl.col("condition").is_in([condition.value for condition in PropertyCondition]),
+            ),
+            (
+                "property_type",
+                "property_type must be a [type, sub type] pair",
+                pl.col("property_type").is_null() | (pl.col("property_type").list.len() < pair_length),
+            ),
+            (
+                "property_type",
+                "property_type is not a known `PropertyType`",
+                (pl.col("property_type").list.len() >= pair_length)
+                & ~pl.concat_str(parent, pl.lit("/"), sub_type).is_in(property_types).fill_null(value=False),
+            ),
+            (
+                "construction_date",
+                "construction_date is not a date",
+                pl.col("construction_date").is_not_null()
+                & pl.col("construction_date").str.to_date(strict=False).is_null(),
+            ),
+        ]
+
+        failures = (
+            properties_info_raw.select(
+                failing.fill_null(value=False).alias(str(rule)) for rule, (_, _, failing) in enumerate(rules)
+            )
+            .with_row_index("row")
+            .unpivot(index="row", variable_name="rule")
+            .filter(pl.col("value"))
+            .with_columns(pl.col("rule").cast(pl.UInt32))
+        )
+        rule_errors = pl.DataFrame(
+            {"field": [field for field, _, _ in rules], "error": [error for _, error, _ in rules]}
+        ).with_row_index("rule")
+
+        return failures.join(rule_errors, on="rule").sort("row", "rule").select("row", "field", "error")
+
+    @classmethod
+    def iter_views(cls, properties_info: pl.DataFrame, /) -> Iterator[PropertyInfoView]:
+        """Iterate over the properties as `PropertyInfoView`s, reading each value only when its attribute is accessed.
+
+        e.g.
+        ```
+        for view in PropertyInfo.iter_views(PropertyInfo.read(**location)):
+            print(view.beds, view.address.street_name)
+        ```
+        Values are as stored in the frame, use `PropertyInfoView.to_model` for a validated `PropertyInfo`.
+        """
+        return PropertyInfoView.iter_rows(properties_info)
+
     @classmethod
     def from_stringified_dict(cls, stringified_dict: dict, /) -> "PropertyInfo":
         """Takes a dictionary of stringified parameters and returns a created object.
@@ -342,13 +2161,72 @@ class PropertyInfo(BaseModel):
         return property_info_reloaded
 
     @classmethod
-    def write(cls, properties_info: pl.DataFrame, *, country: ALLOWED_COUNTRIES, state: str, suburb: str) -> None:
-        """Write historical records to a json file."""
-        properties_info_file = constants.PROPERTIES_INFO_JSON_FILE.format(
-            country=country,
-            state=state,
-            suburb=suburb,
+    def write_store(cls, properties_info: pl.DataFrame, /) -> None:
+        """Write property information to the SQLite store at `constants.SQLITE_STORE_FILE`, see `store.SqliteStore`.
+
+        The stored information of every address in `properties_info` is replaced, in one transaction.
+        """
+        properties_info_flat = properties_info.pipe(Address.with_address_id).select(
+            "address_id", pl.col("address").struct.unnest(), pl.exclude("address", "address_id")
+        )
+        _sqlite_store(constants.SQLITE_STORE_FILE).write(
+            "properties_info",
+            properties_info_flat.pipe(_with_street_key).with_columns(PropertyType.encode_expr()),
+            schema=PROPERTIES_INFO_STORE_SCHEMA,
+        )
+
+    @classmethod
+    def read_store(
+        cls,
+        *,
+        address_id: int | None = None,
+        postcode: int | None = None,
+        street_name: str | None = None,
+        street_number: int | None = None,
+    ) -> pl.DataFrame:
+        """Look up one address in the SQLite store, by `address_id` or street address, through its indexes.
+
+        The `street_name` is normalised as in `Address.canonical_expr`. Returns the layout of `PropertyInfo.read`.
+        """
+        properties_info_flat = _sqlite_store(constants.SQLITE_STORE_FILE).read(
+            "properties_info",
+            schema=PROPERTIES_INFO_STORE_SCHEMA,
+            address_id=address_id,
+            postcode=postcode,
+            street_key=_street_key(street_name),
+            street_number=street_number,
         )
 
-        with fsspec.open(properties_info_file, "w") as open_file:
-            json.dump(properties_info.rows(named=True), open_file, indent=4, default=str)
+        return properties_info_flat.select(
+            Address.collapse_address_column(),
+            "address_id",
+            pl.exclude("address_id", "street_key", *ADDRESS_SCHEMA),
+        ).with_columns(PropertyType.decode_expr())
+
+    @classmethod
+    def file(cls, *, country: ALLOWED_COUNTRIES, state: str, suburb: str, ndjson: bool = False) -> str:
+        """Return the path of the `properties.json`, or with `ndjson` the `properties.ndjson`, file of a suburb."""
+        file_template = constants.PROPERTIES_INFO_NDJSON_FILE if ndjson else constants.PROPERTIES_INFO_JSON_FILE
+        return file_template.format(country=country, state=state, suburb=suburb)
+
+    @classmethod
+    def write(
+        cls, properties_info: pl.DataFrame, *, country: ALLOWED_COUNTRIES, state: str, suburb: str, ndjson: bool = False
+    ) -> None:
+        """Write historical records to a json file.
+
+        With `ndjson` polars writes them to `properties.ndjson` directly, one property per line, without building a
+        dict per row. The file is replaced atomically under the suburb's `partition_lock`.
+        """
+        properties_info_file = cls.file(country=country, state=state, suburb=suburb, ndjson=ndjson)
+
+        with partition_lock(properties_info_file, create_directory=True):
+            if ndjson:
+                with atomic_write(properties_info_file) as open_file:
+                    properties_info.drop("address_id", strict=False).write_ndjson(open_file)
+                return
+
+            with atomic_write(properties_info_file, "w") as open_file:
+                json.dump(
+                    properties_info.drop("address_id", strict=False).rows(named=True), open_file, indent=4, default=str
+                )
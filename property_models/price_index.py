@@ -0,0 +1,158 @@
+"""Repeat-sales price indices built from price records, see `repeat_sales_index`."""
+
+from collections.abc import Sequence
+
+import numpy as np
+import polars as pl
+
+from property_models.constants import RecordType
+from property_models.models import FrameType
+
+SALE_RECORD_TYPES: list[str] = [RecordType.AUCTION.value, RecordType.PRIVATE_SALE.value]
+INDEX_BASE = 100.0
+
+
+def sale_pairs(price_records: FrameType, /, *, record_types: Sequence[str] = SALE_RECORD_TYPES) -> FrameType:
+    """Pair each sale with the previous sale of the same address.
+
+    Takes records as given by `PriceRecord.read`, `PriceRecord.read_many` or `PriceRecord.scan`, keeping only priced
+    records of `record_types`. Returns one row per pair with the `'state'` and `'suburb'` of the address, its
+    `'address_id'`, and the `'first_date'`, `'first_price'`, `'second_date'` and `'second_price'` of the two sales.
+    Sales on the same day as the previous one are dropped.
+    """
+    sales = (
+        price_records.filter(
+            pl.col("record_type").cast(pl.String).is_in(record_types) & (pl.col("price") > 0),
+        )
+        .select(
+            pl.col("address").struct["state"].cast(pl.String),
+            pl.col("address").struct["suburb"].cast(pl.String),
+            pl.col("address_id"),
+            pl.col("date").alias("second_date"),
+            pl.col("price").alias("second_price"),
+        )
+        .sort("address_id", "second_date")
+    )
+
+    pairs = sales.with_columns(
+        pl.col("second_date").shift().over("address_id").alias("first_date"),
+        pl.col("second_price").shift().over("address_id").alias("first_price"),
+    ).filter(pl.col("first_date") < pl.col("second_date"))
+
+    return pairs.select("state", "suburb", "address_id", "first_date", "first_price", "second_date", "second_price")
+
+
+def repeat_sales_index(
+    pairs: pl.DataFrame | pl.LazyFrame,
+    /,
+    *,
+    by: Sequence[str] = ("state", "suburb"),
+    frequency: str = "1q",
+    chunk_size: int = 1_000_000,
+) -> pl.DataFrame:
+    """Estimate a repeat-sales price index for each group of `by` columns from the sale pairs of `sale_pairs`.
+
+    Each pair is a row of the time-dummy design, -1 in the period of the first sale and +1 in the period of the second,
+    regressed on the log of the price ratio by ordinary least squares. The design is never built: pairs are counted
+    per group and pair of periods, `chunk_size` rows at a time for a `pl.DataFrame` or in streaming mode for a
+    `pl.LazyFrame`, which gives the normal equations directly, and these are solved once per group.
+
+    Parameters
+    ----------
+    pairs : pl.DataFrame | pl.LazyFrame, sale pairs as given by `sale_pairs`.
+    by : Sequence[str], optional, columns to build a separate index for, by default ("state", "suburb"). Use `()` for
+        one index over all pairs.
+    frequency : str, optional, length of each period as a polars duration, by default "1q".
+    chunk_size : int, optional, number of pairs counted at once from a `pl.DataFrame`, by default 1_000_000.
+
+    Returns
+    -------
+    pl.DataFrame, the `by` columns, the start of each `'period'`, its `'log_index'`, `'index'` relative to 100 in the
+    first period of the group, and the number of `'pairs'` with a sale in the period. Periods without sales are left
+    out, and periods not linked to the first one through pairs get an arbitrary level.
+    """
+    by = list(by)
+
+    if isinstance(pairs, pl.LazyFrame):
+        period_pairs = _count_period_pairs(pairs, by=by, frequency=frequency).collect(streaming=True)
+    else:
+        period_pairs = pl.concat(
+            [
+                _count_period_pairs(chunk.lazy(), by=by, frequency=frequency).collect()
+                for chunk in pairs.iter_slices(chunk_size)
+            ]
+            or [_count_period_pairs(pairs.lazy(), by=by, frequency=frequency).collect()]
+        )
+
+    period_pairs = period_pairs.group_by(*by, "first_period", "second_period").agg(
+        pl.col("pairs").sum(), pl.col("log_return").sum()
+    )
+
+    if by:
+        indices = [
+            _solve_index(group_pairs).select(
+                *[
+                    pl.lit(value, dtype=period_pairs.schema[column]).alias(column)
+                    for column, value in zip(by, key, strict=True)
+                ],
+                pl.all(),
+            )
+            for key, group_pairs in period_pairs.partition_by(by, as_dict=True, include_key=False).items()
+        ]
+    else:
+        indices = [_solve_index(period_pairs)] if not period_pairs.is_empty() else []
+
+    index_schema = {column: period_pairs.schema[column] for column in by} | {
+        "period": pl.Date,
+        "log_index": pl.Float64,
+        "index": pl.Float64,
+        "pairs": pl.UInt32,
+    }
+
+    return pl.concat(indices or [pl.DataFrame(schema=index_schema)]).sort(*by, "period")
+
+
+def _count_period_pairs(pairs: pl.LazyFrame, /, *, by: list[str], frequency: str) -> pl.LazyFrame:
+    """Count the pairs and sum their log returns per group and pair of periods."""
+    return (
+        pairs.select(
+            *by,
+            pl.col("first_date").dt.truncate(frequency).alias("first_period"),
+            pl.col("second_date").dt.truncate(frequency).alias("second_period"),
+            (pl.col("second_price").cast(pl.Float64) / pl.col("first_price").cast(pl.Float64))
+            .log()
+            .alias("log_return"),
+        )
+        .filter(pl.col("first_period") != pl.col("second_period"))
+        .group_by(*by, "first_period", "second_period")
+        .agg(pl.len().alias("pairs"), pl.col("log_return").sum())
+    )
+
+
+def _solve_index(period_pairs: pl.DataFrame, /) -> pl.DataFrame:
+    """Solve the normal equations of the pairs counted per pair of periods, fixing the first period at 0."""
+    periods = pl.concat([period_pairs["first_period"], period_pairs["second_period"]]).unique().sort()
+    first = np.searchsorted(periods.to_numpy(), period_pairs["first_period"].to_numpy())
+    second = np.searchsorted(periods.to_numpy(), period_pairs["second_period"].to_numpy())
+    counts = period_pairs["pairs"].to_numpy().astype(np.float64)
+    log_returns = period_pairs["log_return"].to_numpy()
+
+    n_periods = len(periods)
+    normal_matrix = np.zeros((n_periods, n_periods))
+    np.add.at(normal_matrix, (first, first), counts)
+    np.add.at(normal_matrix, (second, second), counts)
+    np.add.at(normal_matrix, (first, second), -counts)
+    np.add.at(normal_matrix, (second, first), -counts)
+    normal_vector = np.bincount(second, log_returns, n_periods) - np.bincount(first, log_returns, n_periods)
+
+    log_index = np.zeros(n_periods)
+    log_index[1:] = np.linalg.lstsq(normal_matrix[1:, 1:], normal_vector[1:], rcond=None)[0]
+
+    return pl.DataFrame(
+        {
+            "period": periods,
+            "log_index": log_index,
+            "index": INDEX_BASE * np.exp(log_index),
+            "pairs": np.diagonal(normal_matrix).astype(np.uint32),
+        }
+    )
@@ -0,0 +1,189 @@
+"""Single-file SQLite store of flat frames, indexed for point lookups by address, see `SqliteStore`."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import date
+
+import polars as pl
+
+from property_models.caching import local_path
+
+ADDRESS_LOOKUP_COLUMNS = ("postcode", "street_key", "street_number")
+
+
+class SqliteStore:
+    """Tables of flat frames in one SQLite file, indexed on `'address_id'`, the street address and `'date'`.
+
+    The street address is looked up on `'postcode'`, `'street_number'` and a `'street_key'`, the street name in a
+    normalised form chosen by the caller, so tables need all three columns.
+
+    Each table is created from a `pl.Schema` on first write. Dates are stored as days since the epoch and `pl.UInt64`
+    columns, such as the `'address_id'`, as the signed integer with the same bits, and both are converted back on
+    read. The file runs in WAL mode, so readers in other processes are not blocked by a bulk load.
+
+    e.g.
+    ```
+    store = SqliteStore("store.sqlite")
+    store.write("price_records", price_records_flat, schema=schema)
+    history = store.read("price_records", schema=schema, address_id=address_id)
+    ```
+    """
+
+    INSERT_BATCH_SIZE = 50_000
+    CACHE_KIB = 256 * 1024
+
+    def __init__(self, store_file: str, /):
+        """Refer to the store at `store_file`, a local path or `file://` url, which is created on first use."""
+        if (store_path := local_path(store_file)) is None:
+            raise ValueError(f"The SQLite store must be on the local disk, got {store_file!r}")
+
+        self.store_file = store_path
+
+        self._connection: sqlite3.Connection | None = None
+        self._ready_tables: set[str] = set()
+        self._lock = threading.Lock()
+
+    def write(self, table: str, dataframe: pl.DataFrame, /, *, schema: pl.Schema) -> None:
+        """Replace the rows of every `'address_id'` in `dataframe` with its rows, in one transaction.
+
+        Rows are inserted `INSERT_BATCH_SIZE` at a time. A new table gets its indexes after the rows are inserted,
+        which is faster than updating them row by row.
+        """
+        stored = dataframe.select(schema.names()).cast(schema).with_columns(self._to_sqlite(schema))
+        address_ids = stored["address_id"].unique().to_list()
+        placeholders = ", ".join("?" * len(schema))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({self._columns_sql(schema)})")
+                connection.executemany(
+                    f"DELETE FROM {table} WHERE address_id = ?",  # noqa: S608
+                    ((address_id,) for address_id in address_ids),
+                )
+                for batch in stored.iter_slices(self.INSERT_BATCH_SIZE):
+                    connection.executemany(
+                        f"INSERT INTO {table} VALUES ({placeholders})",  # noqa: S608
+                        batch.iter_rows(),
+                    )
+                self._create_indexes(connection, table, schema)
+
+    def read(
+        self,
+        table: str,
+        /,
+        *,
+        schema: pl.Schema,
+        address_id: int | None = None,
+        postcode: int | None = None,
+        street_key: str | None = None,
+        street_number: int | None = None,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> pl.DataFrame:
+        """Return the rows matching every filter given, through the indexes.
+
+        Filter on `address_id`, or on the `postcode`, `street_key` and `street_number` of a street address, and on a
+        `'date'` in `[since, until)` if the table has one. Rows are in date order if the table has a `'date'`.
+        """
+        conditions = {
+            # The same bits as a signed integer, see `_to_sqlite`.
+            "address_id = ?": None if address_id is None else address_id - 2**64 * (address_id >= 2**63),
+            "postcode = ?": postcode,
+            "street_key = ?": street_key,
+            "street_number = ?": street_number,
+            "date >= ?": since,
+            "date < ?": until,
+        }
+        conditions = {
+            condition: self._to_sqlite_value(value) for condition, value in conditions.items() if value is not None
+        }
+        where = " AND ".join(conditions) or "1"
+        order_by = "ORDER BY date" if "date" in schema else ""
+
+        with self._lock:
+            connection = self._connect()
+            if table not in self._ready_tables:
+                with connection:
+                    connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({self._columns_sql(schema)})")
+                    self._create_indexes(connection, table, schema)
+            rows = connection.execute(
+                f"SELECT * FROM {table} WHERE {where} {order_by}",  # noqa: S608
+                list(conditions.values()),
+            ).fetchall()
+
+        sqlite_schema = {name: pl.Int64 if self._is_converted(dtype) else dtype for name, dtype in schema.items()}
+        return pl.DataFrame(rows, schema=sqlite_schema, orient="row").with_columns(self._from_sqlite(schema))
+
+    def tables(self) -> list[str]:
+        """Return the names of the tables in the store."""
+        with self._lock:
+            return [
+                name
+                for (name,) in self._connect().execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+            ]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.store_file) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.store_file, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA cache_size=-{self.CACHE_KIB}")
+            self._connection = connection
+
+        return self._connection
+
+    def _create_indexes(self, connection: sqlite3.Connection, table: str, schema: pl.Schema, /) -> None:
+        """Create the indexes of a table, if they do not exist yet."""
+        indexes: list[Iterable[str]] = [["address_id"], ADDRESS_LOOKUP_COLUMNS]
+        if "date" in schema:
+            indexes.append(["date"])
+        for index_columns in indexes:
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{'_'.join(index_columns)} ON {table} ({', '.join(index_columns)})"
+            )
+
+        self._ready_tables.add(table)
+
+    @staticmethod
+    def _columns_sql(schema: pl.Schema, /) -> str:
+        return ", ".join(f"{name} {SqliteStore._sqlite_type(dtype)}" for name, dtype in schema.items())
+
+    @staticmethod
+    def _sqlite_type(dtype: pl.DataType, /) -> str:
+        if dtype.is_integer() or dtype == pl.Date:
+            return "INTEGER"
+        if dtype.is_float():
+            return "REAL"
+        return "TEXT"
+
+    @staticmethod
+    def _is_converted(dtype: pl.DataType, /) -> bool:
+        """Whether values of `dtype` are stored as a different integer."""
+        return dtype in (pl.Date, pl.UInt64)
+
+    @staticmethod
+    def _to_sqlite(schema: pl.Schema, /) -> list[pl.Expr]:
+        return [
+            pl.col(name).cast(pl.Int32) if dtype == pl.Date else pl.col(name).reinterpret(signed=True)
+            for name, dtype in schema.items()
+            if SqliteStore._is_converted(dtype)
+        ]
+
+    @staticmethod
+    def _from_sqlite(schema: pl.Schema, /) -> list[pl.Expr]:
+        return [
+            pl.col(name).cast(pl.Int32).cast(pl.Date) if dtype == pl.Date else pl.col(name).reinterpret(signed=False)
+            for name, dtype in schema.items()
+            if SqliteStore._is_converted(dtype)
+        ]
+
+    @staticmethod
+    def _to_sqlite_value(value: object, /) -> object:
+        """Convert a filter value into how it is stored."""
+        if isinstance(value, date):
+            return (value - date(1970, 1, 1)).days
+        return value
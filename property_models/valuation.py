@@ -0,0 +1,318 @@
+"""Hedonic valuation of properties from their features and sales, see `HedonicModel`."""
+
+from collections.abc import Sequence
+from datetime import date
+
+import numpy as np
+import polars as pl
+
+from property_models.constants import PropertyType
+from property_models.price_index import SALE_RECORD_TYPES
+
+
+class HedonicModel:
+    """Log-linear hedonic regression of sale prices on property features and a time fixed effect.
+
+    The log price is regressed on an intercept, the beds, baths and cars, the log of one plus the property and land
+    sizes, a flag for each of these that is missing (which is then taken as 0), a dummy for each `PropertyType` parent
+    and subtype, and a dummy for each period of sales but the first. Sales are given as joined by
+    `Address.join_on(PriceRecord.read(...), PropertyInfo.read(...))`.
+
+    Only the normal equations `X'X` and `X'y` are kept, accumulated `CHUNK_SIZE` sales at a time, so `partial_fit` can
+    add new sales to the fitted model without the old ones, and refitting costs the same however many sales have been
+    seen.
+
+    e.g.
+    ```
+    sales = Address.join_on(PriceRecord.read(**location), PropertyInfo.read(**location))
+    model = HedonicModel(frequency="1q").partial_fit(sales)
+    valued = model.predict(PropertyInfo.read(**location))
+    ```
+    """
+
+    CHUNK_SIZE = 100_000
+    COUNT_FEATURES = ["beds", "baths", "cars"]
+    SIZE_FEATURES = ["property_size_m2", "land_size_m2"]
+    PROPERTY_TYPES: list[tuple[str, str | None]] = [
+        (parent, None if sub_type._value_ == "None" else sub_type._value_)
+        for parent, sub_enum in PropertyType._sub_enum_lookup().items()
+        for sub_type in sub_enum.__members__.values()
+    ]
+
+    def __init__(self, *, frequency: str = "1q", record_types: Sequence[str] = SALE_RECORD_TYPES):
+        """Create an unfitted model with a time fixed effect per `frequency` period, fitted on `record_types`."""
+        self.frequency = frequency
+        self.record_types = list(record_types)
+        self.periods: list[date] = []
+        self.n_sales = 0
+        self.coefficients: np.ndarray | None = None
+
+        self._gram = np.zeros((0, 0))
+        self._moment = np.zeros(0)
+
+    @property
+    def features(self) -> list[str]:
+        """Return the names of the columns of the design, in the order of `coefficients`."""
+        property_types = [f"{parent}/{sub_type}" if sub_type else parent for parent, sub_type in self.PROPERTY_TYPES]
+        return (
+            ["intercept"]
+            + self.COUNT_FEATURES
+            + [f"log_{feature}" for feature in self.SIZE_FEATURES]
+            + [f"{feature}_missing" for feature in self.COUNT_FEATURES + self.SIZE_FEATURES]
+            + [f"property_type={property_type}" for property_type in property_types]
+            + [f"period={period}" for period in self.periods[1:]]
+        )
+
+    def partial_fit(self, sales: pl.DataFrame, /) -> "HedonicModel":
+        """Add the priced sales of `record_types` in `sales` to the normal equations and refit."""
+        sales = sales.filter(
+            pl.col("record_type").cast(pl.String).is_in(self.record_types)
+            & (pl.col("price") > 0)
+            & pl.col("date").is_not_null()
+        ).with_columns(pl.col("date").dt.truncate(self.frequency).alias("period"))
+
+        new_periods = sorted(set(sales["period"].unique().to_list()) - set(self.periods))
+        if not self.periods and new_periods:
+            self.periods, new_periods = new_periods[:1], new_periods[1:]
+        self.periods += new_periods
+        self._gram = np.pad(self._gram, (0, len(self.features) - len(self._gram)))
+        self._moment = np.pad(self._moment, (0, len(self.features) - len(self._moment)))
+
+        for chunk in sales.iter_slices(self.CHUNK_SIZE):
+            design = self.design(chunk, chunk["period"])
+            log_prices = np.log(chunk["price"].to_numpy().astype(np.float64))
+            self._gram += design.T @ design
+            self._moment += design.T @ log_prices
+        self.n_sales += sales.height
+
+        return self.refit()
+
+    def refit(self) -> "HedonicModel":
+        """Solve the normal equations for the coefficients, taking the minimum norm solution if they are singular."""
+        self.coefficients = np.linalg.lstsq(self._gram, self._moment, rcond=None)[0]
+        return self
+
+    def predict(self, properties: pl.DataFrame, /, *, at: date | None = None) -> pl.DataFrame:
+        """Value every property in `properties` at the period of `at`, by default the latest period fitted.
+
+        Returns `properties` with a `'predicted_price'` column. Raises a `ValueError` if the model is unfitted or `at`
+        is not in a fitted period.
+        """
+        if self.coefficients is None or not self.periods:
+            raise ValueError("The model has not been fitted on any sales.")
+
+        period = self.periods[-1] if at is None else pl.Series([at]).dt.truncate(self.frequency).item()
+        if period not in self.periods:
+            raise ValueError(f"No sales were fitted in the period of {at!r}.")
+
+        n_property_features = len(self.features) - len(self.periods) + 1
+        period_effect = 0.0 if period == self.periods[0] else self.coefficients[self.features.index(f"period={period}")]
+
+        log_prices = np.concatenate(
+            [
+                self.design(chunk) @ self.coefficients[:n_property_features] + period_effect
+                for chunk in properties.iter_slices(self.CHUNK_SIZE)
+            ]
+            or [np.zeros(0)]
+        )
+        return properties.with_columns(pl.Series("predicted_price", np.exp(log_prices)))
+
+    def design(self, properties: pl.DataFrame, periods: pl.Series | None = None, /) -> np.ndarray:
+        """Return the design matrix of `properties` in the given periods, which must have been fitted.
+
+        Without `periods` the period dummies are left out.
+        """
+        parent = pl.col("property_type").list.get(0, null_on_oob=True)
+        sub_type = pl.col("property_type").list.get(1, null_on_oob=True).replace("None", None)
+
+        features = properties.select(
+            pl.lit(1.0).alias("intercept"),
+            *[pl.col(feature).cast(pl.Float64).fill_null(0.0) for feature in self.COUNT_FEATURES],
+            *[pl.col(feature).cast(pl.Float64).log1p().fill_null(0.0) for feature in self.SIZE_FEATURES],
+            *[
+                pl.col(feature).is_null().alias(f"{feature}_missing")
+                for feature in self.COUNT_FEATURES + self.SIZE_FEATURES
+            ],
+            *[
+                ((parent == type_parent) & (sub_type.eq_missing(type_sub_type) if type_sub_type else True))
+                .fill_null(value=False)
+                .alias(f"{type_parent}/{type_sub_type}")
+                for type_parent, type_sub_type in self.PROPERTY_TYPES
+            ],
+            *[(periods == period).alias(f"period={period}") for period in self.periods[1:] if periods is not None],
+        )
+
+        return features.to_numpy().astype(np.float64)
+
+
+class ComparablesIndex:
+    """Nearest neighbour search for the sales most similar to subject properties.
+
+    Sales are given as joined by `Address.join_on(PriceRecord.read(...), PropertyInfo.read(...))`. Each is placed at
+    its beds, baths, cars and the log of one plus its property and land sizes, standardised over the sales, with
+    missing values at the mean, and a one-hot `PropertyType` parent scaled by `property_type_weight`. Queries compare
+    blocks of subjects against blocks of sales with NumPy, keeping the closest `k` so far, so memory stays bounded by
+    `BLOCK_SIZE` times `CANDIDATE_BLOCK_SIZE`.
+
+    e.g.
+    ```
+    index = ComparablesIndex(Address.join_on(PriceRecord.read(**location), PropertyInfo.read(**location)))
+    comparables = index.query(PropertyInfo.read(**location), k=10, since=date(2024, 1, 1))
+    ```
+    """
+
+    BLOCK_SIZE = 1024
+    CANDIDATE_BLOCK_SIZE = 16_384
+    PROPERTY_TYPE_PARENTS = list(PropertyType._sub_enum_lookup())
+
+    def __init__(self, sales: pl.DataFrame, /, *, property_type_weight: float = 1.0):
+        """Index the dated sales in `sales`."""
+        self.property_type_weight = property_type_weight
+        self.sales = sales.filter(pl.col("date").is_not_null()).sort("date")
+
+        numeric = self._numeric_features(self.sales)
+        self._mean = np.nanmean(numeric, axis=0) if len(numeric) else np.zeros(numeric.shape[1])
+        self._scale = np.nanstd(numeric, axis=0) if len(numeric) else np.ones(numeric.shape[1])
+        self._scale[~(self._scale > 0)] = 1.0
+        self._mean[np.isnan(self._mean)] = 0.0
+
+        self._points = self.points(self.sales)
+        self._scoring = np.hstack([self._points, (self._points**2).sum(axis=1, keepdims=True)]).astype(np.float32)
+        self._dates = self.sales["date"].to_numpy()
+        self._record_types = self.sales["record_type"].cast(pl.String).to_numpy()
+        self._address_ids = (
+            self.sales["address_id"].to_numpy() if "address_id" in self.sales.columns else np.zeros(len(self.sales))
+        )
+
+    def __len__(self) -> int:
+        """Return the number of sales indexed."""
+        return self.sales.height
+
+    def points(self, properties: pl.DataFrame, /) -> np.ndarray:
+        """Return the position of each property in the feature space of the index."""
+        numeric = (self._numeric_features(properties) - self._mean) / self._scale
+        parents = properties.select(
+            (pl.col("property_type").list.get(0, null_on_oob=True) == parent).fill_null(value=False).alias(parent)
+            for parent in self.PROPERTY_TYPE_PARENTS
+        ).to_numpy()
+
+        return np.hstack([np.nan_to_num(numeric), parents * (self.property_type_weight / np.sqrt(2))])
+
+    def query(
+        self,
+        subjects: pl.DataFrame,
+        /,
+        *,
+        k: int = 10,
+        since: date | None = None,
+        until: date | None = None,
+        record_types: Sequence[str] = SALE_RECORD_TYPES,
+    ) -> pl.DataFrame:
+        """Find the `k` sales closest to each subject property, within the dates and of the record types given.
+
+        Sales of the subject's own `'address_id'` are skipped. Returns one row per comparable with the position of
+        its `'subject'` in `subjects`, its `'rank'` from 0, its `'distance'` and the columns of the sale, ordered by
+        subject and rank. Subjects with fewer than `k` matching sales get fewer rows.
+        """
+        candidates = np.flatnonzero(
+            (self._dates >= np.datetime64(since or date.min, "D"))
+            & (self._dates <= np.datetime64(until or date.max, "D"))
+            & np.isin(self._record_types, list(record_types))
+        )
+        subject_points = self.points(subjects)
+        subject_ids = (
+            subjects["address_id"].to_numpy() if "address_id" in subjects.columns else np.full(len(subjects), -1)
+        )
+
+        neighbours, distances = [], []
+        for start in range(0, len(subjects), self.BLOCK_SIZE):
+            block = slice(start, start + self.BLOCK_SIZE)
+            block_neighbours, block_distances = self._block_query(
+                subject_points[block], subject_ids[block], candidates, k
+            )
+            neighbours.append(block_neighbours)
+            distances.append(block_distances)
+
+        neighbours = np.vstack(neighbours) if neighbours else np.zeros((0, k), dtype=np.int64)
+        distances = np.vstack(distances) if distances else np.zeros((0, k))
+        found = np.isfinite(distances)
+
+        return pl.DataFrame(
+            {
+                "subject": np.nonzero(found)[0].astype(np.uint32),
+                "rank": np.nonzero(found)[1].astype(np.uint32),
+                "distance": np.sqrt(distances[found]),
+            }
+        ).hstack(self.sales[neighbours[found]])
+
+    def _block_query(
+        self, subject_points: np.ndarray, subject_ids: np.ndarray, candidates: np.ndarray, k: int, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the indices and squared distances of the `k` closest candidates to each subject, closest first.
+
+        Candidates are ranked by `|c|^2 - 2 q.c`, the squared distance less the constant `|q|^2`, in one float32 matrix
+        product per block. Once a subject has `k` candidates, only those beating its `k`th best are merged in.
+        """
+        n_subjects = len(subject_points)
+        queries = np.hstack([-2 * subject_points, np.ones((n_subjects, 1))]).astype(np.float32)
+        best_neighbours = np.zeros((n_subjects, k), dtype=np.int64)
+        best_scores = np.full((n_subjects, k), np.inf, dtype=np.float32)
+
+        for start in range(0, len(candidates), self.CANDIDATE_BLOCK_SIZE):
+            block = candidates[start : start + self.CANDIDATE_BLOCK_SIZE]
+            scores = queries @ self._scoring[block].T
+
+            if np.isinf(best_scores[:, -1]).any():
+                scores[subject_ids[:, None] == self._address_ids[block]] = np.inf
+                top = np.argpartition(scores, k - 1, axis=1)[:, :k] if scores.shape[1] > k else None
+                columns = np.broadcast_to(np.arange(scores.shape[1]), scores.shape) if top is None else top
+                rows = np.repeat(np.arange(n_subjects), columns.shape[1])
+                columns = columns.ravel()
+            else:
+                rows, columns = np.divmod(np.flatnonzero(scores < best_scores[:, -1:]), scores.shape[1])
+                is_own = subject_ids[rows] == self._address_ids[block[columns]]
+                rows, columns = rows[~is_own], columns[~is_own]
+
+            best_neighbours, best_scores = self._merge(
+                best_neighbours, best_scores, rows, block[columns], scores[rows, columns]
+            )
+
+        distances = ((self._points[best_neighbours] - subject_points[:, None, :]) ** 2).sum(axis=2)
+        distances[np.isinf(best_scores)] = np.inf
+        order = np.argsort(distances, axis=1, kind="stable")
+
+        return np.take_along_axis(best_neighbours, order, axis=1), np.take_along_axis(distances, order, axis=1)
+
+    @staticmethod
+    def _merge(
+        best_neighbours: np.ndarray,
+        best_scores: np.ndarray,
+        rows: np.ndarray,
+        neighbours: np.ndarray,
+        scores: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Keep the `k` best scores of each row out of the current best and the new `(row, neighbour, score)`s."""
+        n_subjects, k = best_scores.shape
+        all_rows = np.concatenate([np.repeat(np.arange(n_subjects), k), rows])
+        all_neighbours = np.concatenate([best_neighbours.ravel(), neighbours])
+        all_scores = np.concatenate([best_scores.ravel(), scores])
+
+        order = np.lexsort((all_scores, all_rows))
+        all_rows = all_rows[order]
+        ranks = np.arange(len(order)) - np.searchsorted(all_rows, all_rows)
+        kept = ranks < k
+
+        best_neighbours = np.empty_like(best_neighbours)
+        best_scores = np.empty_like(best_scores)
+        best_neighbours[all_rows[kept], ranks[kept]] = all_neighbours[order][kept]
+        best_scores[all_rows[kept], ranks[kept]] = all_scores[order][kept]
+
+        return best_neighbours, best_scores
+
+    def _numeric_features(self, properties: pl.DataFrame, /) -> np.ndarray:
+        """Return the numeric features of each property, with `nan` where missing."""
+        numeric = properties.select(
+            *[pl.col(feature).cast(pl.Float64) for feature in HedonicModel.COUNT_FEATURES],
+            *[pl.col(feature).cast(pl.Float64).log1p() for feature in HedonicModel.SIZE_FEATURES],
+        )
+        return numeric.fill_null(np.nan).to_numpy()
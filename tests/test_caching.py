@@ -0,0 +1,113 @@
+import fsspec
+import pytest
+
+from property_models.caching import ParseCache, RemoteFileCache, ValidationLedger
+
+TEST_NAMESPACE = "AUS"
+TEST_PARSED = {"street_number": 80, "street_name": "ROSEBERRY STREET"}
+
+
+def test_parse_cache_memory():
+    """Test the in-memory layer normalises keys, counts hits and respects its size bound."""
+    parse_cache = ParseCache(None, parser_version="1", max_size=2)
+
+    assert parse_cache.get(TEST_NAMESPACE, "80 roseberry street") is None
+    parse_cache.put(TEST_NAMESPACE, "80 roseberry street", TEST_PARSED)
+    assert parse_cache.get(TEST_NAMESPACE, "  80 ROSEBERRY   street ") == TEST_PARSED
+    assert parse_cache.get("NZ", "80 roseberry street") is None
+
+    parse_cache.put(TEST_NAMESPACE, "1 a st", TEST_PARSED)
+    parse_cache.put(TEST_NAMESPACE, "2 b st", TEST_PARSED)
+    assert len(parse_cache.memory) == 2
+    assert parse_cache.get(TEST_NAMESPACE, "80 roseberry street") is None
+
+    assert dict(parse_cache.stats) == {"memory_hits": 1, "disk_hits": 0, "misses": 3}
+    assert parse_cache.hit_rate() == 0.25
+
+
+def test_parse_cache_disk(tmp_path):
+    """Test the on-disk layer is shared between caches and keyed on the parser version."""
+    cache_file = str(tmp_path / "cache" / "parsed.sqlite")
+    ParseCache(cache_file, parser_version="1").put_many(TEST_NAMESPACE, {"80 roseberry street": TEST_PARSED})
+
+    parse_cache = ParseCache(cache_file, parser_version="1")
+    assert parse_cache.get_many(TEST_NAMESPACE, ["80 ROSEBERRY STREET", "1 a st"]) == {
+        "80 ROSEBERRY STREET": TEST_PARSED
+    }
+    assert parse_cache.get(TEST_NAMESPACE, "80 roseberry street") == TEST_PARSED
+    assert dict(parse_cache.stats) == {"memory_hits": 1, "disk_hits": 1, "misses": 1}
+
+    assert ParseCache(cache_file, parser_version="2").get(TEST_NAMESPACE, "80 roseberry street") is None
+
+    parse_cache.clear(disk=True)
+    assert ParseCache(cache_file, parser_version="1").get(TEST_NAMESPACE, "80 roseberry street") is None
+
+
+def test_parse_cache_remote_file(tmp_path, monkeypatch):
+    """Test a cache file on a remote filesystem falls back to the in-memory layer without touching the local disk."""
+    monkeypatch.chdir(tmp_path)
+    parse_cache = ParseCache("memory://cache/parsed.sqlite", parser_version="1")
+
+    parse_cache.put(TEST_NAMESPACE, "80 roseberry street", TEST_PARSED)
+    assert parse_cache.get(TEST_NAMESPACE, "80 roseberry street") == TEST_PARSED
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_validation_ledger(tmp_path, monkeypatch):
+    """Test the ledger is shared between instances, keyed on the validator version and can be cleared."""
+    ledger_file = str(tmp_path / "cache" / "validation.sqlite")
+    ValidationLedger(ledger_file, validator_version="1").record("blake2b:abc")
+
+    ledger = ValidationLedger(ledger_file, validator_version="1")
+    assert ledger.is_validated("blake2b:abc")
+    assert not ledger.is_validated("blake2b:def")
+    assert dict(ledger.stats) == {"hits": 1, "misses": 1}
+
+    assert not ValidationLedger(ledger_file, validator_version="2").is_validated("blake2b:abc")
+
+    ledger.clear()
+    assert not ValidationLedger(ledger_file, validator_version="1").is_validated("blake2b:abc")
+
+    monkeypatch.chdir(tmp_path / "cache")
+    for disabled_file in (None, "memory://cache/validation.sqlite"):
+        disabled_ledger = ValidationLedger(disabled_file, validator_version="1")
+        disabled_ledger.record("blake2b:abc")
+        assert not disabled_ledger.is_validated("blake2b:abc")
+    assert [path.name for path in (tmp_path / "cache").iterdir() if not path.name.startswith("validation")] == []
+
+
+def test_remote_file_cache(tmp_path):
+    """Test remote files are downloaded once, downloaded again when changed and evicted least recently used first."""
+    memory_fs = fsspec.filesystem("memory")
+    memory_fs.pipe({"/remote_cache/a.csv": b"a" * 10, "/remote_cache/b.csv": b"b" * 10})
+    remote_cache = RemoteFileCache(str(tmp_path / "remote"), max_bytes=25)
+
+    try:
+        local_file = remote_cache.get("memory://remote_cache/a.csv")
+        assert remote_cache.get("memory://remote_cache/a.csv") == local_file
+        with open(local_file, "rb") as open_file:
+            assert open_file.read() == b"a" * 10
+
+        memory_fs.pipe("/remote_cache/a.csv", b"A" * 12)
+        with open(remote_cache.get("memory://remote_cache/a.csv"), "rb") as open_file:
+            assert open_file.read() == b"A" * 12
+
+        remote_cache.get("memory://remote_cache/b.csv")
+        memory_fs.pipe("/remote_cache/c.csv", b"c" * 10)
+        remote_cache.get("memory://remote_cache/c.csv")
+        assert not remote_cache._connect().execute("SELECT 1 FROM files WHERE url LIKE '%a.csv'").fetchall()
+
+        with pytest.raises(FileNotFoundError):
+            remote_cache.get("memory://remote_cache/missing.csv")
+        assert remote_cache.get(str(tmp_path / "local.csv")) == str(tmp_path / "local.csv")
+
+        assert dict(remote_cache.stats) == {
+            "hits": 1,
+            "misses": 3,
+            "stale": 1,
+            "evictions": 1,
+            "downloaded_bytes": 42,
+        }
+        assert remote_cache.hit_rate() == 0.2
+    finally:
+        memory_fs.rm("/remote_cache", recursive=True)
@@ -1,5 +1,6 @@
 import os
 
+import polars as pl
 import pytest
 from pydantic import BaseModel, ConfigDict, ValidationError
 
@@ -8,6 +9,7 @@ from property_models.constants import (
     POSTCODE_CSV_FILE,
     PRICE_RECORDS_CSV_FILE,
     PROPERTIES_INFO_JSON_FILE,
+    PROPERTY_TYPE_ENUM,
     PropertyType,
     RecordType,
 )
@@ -64,6 +66,21 @@ def test_record_type_clean():
         RecordType.parse("AUUUUUCTION", errors="coerce")
 
 
+def test_record_type_parse_expr():
+    """Testing `RecordType.parse_expr` matches `RecordType.parse`."""
+    raw = ["auction", "  AuctION ", "  pRIVate SALE ", "By Negotiation", "price guide", "week", "AUUUUUCTION", None]
+    record_types = pl.DataFrame({"record_type": raw})
+
+    parsed = record_types.select(RecordType.parse_expr(errors="null"))["record_type"].to_list()
+    assert parsed == [None if value is None else RecordType.parse(value, errors="null") for value in raw]
+
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        record_types.select(RecordType.parse_expr(pl.col("record_type"), errors="raise"))
+
+    with pytest.raises(NotImplementedError):
+        RecordType.parse_expr(errors="coerce")
+
+
 #### PROPERTY TYPE ######
 
 
@@ -109,3 +126,45 @@ def test_property_type_pydantic():
     TestModel(property_type=PropertyType(("land", "new_build")))
     with pytest.raises(ValidationError):
         TestModel(property_type=("land", "new_build"))
+
+
+def test_property_type_codes():
+    """Test encoding property types to codes, decoding them and filtering by parent as a range."""
+    code_table = PropertyType.code_table()
+    assert code_table.height == code_table["label"].n_unique() == len(PROPERTY_TYPE_ENUM.categories)
+    for parent, sub_enum in PropertyType._sub_enum_lookup().items():
+        parent_codes = code_table.filter(pl.col("parent") == parent)["code"]
+        assert parent_codes.to_list() == list(range(parent_codes.min(), parent_codes.max() + 1))
+        assert len(parent_codes) == len(sub_enum)
+
+    raw = [["apartment", "None"], ["land", "demolition"], None, ["apartment", "modern"], ["town_house", None]]
+    properties = pl.DataFrame({"property_type": raw})
+    encoded = properties.with_columns(PropertyType.encode_expr())
+
+    assert encoded.schema["property_type"] == pl.UInt8
+    assert encoded.with_columns(PropertyType.decode_expr())["property_type"].to_list() == [
+        ["apartment", "None"],
+        ["land", "demolition"],
+        None,
+        ["apartment", "modern"],
+        ["town_house", "None"],
+    ]
+    assert encoded.select(pl.col("property_type").cast(pl.UInt32).cast(PROPERTY_TYPE_ENUM)).to_series().to_list() == [
+        "apartment/None",
+        "land/demolition",
+        None,
+        "apartment/modern",
+        "town_house/None",
+    ]
+
+    apartments = encoded.filter(PropertyType.parent_expr(PropertyType.APARTMENT))
+    assert apartments.height == 2  # noqa: PLR2004
+    assert encoded.filter(PropertyType.parent_expr("land")).height == 1
+
+    with pytest.raises(KeyError):
+        PropertyType.parent_expr("castle")
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        pl.DataFrame({"property_type": [["apartment", "castle"]]}).select(PropertyType.encode_expr())
+    assert pl.DataFrame({"property_type": [["apartment", "castle"]]}).select(
+        PropertyType.encode_expr(errors="null")
+    ).to_series().to_list() == [None]
@@ -0,0 +1,110 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import polars as pl
+import pytest
+
+from property_models import constants, locking
+from property_models.dev_utils.fixtures import TEST_COUNTRY, TEST_STATE, TEST_SUBURB
+from property_models.locking import atomic_write, partition_lock
+from property_models.models import MissingDataWarning, PriceRecord
+
+
+def test_atomic_write(tmp_path, monkeypatch):
+    """Test a write flushes its directory, and a failed write leaves the old contents and no temporary file."""
+    file = str(tmp_path / "records.csv")
+    synced_directories = []
+    monkeypatch.setattr(locking, "_fsync_directory", synced_directories.append)
+    with atomic_write(file, "w") as open_file:
+        open_file.write("old\n")
+    assert synced_directories == [str(tmp_path)]
+    monkeypatch.undo()
+    locking._fsync_directory(str(tmp_path))
+
+    with pytest.raises(RuntimeError), atomic_write(file, "w") as open_file:
+        open_file.write("new\n")
+        raise RuntimeError
+
+    with open(file) as open_file:
+        assert open_file.read() == "old\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["records.csv"]
+
+
+def test_partition_lock(tmp_path):
+    """Test a writer waits for the lock on the same partition, but not on another."""
+    file = str(tmp_path / "records.csv")
+    order = []
+
+    def write_after_lock(partition_file: str, name: str) -> None:
+        with partition_lock(partition_file):
+            order.append(name)
+
+    with partition_lock(file):
+        same = threading.Thread(target=write_after_lock, args=(file, "same"))
+        other = threading.Thread(target=write_after_lock, args=(str(tmp_path / "other.csv"), "other"))
+        same.start()
+        other.start()
+        other.join(timeout=10)
+        time.sleep(0.1)
+        order.append("holder")
+    same.join(timeout=10)
+
+    assert order == ["other", "holder", "same"]
+
+
+def test_aggregates_build_waits_for_lock(mock_price_records):
+    """Test building the aggregates of a suburb waits for a writer holding its partition lock, and sees its rows."""
+    aggregates = []
+
+    def build_aggregates() -> None:
+        aggregates.append(PriceRecord.read_aggregates(country=TEST_COUNTRY, suburbs=[(TEST_STATE, TEST_SUBURB)]))
+
+    with partition_lock(mock_price_records):
+        builder = threading.Thread(target=build_aggregates)
+        builder.start()
+        builder.join(timeout=0.2)
+        assert builder.is_alive()
+        with open(mock_price_records, "a") as open_file:
+            open_file.write(",10,MY ST,2024-01-01,auction,2000000\n")
+    builder.join(timeout=10)
+
+    assert aggregates[0]["volume"].sum() == 4
+
+
+def test_aggregates_read_missing_writes_nothing(tmp_path, monkeypatch):
+    """Test reading the aggregates of a suburb without records creates no directory or lock file."""
+    monkeypatch.setattr(constants, "PRICE_RECORDS_CSV_FILE", str(tmp_path) + "/{country}/{state}/{suburb}/records.csv")
+
+    with pytest.warns(MissingDataWarning, match="DUNTROON"):
+        PriceRecord.read_aggregates(country=TEST_COUNTRY, suburbs=[("ACT", "DUNTROON")])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def _append_in_process(price_records_template: str, new_records: list[pl.DataFrame]) -> list[int]:
+    constants.PRICE_RECORDS_CSV_FILE = price_records_template
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    return [PriceRecord.append(records, **location, compact_every=3) for records in new_records]
+
+
+def test_concurrent_appends(mock_price_records):  # noqa: ARG001
+    """Test appends from many processes to one suburb are all kept, with compactions in between."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    data_csv = PriceRecord.read(**location)
+    workers, appends = 4, 10
+    new_records = [
+        [
+            data_csv.head(1).with_columns(pl.lit(date(2000 + worker, 1, 1 + append)).alias("date")).drop("address_id")
+            for append in range(appends)
+        ]
+        for worker in range(workers)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        appended = list(executor.map(_append_in_process, [constants.PRICE_RECORDS_CSV_FILE] * workers, new_records))
+
+    assert appended == [[1] * appends] * workers
+    assert PriceRecord.read(**location).height == data_csv.height + workers * appends
@@ -0,0 +1,47 @@
+import os
+
+import polars as pl
+import polars.testing
+
+from property_models import constants
+from property_models.dev_utils.fixtures import TEST_COUNTRY, TEST_STATE, TEST_SUBURB
+from property_models.locking import LOCK_SUFFIX
+from property_models.migrations import (
+    list_partitions,
+    migrate_price_records_to_parquet,
+    migrate_properties_info_to_ndjson,
+)
+from property_models.models import PriceRecord, PropertyInfo
+
+
+def test_list_partitions(mock_price_records):  # noqa: ARG001
+    """Test finding the suburbs with a price records csv."""
+    assert list_partitions(constants.PRICE_RECORDS_CSV_FILE, country=TEST_COUNTRY) == [(TEST_STATE, TEST_SUBURB)]
+    assert list_partitions(constants.PRICE_RECORDS_CSV_FILE, country="NZL") == []
+
+
+def test_migrate_price_records_to_parquet(mock_price_records, mock_price_records_parquet):  # noqa: ARG001
+    """Test migrating the csv tree gives the same records in the Parquet store."""
+    data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    PriceRecord.append(data_csv, country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    PriceRecord.read_aggregates(country=TEST_COUNTRY, suburbs=[(TEST_STATE, TEST_SUBURB)])
+
+    migrated = migrate_price_records_to_parquet(TEST_COUNTRY, remove_csv=True)
+
+    assert migrated == [(TEST_STATE, TEST_SUBURB)]
+    for suffix in ("", constants.PRICE_RECORDS_KEY_INDEX_SUFFIX, constants.PRICE_AGGREGATES_SUFFIX, LOCK_SUFFIX):
+        assert not os.path.exists(mock_price_records + suffix)
+    pl.testing.assert_frame_equal(PriceRecord.scan(country=TEST_COUNTRY).collect().sort("date"), data_csv.sort("date"))
+
+
+def test_migrate_properties_info_to_ndjson(mock_property_info):
+    """Test converting the properties json files gives the same properties in ndjson."""
+    data_json = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    converted = migrate_properties_info_to_ndjson(TEST_COUNTRY, remove_json=True)
+
+    assert converted == [(TEST_STATE, TEST_SUBURB)]
+    assert not os.path.exists(mock_property_info)
+    pl.testing.assert_frame_equal(
+        PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB, ndjson=True), data_json
+    )
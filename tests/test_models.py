@@ -1,26 +1,38 @@
+import copy
 import json
 import os
 from datetime import date
 
+import fsspec
 import polars as pl
 import polars.testing
+import pydantic
 import pytest
 
-from property_models.constants import PropertyCondition, PropertyType, RecordType
+from property_models import constants
+from property_models.constants import ADDRESS_SCHEMA, PRICE_RECORDS_SCHEMA, PropertyCondition, PropertyType, RecordType
 from property_models.dev_utils.fixtures import (
     CORRECT_PROPERTY_INFO_JSON,
     CORRECT_RECORDS_COMPRESSED_JSON,
     CORRECT_RECORDS_JSON,
+    TEST_ADDRESSES,
     TEST_COUNTRY,
     TEST_POSTCODE,
     TEST_STATE,
+    TEST_STREET_NAMES,
     TEST_SUBURB,
 )
 from property_models.models import (
     Address,
+    AddressCollisionError,
+    MissingDataWarning,
     Postcode,  # Import the Postcode class from your module
+    PriceAggregates,
     PriceRecord,
+    PriceRecordBatchBuilder,
     PropertyInfo,
+    PropertyInfoValidationError,
+    remote_file_cache,
 )
 
 #### POSTCODES ##########
@@ -56,6 +68,94 @@ def test_find_postcode(mock_postcodes):
     assert postcode == TEST_POSTCODE
 
 
+def test_read_postcodes_sidecar(mock_postcodes):
+    """Test reading postcodes writes a binary sidecar and reads it back identically."""
+    postcodes = Postcode.read_postcodes(country=TEST_COUNTRY)
+    sidecar_file = mock_postcodes.removesuffix(".csv") + constants.POSTCODE_SIDECAR_SUFFIX
+    assert os.path.isfile(sidecar_file)
+
+    Postcode._read_postcodes_file.cache_clear()
+    pl.testing.assert_frame_equal(Postcode.read_postcodes(country=TEST_COUNTRY), postcodes)
+
+
+def test_read_postcodes_invalidation(mock_postcodes):
+    """Test changing the postcode file is picked up by the cached readers."""
+    assert Postcode.find_postcode(suburb="duntroon", country=TEST_COUNTRY) == 2600
+
+    with open(mock_postcodes, "w") as open_file:
+        open_file.write("postcode,suburb\n2612,duntroon\n")
+
+    assert Postcode.read_postcodes(country=TEST_COUNTRY).height == 1
+    assert Postcode.find_postcode(suburb="duntroon", country=TEST_COUNTRY) == 2612
+
+
+def test_read_postcodes_remote_recheck(monkeypatch):
+    """Test a remote postcode file is only checked for changes once its last check is old enough."""
+    memory_fs = fsspec.filesystem("memory")
+    memory_fs.pipe("/remote_postcodes/AUS.csv", b"postcode,suburb\n2600,duntroon\n")
+    monkeypatch.setattr(constants, "POSTCODE_CSV_FILE", "memory://remote_postcodes/{country}.csv")
+
+    try:
+        assert Postcode.find_postcode(suburb="duntroon", country=TEST_COUNTRY) == 2600
+        memory_fs.pipe("/remote_postcodes/AUS.csv", b"postcode,suburb\n2612,duntroon\n")
+        assert Postcode.find_postcode(suburb="duntroon", country=TEST_COUNTRY) == 2600
+
+        monkeypatch.setattr(Postcode, "REMOTE_RECHECK_SECONDS", 0.0)
+        assert Postcode.find_postcode(suburb="duntroon", country=TEST_COUNTRY) == 2612
+    finally:
+        memory_fs.rm("/remote_postcodes", recursive=True)
+        Postcode._remote_file_keys.clear()
+
+
+def test_find_postcode_missing(mock_postcodes):
+    """Test unknown suburbs and postcodes raise a `ValueError`."""
+    with pytest.raises(ValueError):
+        Postcode.find_postcode(suburb="not_a_suburb", country=TEST_COUNTRY)
+    with pytest.raises(ValueError):
+        Postcode.find_suburb(postcode=1, country=TEST_COUNTRY)
+
+
+def test_find_suburbs(mock_postcodes):
+    """Test the vectorised find_suburbs method returns every suburb for each postcode."""
+    suburbs = Postcode.find_suburbs(pl.Series([2600, 200, 1, TEST_POSTCODE]), country=TEST_COUNTRY)
+
+    assert suburbs.to_list() == [["DEAKIN_WEST", "DUNTROON"], ["AUSTRALIAN_NATIONAL_UNIVERSITY"], None, [TEST_SUBURB]]
+
+
+def test_find_postcodes(mock_postcodes):
+    """Test the vectorised find_postcodes method cleans suburbs and keeps the input order."""
+    postcodes = Postcode.find_postcodes(
+        pl.Series(["duntroon", " jervis bay", "not_a_suburb", None, "DEAKIN WEST"]), country=TEST_COUNTRY
+    )
+
+    assert postcodes.to_list() == [[2600], [2540], None, None, [2600]]
+
+
+def test_fuzzy_find_suburb(mock_postcodes):
+    """Test misspelt suburbs and suburbs with extra words are ranked to the right suburb."""
+    candidates = Postcode.fuzzy_find_suburb(suburb="dunntroon", country=TEST_COUNTRY)
+    assert candidates[0][0] == "DUNTROON"
+    assert [score for _suburb, score in candidates] == sorted((score for _suburb, score in candidates), reverse=True)
+
+    candidates = Postcode.fuzzy_find_suburb(suburb="Jervis Bay ACT", country=TEST_COUNTRY, limit=1)
+    assert [suburb for suburb, _score in candidates] == ["JERVIS_BAY"]
+
+    assert Postcode.fuzzy_find_suburb(suburb="deakin west", country=TEST_COUNTRY)[0] == ("DEAKIN_WEST", 1.0)
+    assert Postcode.fuzzy_find_suburb(suburb="qqq", country=TEST_COUNTRY) == []
+
+
+def test_fuzzy_find_postcodes(mock_postcodes):
+    """Test fuzzy resolving a whole column of suburbs."""
+    resolved = Postcode.fuzzy_find_postcodes(
+        pl.Series(["dunntroon", "DEAKIN WEST", "qqq", None, "dunntroon"]), country=TEST_COUNTRY
+    )
+
+    assert resolved.columns == ["suburb", "score", "postcodes"]
+    assert resolved["suburb"].to_list() == ["DUNTROON", "DEAKIN_WEST", None, None, "DUNTROON"]
+    assert resolved["postcodes"].to_list() == [[2600], [2600], None, None, [2600]]
+    assert resolved["score"][1] == 1.0
+
+
 ##### ADDRESSES ###############
 
 
@@ -114,6 +214,57 @@ def test_address_parsing(_name, address, country, correct_json):
         assert correct_json[field] == value
 
 
+@pytest.mark.parametrize("workers", [None, 2])
+def test_address_parse_many(workers):
+    """Test bulk parsing matches `Address.parse` and moves failures to the error column."""
+    addresses = [
+        "U2 42-44 Example St, STANMORE, NSW 2048",
+        "not an address",
+        "80 ROSEBERRY STREET, ASCOT VALE, VIC 3032",
+        "99999 ROSEBERRY STREET, ASCOT VALE, VIC 3032",
+    ]
+
+    parsed = Address.parse_many(pl.Series(addresses), country=TEST_COUNTRY, workers=workers, chunk_size=2)
+
+    assert parsed.schema == pl.Schema({"address": pl.Struct(ADDRESS_SCHEMA), "error": pl.String})
+    assert parsed["address"].to_list() == [
+        Address.parse(addresses[0], country=TEST_COUNTRY).model_dump(),
+        None,
+        Address.parse(addresses[2], country=TEST_COUNTRY).model_dump(),
+        None,
+    ]
+    assert parsed["error"].is_null().to_list() == [True, False, True, False]
+
+
+def test_address_parse_many_empty():
+    """Test bulk parsing nothing returns an empty frame and bad countries raise."""
+    assert Address.parse_many([], country=TEST_COUNTRY).is_empty()
+
+    with pytest.raises(NotImplementedError):
+        Address.parse_many(["80 ROSEBERRY STREET, ASCOT VALE, VIC 3032"], country="NZ")
+
+
+def test_address_parse_cache(mock_address_cache):
+    """Test parsed addresses are reused from memory, then from disk, and counted."""
+    address = "80 ROSEBERRY STREET, ASCOT VALE, VIC 3032"
+    address_cache = Address.cache()
+    assert address_cache.cache_file == mock_address_cache
+    assert address_cache.parser_version == Address.parser_version()
+
+    parsed = Address.parse(address, country=TEST_COUNTRY)
+    assert Address.parse(address.lower(), country=TEST_COUNTRY) == parsed
+    address_cache.clear()
+    assert Address.parse(address, country=TEST_COUNTRY) == parsed
+    assert dict(address_cache.stats) == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+
+    parsed_many = Address.parse_many([address, "7/67 ROSEBERRY STREET, ASCOT VALE, VIC 3032"], country=TEST_COUNTRY)
+    assert parsed_many["address"].to_list()[0] == parsed.model_dump()
+    assert dict(address_cache.stats) == {"memory_hits": 1, "disk_hits": 1, "misses": 1}
+
+    Address.parse_many([address] * 4, country=TEST_COUNTRY, workers=2, chunk_size=2)
+    assert address_cache.stats["disk_hits"] == 5
+
+
 ###### HISTORICAL PRICES ##############
 
 
@@ -190,6 +341,31 @@ def test_historical_price_to_records():
     pl.testing.assert_frame_equal(historical_records, data_json, check_dtypes=False)
 
 
+def test_price_record_batch_builder():
+    """Test the batch builder gives the same frame as `PriceRecord.to_records`."""
+    builder = PriceRecordBatchBuilder()
+    builder.append(None, 80, "FIFTH STREET", date(2020, 1, 1), RecordType.AUCTION, 100000)
+    builder.append(None, 80, "SAMPLE STREET", date(2020, 1, 1), "enquiry", None)
+    builder.append(None, 80, "ROSEBERRY STREET", date(2020, 1, 1), " NO Sale", 200000)
+
+    with pytest.raises(OverflowError):
+        builder.append(1, 1, "BAD STREET", date(2020, 1, 1), RecordType.AUCTION, 2**40)
+    assert len(builder) == 3
+
+    records_json = {
+        "unit_number": [None, None, None],
+        "street_number": [80, 80, 80],
+        "street_name": ["FIFTH STREET", "SAMPLE STREET", "ROSEBERRY STREET"],
+        "date": [date(2020, 1, 1), date(2020, 1, 1), date(2020, 1, 1)],
+        "record_type": ["auction", "enquiry", "no_sale"],
+        "price": [100000, None, 200000],
+    }
+    pl.testing.assert_frame_equal(builder.finish(), pl.DataFrame(records_json, schema=PRICE_RECORDS_SCHEMA))
+
+    assert len(builder) == 0
+    assert builder.finish().schema == PRICE_RECORDS_SCHEMA
+
+
 def test_historical_price_read_csv(mock_price_records):
     """Create csv contents and make sure the read function works."""
     data_csv = PriceRecord._read_csv(mock_price_records)
@@ -201,7 +377,7 @@ def test_historical_price_read(mock_price_records):  # noqa: ARG001
     """Create csv contents and make sure the read function works."""
     data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
     data_json = pl.DataFrame(CORRECT_RECORDS_JSON)
-    pl.testing.assert_frame_equal(data_csv, data_json, check_dtypes=False)
+    pl.testing.assert_frame_equal(data_csv.drop("address_id"), data_json, check_dtypes=False)
 
 
 def test_historical_price_write(mock_price_records):
@@ -215,7 +391,198 @@ def test_historical_price_write(mock_price_records):
     data_re_read = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
 
     data_json = pl.DataFrame(CORRECT_RECORDS_JSON)
-    pl.testing.assert_frame_equal(data_re_read, data_json, check_dtypes=False)
+    pl.testing.assert_frame_equal(data_re_read.drop("address_id"), data_json, check_dtypes=False)
+
+
+def test_historical_price_append(mock_price_records, monkeypatch):
+    """Test appending writes only new records, using the key index instead of re-reading the csv."""
+    data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+
+    assert PriceRecord.append(data_csv, **location) == 0
+
+    new_record = data_csv.head(1).with_columns(pl.lit(date(2024, 5, 1)).alias("date"))
+    new_records = pl.concat([new_record, new_record, data_csv.tail(1).drop("address_id")], how="diagonal")
+    with monkeypatch.context() as patch:
+        patch.setattr(PriceRecord, "_read_csv", lambda *_: pytest.fail("the csv should not be re-read"))
+        assert PriceRecord.append(new_records, **location) == 1
+        assert PriceRecord.append(new_records, **location) == 0
+
+    data_appended = PriceRecord.read(**location)
+    assert data_appended.height == data_csv.height + 1
+    pl.testing.assert_frame_equal(data_appended.head(data_csv.height), data_csv)
+
+    # Rewriting the file leaves the index stale, so it gets rebuilt from the csv.
+    data_csv.pipe(PriceRecord.write, **location)
+    assert PriceRecord.append(new_records, **location) == 1
+
+    # Duplicates written around the index are dropped on compaction.
+    with open(mock_price_records, "a") as open_file:
+        open_file.write(",10,MY ST,2020-01-01,auction,1000000\n")
+    assert PriceRecord.append(new_record.with_columns(pl.lit(1).alias("price")), **location, compact_every=1) == 1
+    data_compacted = PriceRecord.read(**location)
+    assert data_compacted.height == data_csv.height + 2
+    assert data_compacted["address"].struct["street_name"].to_list() == sorted(TEST_STREET_NAMES + ["MY ST"] * 2)
+
+
+def test_historical_price_append_after_partial_row(mock_price_records):
+    """Test a partial row left by a killed append is cut off by the next append."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    data_csv = PriceRecord.read(**location)
+    assert PriceRecord.append(data_csv, **location) == 0
+
+    with open(mock_price_records, "a") as open_file:
+        open_file.write(",10,MY ST,2024-0")
+    new_record = data_csv.head(1).with_columns(pl.lit(date(2024, 5, 1)).alias("date"))
+    assert PriceRecord.append(new_record, **location) == 1
+
+    data_appended = PriceRecord.read(**location)
+    assert data_appended.height == data_csv.height + 1
+    pl.testing.assert_frame_equal(data_appended.tail(1).drop("address_id"), new_record.drop("address_id"))
+
+
+def test_historical_price_append_compact(mock_price_records):  # noqa: ARG001
+    """Test records read with the compact schema can be appended back."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    data_compact = PriceRecord.read(**location, compact=True)
+
+    assert PriceRecord.append(data_compact, **location) == 0
+    assert PriceRecord.append(data_compact.with_columns(pl.lit(date(2024, 5, 1)).alias("date")), **location) == 3
+    assert PriceRecord.read(**location).height == 2 * data_compact.height
+
+
+def test_historical_price_append_new_file(mock_price_records):
+    """Test appending to a suburb without a csv file creates it."""
+    data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    os.remove(mock_price_records)
+
+    assert (
+        PriceRecord.append(pl.concat([data_csv, data_csv]), country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+        == 3
+    )
+    pl.testing.assert_frame_equal(
+        PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB), data_csv
+    )
+
+
+def test_historical_price_aggregates(mock_price_records, monkeypatch):
+    """Test monthly aggregates are built once, updated in place by appends and summarised over rolling windows."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    data_csv = PriceRecord.read(**location)
+    aggregates_file = mock_price_records.removesuffix(".csv") + constants.PRICE_AGGREGATES_SUFFIX
+
+    with pytest.warns(MissingDataWarning, match="deakin_west"):
+        aggregates = PriceRecord.read_aggregates(
+            country=TEST_COUNTRY, suburbs=[("ACT", "deakin_west"), (TEST_STATE, TEST_SUBURB)]
+        )
+    assert os.path.exists(aggregates_file)
+    assert aggregates["suburb"].to_list() == [TEST_SUBURB] * 3
+    assert aggregates["month"].to_list() == [date(2020, 1, 1), date(2020, 10, 1), date(2025, 12, 1)]
+    assert aggregates["median_price"].to_list() == [1000000, 500000, 5000000]
+
+    assert PriceRecord.append(data_csv, **location) == 0
+    new_records = data_csv.head(2).with_columns(
+        pl.Series("date", [date(2020, 1, 15), date(2020, 2, 1)]),
+        pl.lit("auction").alias("record_type"),
+        pl.Series("price", [2000000, None], dtype=pl.UInt32),
+    )
+    with monkeypatch.context() as patch:
+        patch.setattr(PriceRecord, "_read_csv", lambda *_: pytest.fail("the csv should not be re-read"))
+        assert PriceRecord.append(new_records, **location) == 2
+        aggregates = PriceRecord.read_aggregates(country=TEST_COUNTRY, suburbs=[(TEST_STATE, TEST_SUBURB)])
+
+    assert aggregates.drop("state", "suburb").to_dicts()[:2] == [
+        {
+            "month": date(2020, 1, 1),
+            "record_type": "auction",
+            "volume": 2,
+            "price_count": 2,
+            "price_sum": 3000000,
+            "mean_price": 1500000.0,
+            "median_price": 1500000.0,
+            "prices": [1000000, 2000000],
+        },
+        {
+            "month": date(2020, 2, 1),
+            "record_type": "auction",
+            "volume": 1,
+            "price_count": 0,
+            "price_sum": 0,
+            "mean_price": None,
+            "median_price": None,
+            "prices": [],
+        },
+    ]
+    pl.testing.assert_frame_equal(
+        aggregates.drop("state", "suburb"), PriceAggregates.aggregate(PriceRecord._read_csv(mock_price_records))
+    )
+
+    rolling = PriceAggregates.rolling(aggregates, months=3)
+    assert "prices" not in rolling.columns
+    assert rolling.filter(pl.col("month") == date(2020, 2, 1)).select("volume", "median_price").row(0) == (3, 1500000)
+    rolling = PriceAggregates.rolling(aggregates, months=12)
+    assert rolling.filter(pl.col("record_type") == "no_sale")["volume"].to_list() == [1]
+
+    data_csv.pipe(PriceRecord.write, **location)
+    assert not os.path.exists(aggregates_file)
+
+
+def test_historical_price_read_many(mock_price_records):  # noqa: ARG001
+    """Test reading several suburbs at once skips and reports the missing ones."""
+    data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    with pytest.warns(MissingDataWarning, match="deakin_west"):
+        data_many = PriceRecord.read_many(
+            country=TEST_COUNTRY, suburbs=[(TEST_STATE, TEST_SUBURB), ("ACT", "deakin_west")], max_workers=2
+        )
+    pl.testing.assert_frame_equal(data_many, data_csv)
+
+    with pytest.warns(MissingDataWarning):
+        data_none = PriceRecord.read_many(country=TEST_COUNTRY, suburbs=[("ACT", "deakin_west")])
+    assert data_none.is_empty()
+    assert data_none.schema == data_csv.schema
+
+    with pytest.raises(ValueError, match="NOT_A_SUBURB"):
+        PriceRecord.read_many(country=TEST_COUNTRY, suburbs=[(TEST_STATE, "NOT_A_SUBURB")])
+
+
+def test_historical_price_compact(mock_price_records):  # noqa: ARG001
+    """Test compact records use enums and categoricals and round trip through writing."""
+    data_plain = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    data_compact = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB, compact=True)
+
+    assert data_compact.schema["address"] == pl.Struct(constants.COMPACT_ADDRESS_SCHEMA)
+    assert data_compact.schema["record_type"] == constants.RECORD_TYPE_ENUM
+    pl.testing.assert_frame_equal(data_compact.cast(data_plain.schema), data_plain)
+
+    data_compact.pipe(PriceRecord.write, country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    data_re_read = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB, compact=True)
+    pl.testing.assert_frame_equal(data_re_read, data_compact, categorical_as_str=True)
+
+
+def test_historical_price_parquet(mock_price_records, mock_price_records_parquet):  # noqa: ARG001
+    """Test writing records to the Parquet store and scanning them back by partition."""
+    data_csv = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    other_suburb = data_csv.with_columns(
+        pl.col("address").struct.with_fields(pl.lit("OTHER SUBURB").alias("suburb"))
+    ).drop("address_id")
+
+    data_csv.pipe(PriceRecord.write_parquet, country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    other_suburb.pipe(PriceRecord.write_parquet, country=TEST_COUNTRY, state=TEST_STATE, suburb="OTHER SUBURB")
+    assert os.path.isfile(PriceRecord.parquet_file(country=TEST_COUNTRY, state=TEST_STATE, suburb="OTHER SUBURB"))
+
+    scanned = PriceRecord.scan(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    assert isinstance(scanned, pl.LazyFrame)
+    pl.testing.assert_frame_equal(scanned.collect().sort("date"), data_csv.sort("date"))
+
+    scanned_other = PriceRecord.scan(country=TEST_COUNTRY, suburb="OTHER SUBURB").collect()
+    pl.testing.assert_frame_equal(scanned_other.drop("address_id").sort("date"), other_suburb.sort("date"))
+
+    assert PriceRecord.scan(country=TEST_COUNTRY).collect().height == 2 * data_csv.height
+    assert PriceRecord.scan(country=TEST_COUNTRY, state="NSW").collect().is_empty()
+
+    recent = PriceRecord.scan(country=TEST_COUNTRY).filter(pl.col("date") >= date(2021, 1, 1)).collect()
+    assert recent["price"].to_list() == [5000000, 5000000]
 
 
 ####### PROPERTY INFO ############
@@ -311,13 +678,92 @@ def test_properties_info_read_csv(mock_property_info):
     )
 
 
+def test_properties_info_read_remote(mock_property_info, mock_remote_cache):  # noqa: ARG001
+    """Test a remote file is read through the remote file cache, downloading it only once."""
+    memory_fs = fsspec.filesystem("memory")
+    with open(mock_property_info, "rb") as open_file:
+        memory_fs.pipe("/remote_properties/properties.json", open_file.read())
+
+    try:
+        for _ in range(2):
+            properties_info_remote = PropertyInfo.read_json("memory://remote_properties/properties.json")
+            pl.testing.assert_frame_equal(properties_info_remote, PropertyInfo.read_json(mock_property_info))
+    finally:
+        memory_fs.rm("/remote_properties", recursive=True)
+
+    assert remote_file_cache().stats["misses"] == 1
+    assert remote_file_cache().stats["hits"] == 1
+
+
+def test_properties_info_validation_errors(mock_property_info, tmp_path):
+    """Test invalid rows are reported in one pass, or re-checked by pydantic with `pydantic_fallback`."""
+    with open(mock_property_info) as open_file:
+        properties_info_json = json.load(open_file)
+    properties_info_json[0]["address"]["country"] = "NZL"
+    properties_info_json[0]["condition"] = "good"
+    properties_info_json[2]["property_type"] = ["apartment", "victorian"]
+    invalid_file = tmp_path / "properties.json"
+    invalid_file.write_text(json.dumps(properties_info_json))
+
+    with pytest.raises(PropertyInfoValidationError, match="2 properties") as error_info:
+        PropertyInfo.read_json(str(invalid_file))
+    assert error_info.value.errors.rows() == [
+        (0, "address.country", "country must be one of ('AUS',)"),
+        (0, "condition", "condition is not a `PropertyCondition`"),
+        (2, "property_type", "property_type is not a known `PropertyType`"),
+    ]
+
+    with pytest.raises(pydantic.ValidationError):
+        PropertyInfo.read_json(str(invalid_file), pydantic_fallback=True)
+
+    assert PropertyInfo.read_json(str(invalid_file), full_validation=False).height == 3  # noqa: PLR2004
+    assert PropertyInfo.validation_errors(pl.read_json(mock_property_info)).is_empty()
+
+
+def test_properties_info_validation_ledger(mock_property_info, monkeypatch):
+    """Test an unchanged file is validated once, and a changed one again."""
+    properties_info = PropertyInfo.read_json(mock_property_info)
+    assert dict(PropertyInfo.ledger().stats) == {"hits": 0, "misses": 1}
+
+    def fail_validation(_raw):
+        raise AssertionError("validated again")
+
+    monkeypatch.setattr(PropertyInfo, "validation_errors", fail_validation)
+    pl.testing.assert_frame_equal(PropertyInfo.read_json(mock_property_info), properties_info)
+    assert dict(PropertyInfo.ledger().stats) == {"hits": 1, "misses": 1}
+
+    with open(mock_property_info, "a") as open_file:
+        open_file.write("\n")
+    with pytest.raises(AssertionError, match="validated again"):
+        PropertyInfo.read_json(mock_property_info)
+
+
+def test_properties_info_validator_version(monkeypatch):
+    """Test the ledger is keyed on a version that changes with the validation rules."""
+    validator_version = PropertyInfo.validator_version()
+    assert validator_version.startswith("1+")
+    assert PropertyInfo.ledger().validator_version == validator_version
+
+    def validation_errors(_cls, properties_info_raw):
+        return properties_info_raw.clear()
+
+    monkeypatch.setattr(PropertyInfo, "validation_errors", classmethod(validation_errors))
+    PropertyInfo.validator_version.cache_clear()
+    try:
+        assert PropertyInfo.validator_version() != validator_version
+    finally:
+        PropertyInfo.validator_version.cache_clear()
+
+
 def test_properties_info_read(mock_property_info):  # noqa: ARG001
     """Create csv contents and make sure the read function works."""
     properties_info_mocked = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
     properties_info_correct = pl.DataFrame(CORRECT_PROPERTY_INFO_JSON)
 
     pl.testing.assert_frame_equal(
-        properties_info_mocked.sort("floors"), properties_info_correct.sort("floors"), check_dtypes=False
+        properties_info_mocked.drop("address_id").sort("floors"),
+        properties_info_correct.sort("floors"),
+        check_dtypes=False,
     )
 
 
@@ -333,8 +779,84 @@ def test_properties_info_write(mock_property_info):
 
     properties_info_correct = pl.DataFrame(CORRECT_PROPERTY_INFO_JSON)
     pl.testing.assert_frame_equal(
-        properties_info_re_read.sort("floors"), properties_info_correct.sort("floors"), check_dtypes=False
+        properties_info_re_read.drop("address_id").sort("floors"),
+        properties_info_correct.sort("floors"),
+        check_dtypes=False,
+    )
+
+
+def test_properties_info_iter_views(mock_property_info):  # noqa: ARG001
+    """Test row views read the same values as the rows of the frame, and build the same models."""
+    properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    views = list(PropertyInfo.iter_views(properties_info))
+
+    assert len(views) == properties_info.height
+    assert [view.as_dict() for view in views] == properties_info.rows(named=True)
+    assert [view.address.street_name for view in views] == properties_info["address"].struct["street_name"].to_list()
+    assert views[0].to_model() == PropertyInfo.from_stringified_dict(
+        properties_info.drop("address_id").row(0, named=True)
+    )
+
+    with pytest.raises(AttributeError, match="no column"):
+        _ = views[0].garage
+    assert copy.copy(views[0]).beds == views[0].beds
+
+
+def test_properties_info_ndjson(mock_property_info):  # noqa: ARG001
+    """Test writing and reading back the ndjson format, eagerly and lazily."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    properties_info = PropertyInfo.read(**location)
+    PropertyInfo.write(properties_info, **location, ndjson=True)
+
+    with open(PropertyInfo.file(**location, ndjson=True)) as open_file:
+        assert len(open_file.readlines()) == properties_info.height
+    pl.testing.assert_frame_equal(PropertyInfo.read(**location, ndjson=True), properties_info)
+    pl.testing.assert_frame_equal(
+        PropertyInfo.read_ndjson(PropertyInfo.file(**location, ndjson=True), batch_bytes=100),
+        properties_info.drop("address_id"),
+    )
+    pl.testing.assert_frame_equal(
+        PropertyInfo.read_many(country=TEST_COUNTRY, suburbs=[(TEST_STATE, TEST_SUBURB)], ndjson=True), properties_info
+    )
+
+    scanned = PropertyInfo.scan_ndjson(PropertyInfo.file(**location, ndjson=True))
+    pl.testing.assert_frame_equal(
+        scanned.filter(pl.col("floors") > 10).select("floors").collect(streaming=True),  # noqa: PLR2004
+        properties_info.filter(pl.col("floors") > 10).select("floors"),  # noqa: PLR2004
+    )
+
+
+def test_properties_info_read_many(mock_property_info):  # noqa: ARG001
+    """Test reading several suburbs at once skips and reports the missing ones."""
+    properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    with pytest.warns(MissingDataWarning, match="deakin_west"):
+        properties_info_many = PropertyInfo.read_many(
+            country=TEST_COUNTRY, suburbs=[("ACT", "deakin_west"), (TEST_STATE, TEST_SUBURB)], max_workers=2
+        )
+    pl.testing.assert_frame_equal(properties_info_many, properties_info)
+
+    with pytest.warns(MissingDataWarning):
+        properties_info_none = PropertyInfo.read_many(country=TEST_COUNTRY, suburbs=[("ACT", "deakin_west")])
+    assert properties_info_none.is_empty()
+    assert properties_info_none.schema == properties_info.schema
+
+
+def test_properties_info_compact(mock_property_info):  # noqa: ARG001
+    """Test compact property info uses enums and categoricals and round trips through writing."""
+    properties_info_plain = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    properties_info_compact = PropertyInfo.read(
+        country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB, compact=True
+    )
+
+    assert properties_info_compact.schema["address"] == constants.COMPACT_PROPERTIES_INFO_SCHEMA["address"]
+    pl.testing.assert_frame_equal(properties_info_compact.cast(properties_info_plain.schema), properties_info_plain)
+
+    properties_info_compact.pipe(PropertyInfo.write, country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    properties_info_re_read = PropertyInfo.read(
+        country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB, compact=True
     )
+    pl.testing.assert_frame_equal(properties_info_re_read, properties_info_compact, categorical_as_str=True)
 
 
 ##### INTEGRATION #############
@@ -361,6 +883,73 @@ def test_address_join_on(mock_property_info, mock_price_records):  # noqa: ARG00
     )
 
 
+def test_address_id(mock_property_info, mock_price_records):
+    """Test the address id is stable, normalised, and the same from both readers."""
+    properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    price_records = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    assert properties_info.schema["address_id"] == pl.UInt64
+    assert properties_info["address_id"].n_unique() == properties_info.height
+    assert set(properties_info["address_id"]) == set(price_records["address_id"])
+
+    address = pl.DataFrame({"address": [TEST_ADDRESSES[0], TEST_ADDRESSES[0] | {"street_name": " my   st"}]})
+    address_ids = address.select(Address.id_expr())["address_id"]
+    assert address_ids.to_list() == [15950710659664550084, 15950710659664550084]
+
+
+def test_address_join_on_collision(mock_property_info, mock_price_records):
+    """Test different addresses sharing an id are reported."""
+    properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    price_records = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    with pytest.raises(AddressCollisionError):
+        Address.check_address_ids(properties_info.with_columns(pl.lit(1, dtype=pl.UInt64).alias("address_id")))
+
+    with pytest.raises(AddressCollisionError):
+        Address.join_on(properties_info, price_records.with_columns(pl.col("address_id").reverse()))
+
+
+def test_address_join_on_compact(mock_property_info, mock_price_records):  # noqa: ARG001
+    """Test a frame read with the compact schema joins with one read without it."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    properties_info = PropertyInfo.read(**location)
+    price_records = PriceRecord.read(**location)
+
+    combined = Address.join_on(properties_info, price_records)
+    combined_mixed = Address.join_on(properties_info, PriceRecord.read(**location, compact=True))
+
+    assert combined_mixed.schema["address"] == pl.Struct(ADDRESS_SCHEMA)
+    pl.testing.assert_frame_equal(
+        combined_mixed.sort("price"), combined.sort("price"), check_column_order=False, check_dtypes=False
+    )
+
+    with pytest.raises(AddressCollisionError):
+        Address.join_on(
+            PropertyInfo.read(**location, compact=True), price_records.with_columns(pl.col("address_id").reverse())
+        )
+
+
+def test_address_join_on_lazy(mock_property_info, mock_price_records):
+    """Test joining lazy frames gives a lazy frame matching the eager join."""
+    properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+    price_records = PriceRecord.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
+
+    combined_eager = Address.join_on(properties_info, price_records)
+    combined_lazy = Address.join_on(properties_info.drop("address_id").lazy(), price_records.lazy())
+
+    assert isinstance(combined_lazy, pl.LazyFrame)
+    pl.testing.assert_frame_equal(
+        combined_lazy.collect().sort("price"), combined_eager.sort("price"), check_column_order=False
+    )
+
+    expanded = combined_lazy.select(*Address.expand_address_column()).filter(pl.col("street_name") == "MY ST")
+    collapsed = expanded.select(Address.collapse_address_column(), "price").collect()
+    assert collapsed.to_dicts() == [{"address": TEST_ADDRESSES[0], "price": 1000000}]
+
+    with pytest.raises(pl.exceptions.ComputeError, match="AddressCollisionError"):
+        Address.join_on(properties_info.lazy(), price_records.with_columns(pl.col("address_id").reverse())).collect()
+
+
 def test_address_filter_on(mock_property_info):  # noqa: ARG001
     """Test you can filter by an address."""
     properties_info = PropertyInfo.read(country=TEST_COUNTRY, state=TEST_STATE, suburb=TEST_SUBURB)
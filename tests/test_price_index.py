@@ -0,0 +1,71 @@
+from datetime import date
+
+import polars as pl
+import polars.testing
+import pytest
+
+from property_models.dev_utils.fixtures import TEST_ADDRESSES
+from property_models.models import Address
+from property_models.price_index import repeat_sales_index, sale_pairs
+
+QUARTERS = [date(2020, 1, 15), date(2020, 4, 15), date(2020, 7, 15), date(2020, 10, 15)]
+TRUE_INDEX = [100.0, 110.0, 99.0, 121.0]
+
+
+def _price_records(sales: list[tuple[int, int, str, int]]) -> pl.DataFrame:
+    """Build records from `(address, quarter, record_type, price)` tuples."""
+    return pl.DataFrame(
+        {
+            "address": [TEST_ADDRESSES[address] for address, *_ in sales],
+            "date": [QUARTERS[quarter] for _, quarter, *_ in sales],
+            "record_type": [record_type for _, _, record_type, _ in sales],
+            "price": [price for *_, price in sales],
+        },
+        schema_overrides={"price": pl.UInt32},
+    ).pipe(Address.with_address_id)
+
+
+def test_sale_pairs():
+    """Test only consecutive priced sales of the same address are paired."""
+    price_records = _price_records(
+        [
+            (0, 0, "auction", 500000),
+            (0, 1, "no_sale", 900000),
+            (0, 2, "private_sale", 600000),
+            (0, 3, "auction", 700000),
+            (1, 1, "auction", 300000),
+        ]
+    )
+
+    pairs = sale_pairs(price_records)
+
+    assert pairs.select("first_date", "first_price", "second_date", "second_price").rows() == [
+        (QUARTERS[0], 500000, QUARTERS[2], 600000),
+        (QUARTERS[2], 600000, QUARTERS[3], 700000),
+    ]
+    assert pairs["suburb"].to_list() == [TEST_ADDRESSES[0]["suburb"]] * 2
+    pl.testing.assert_frame_equal(sale_pairs(price_records.lazy()).collect(), pairs)
+
+
+def test_repeat_sales_index():
+    """Test the index recovers the price levels of pairs that follow it exactly, however the pairs are chunked."""
+    sales_quarters = {0: [0, 1, 2, 3], 1: [0, 3], 2: [1, 3]}
+    base_prices = {0: 400000, 1: 1000000, 2: 700000}
+    price_records = _price_records(
+        [
+            (address, quarter, "auction", round(base_prices[address] * TRUE_INDEX[quarter] / 100))
+            for address, quarters in sales_quarters.items()
+            for quarter in quarters
+        ]
+    )
+
+    pairs = sale_pairs(price_records)
+    index = repeat_sales_index(pairs)
+
+    assert index["period"].to_list() == [date(2020, 1, 1), date(2020, 4, 1), date(2020, 7, 1), date(2020, 10, 1)]
+    assert index["index"].to_list() == pytest.approx(TRUE_INDEX)
+    pl.testing.assert_frame_equal(repeat_sales_index(pairs, chunk_size=2), index)
+    pl.testing.assert_frame_equal(repeat_sales_index(pairs.lazy()), index)
+    pl.testing.assert_frame_equal(repeat_sales_index(pairs, by=()), index.drop("state", "suburb"))
+
+    assert repeat_sales_index(pairs.clear()).columns == index.columns
@@ -0,0 +1,77 @@
+from datetime import date
+
+import polars as pl
+import polars.testing
+import pytest
+
+from property_models.dev_utils.fixtures import TEST_COUNTRY, TEST_STATE, TEST_SUBURB
+from property_models.models import PriceRecord, PropertyInfo
+from property_models.store import SqliteStore
+
+TEST_SCHEMA = pl.Schema(
+    {"address_id": pl.UInt64, "postcode": pl.UInt16, "street_key": pl.String, "street_number": pl.UInt16}
+    | {"date": pl.Date, "price": pl.UInt32}
+)
+
+
+def test_sqlite_store(tmp_path):
+    """Test writing replaces the rows of each address, and reading filters through the indexes."""
+    rows = pl.DataFrame(
+        {
+            "address_id": [2**64 - 1, 2**64 - 1, 7],
+            "postcode": [3000, 3000, 3051],
+            "street_key": ["FIFTH STREET", "FIFTH STREET", "LONG ROAD"],
+            "street_number": [1, 1, 20],
+            "date": [date(2020, 1, 1), date(2021, 1, 1), date(2020, 6, 1)],
+            "price": [100, 200, None],
+        },
+        schema=TEST_SCHEMA,
+    )
+    store = SqliteStore(str(tmp_path / "store.sqlite"))
+    store.write("sales", rows, schema=TEST_SCHEMA)
+    store.write("sales", rows.head(1), schema=TEST_SCHEMA)
+
+    assert store.tables() == ["sales"]
+    pl.testing.assert_frame_equal(store.read("sales", schema=TEST_SCHEMA).sort("date"), rows[[0, 2]])
+    pl.testing.assert_frame_equal(store.read("sales", schema=TEST_SCHEMA, address_id=2**64 - 1), rows.head(1))
+    pl.testing.assert_frame_equal(
+        store.read("sales", schema=TEST_SCHEMA, postcode=3051, street_key="LONG ROAD", street_number=20),
+        rows.slice(2),
+    )
+    assert store.read("sales", schema=TEST_SCHEMA, since=date(2020, 2, 1), until=date(2020, 6, 1)).is_empty()
+
+    with pytest.raises(ValueError, match="local disk"):
+        SqliteStore("memory://store.sqlite")
+
+    query_plan = store._connect().execute("EXPLAIN QUERY PLAN SELECT * FROM sales WHERE address_id = 1").fetchall()
+    assert "USING INDEX sales_address_id" in query_plan[0][-1]
+
+
+def test_sqlite_store_models(mock_price_records, mock_property_info, mock_sqlite_store):  # noqa: ARG001
+    """Test looking up the records and property information of one address written from a suburb."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    price_records = PriceRecord.read(**location)
+    properties_info = PropertyInfo.read(**location)
+    PriceRecord.write_store(price_records)
+    PropertyInfo.write_store(properties_info)
+
+    address = properties_info["address"][0]
+    address_id = properties_info["address_id"][0]
+
+    pl.testing.assert_frame_equal(
+        PropertyInfo.read_store(
+            postcode=address["postcode"],
+            street_name=f"  {address['street_name'].lower()} ",
+            street_number=address["street_number"],
+        ),
+        properties_info.head(1),
+    )
+    # The general type of a parent, with a `"None"` child, comes back as it was read.
+    general_type = properties_info.filter(pl.col("property_type").list.get(1) == "None")
+    assert not general_type.is_empty()
+    pl.testing.assert_frame_equal(PropertyInfo.read_store(address_id=general_type["address_id"][0]), general_type)
+    pl.testing.assert_frame_equal(
+        PriceRecord.read_store(address_id=address_id),
+        price_records.filter(pl.col("address_id") == address_id).sort("date"),
+        check_column_order=False,
+    )
@@ -0,0 +1,123 @@
+from datetime import date
+
+import numpy as np
+import polars as pl
+import pytest
+
+from property_models.dev_utils.fixtures import TEST_COUNTRY, TEST_STATE, TEST_SUBURB
+from property_models.models import Address, PriceRecord, PropertyInfo
+from property_models.valuation import ComparablesIndex, HedonicModel
+
+PROPERTY_TYPES = [["apartment", "None"], ["apartment", "modern"], ["free_standing_house", "victorian"], None]
+MISSING_FRACTION = 0.1
+SALE_DATES = [date(2020, 1, 5), date(2020, 5, 5), date(2020, 8, 5)]
+
+
+def _synthetic_sales(n_sales: int, /, *, seed: int = 0) -> pl.DataFrame:
+    """Return sales whose log price follows a hedonic model with random coefficients exactly."""
+    rng = np.random.default_rng(seed)
+    sales = pl.DataFrame(
+        {
+            "beds": rng.integers(1, 5, n_sales),
+            "baths": rng.integers(1, 3, n_sales),
+            "cars": pl.Series(rng.integers(0, 3, n_sales)).zip_with(
+                pl.Series(rng.random(n_sales) > MISSING_FRACTION),
+                pl.Series([None] * n_sales),
+            ),
+            "property_size_m2": rng.uniform(50, 300, n_sales),
+            "land_size_m2": rng.uniform(100, 800, n_sales),
+            "property_type": [PROPERTY_TYPES[i] for i in rng.integers(0, len(PROPERTY_TYPES), n_sales)],
+            "date": [SALE_DATES[i] for i in rng.integers(0, len(SALE_DATES), n_sales)],
+            "record_type": "auction",
+        },
+        schema_overrides={"beds": pl.UInt8, "baths": pl.UInt8, "cars": pl.UInt8},
+    )
+
+    model = HedonicModel()
+    model.periods = [date(2020, 1, 1), date(2020, 4, 1), date(2020, 7, 1)]
+    design = model.design(sales, sales["date"].dt.truncate("1q"))
+    log_prices = design @ np.r_[13.0, rng.normal(0, 0.1, design.shape[1] - 1)]
+
+    return sales.with_columns(pl.Series("price", np.exp(log_prices).round(), dtype=pl.UInt32))
+
+
+def test_hedonic_model_partial_fit():
+    """Test fitting in two batches gives the same model as fitting all sales at once."""
+    sales = _synthetic_sales(1000)
+    model_all = HedonicModel().partial_fit(sales)
+    model_batched = (
+        HedonicModel()
+        .partial_fit(sales.filter(pl.col("date") < date(2020, 6, 1)))
+        .partial_fit(sales.filter(pl.col("date") >= date(2020, 6, 1)))
+    )
+
+    assert model_batched.n_sales == model_all.n_sales == sales.height
+    assert model_batched.periods == model_all.periods
+    assert len(model_batched.coefficients) == len(model_batched.features)
+    np.testing.assert_allclose(
+        model_batched.predict(sales)["predicted_price"], model_all.predict(sales)["predicted_price"]
+    )
+
+    august_sales = sales.filter(pl.col("date") == date(2020, 8, 5))
+    np.testing.assert_allclose(
+        model_batched.predict(august_sales, at=date(2020, 8, 1))["predicted_price"], august_sales["price"], rtol=1e-5
+    )
+
+
+def test_hedonic_model_predict(mock_price_records, mock_property_info):  # noqa: ARG001
+    """Test valuing a suburb from the joined records and property info."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    properties_info = PropertyInfo.read(**location)
+
+    with pytest.raises(ValueError, match="not been fitted"):
+        HedonicModel().predict(properties_info)
+
+    model = HedonicModel().partial_fit(Address.join_on(PriceRecord.read(**location), properties_info))
+    assert model.n_sales == 2  # noqa: PLR2004
+
+    valued = model.predict(properties_info, at=date(2020, 1, 1))
+    assert valued.columns == [*properties_info.columns, "predicted_price"]
+    assert valued["predicted_price"][0] == pytest.approx(1000000)
+
+    with pytest.raises(ValueError, match="No sales"):
+        model.predict(properties_info, at=date(2021, 1, 1))
+
+
+def test_comparables_index(monkeypatch):
+    """Test the blocked search finds the same comparables as scoring every sale, within the filters."""
+    sales = _synthetic_sales(500).with_row_index("address_id").cast({"address_id": pl.UInt64})
+    index = ComparablesIndex(sales)
+    subjects = index.sales.head(20)
+
+    monkeypatch.setattr(ComparablesIndex, "BLOCK_SIZE", 6)
+    monkeypatch.setattr(ComparablesIndex, "CANDIDATE_BLOCK_SIZE", 7)
+    comparables = index.query(subjects, k=4, since=date(2020, 4, 1))
+
+    assert comparables.height == 4 * subjects.height
+    assert comparables.columns == ["subject", "rank", "distance", *index.sales.columns]
+    assert (comparables["date"] >= date(2020, 4, 1)).all()
+
+    points, subject_points = index.points(index.sales), index.points(subjects)
+    for subject, subject_point in enumerate(subject_points):
+        distances = np.sqrt(((points - subject_point) ** 2).sum(axis=1))
+        distances[(index.sales["date"] < date(2020, 4, 1)).to_numpy()] = np.inf
+        distances[subject] = np.inf
+        np.testing.assert_allclose(
+            comparables.filter(pl.col("subject") == subject)["distance"], np.sort(distances)[:4], atol=1e-9
+        )
+
+    assert index.query(subjects, record_types=["rent"]).is_empty()
+    assert index.query(subjects.clear()).columns == comparables.columns
+
+
+def test_comparables_index_suburb(mock_price_records, mock_property_info):  # noqa: ARG001
+    """Test querying comparables for a suburb's properties from its joined sales."""
+    location = {"country": TEST_COUNTRY, "state": TEST_STATE, "suburb": TEST_SUBURB}
+    properties_info = PropertyInfo.read(**location)
+    index = ComparablesIndex(Address.join_on(PriceRecord.read(**location), properties_info))
+
+    comparables = index.query(properties_info, k=5)
+
+    assert len(index) == 3  # noqa: PLR2004
+    assert comparables.group_by("subject").len().sort("subject")["len"].to_list() == [1, 2, 1]
+    assert comparables.filter(pl.col("subject") == 1)["date"].to_list() == [date(2020, 1, 1), date(2025, 12, 1)]